@@ -0,0 +1,199 @@
+"""
+내레이션 + 배경음악 믹싱 (NumPy)
+
+ffmpeg amix 필터 대신 두 트랙을 float32 배열로 한 번씩 디코딩해 메모리에서 섞습니다.
+게인, 내레이션이 나올 때 BGM을 줄이는 더킹, 페이드 인/아웃을 벡터 연산으로 계산하고
+결과 버퍼 하나를 최종 mux(ffmpeg stdin)에 넘깁니다. 같은 BGM은 쇼츠마다 다시
+디코딩하지 않도록 (경로, 수정 시각, 크기, 형식) 기준으로 캐시합니다.
+"""
+import os
+import subprocess
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, Union
+
+from pcm_audio import PCMAudio, read_wav
+
+# numpy는 믹싱할 때만 로드
+if TYPE_CHECKING:
+    import numpy as np
+
+# 믹싱 형식 (AAC 출력과 같은 44.1kHz 스테레오)
+MIX_RATE = 44100
+MIX_CHANNELS = 2
+
+
+@dataclass(frozen=True)
+class MixSettings:
+    """믹싱 파라미터 (게인은 배율, 시간은 초)"""
+    voice_gain: float = 1.0
+    bgm_gain: float = 0.3
+    # 내레이션이 나오는 동안 BGM에 추가로 곱할 배율 (1.0이면 더킹 없음)
+    duck_gain: float = 0.35
+    # 20ms 구간 RMS가 이 값 이상이면 말하는 중으로 판단
+    duck_threshold: float = 0.02
+    duck_attack: float = 0.08
+    duck_release: float = 0.4
+    fade_in: float = 0.5
+    fade_out: float = 1.5
+    # 결과가 1.0을 넘으면 전체를 줄여 클리핑 방지
+    limit: float = 0.98
+
+
+DEFAULT_MIX = MixSettings()
+
+
+def decode_float(source: Union[str, bytes], sample_rate: int = MIX_RATE,
+                 channels: int = MIX_CHANNELS) -> 'np.ndarray':
+    """오디오 파일/바이트 → (샘플 수, 채널) float32 배열 (ffmpeg 파이프 한 번)
+
+    WAV 파일(pyttsx3/piper/stub 나레이션)은 ffmpeg 없이 직접 읽습니다.
+    """
+    import numpy as np
+
+    if isinstance(source, str) and source.lower().endswith('.wav'):
+        audio = read_wav(source).convert(sample_rate, channels)
+        return np.frombuffer(audio.data, '<i2').reshape(-1, channels).astype(np.float32) / 32768.0
+
+    data = source if isinstance(source, bytes) else None
+    cmd = ['ffmpeg', '-loglevel', 'error', '-i', 'pipe:0' if data is not None else source,
+           '-vn', '-f', 'f32le', '-ac', str(channels), '-ar', str(sample_rate), 'pipe:1']
+    proc = subprocess.run(cmd, input=data, capture_output=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg 디코딩 실패: {proc.stderr.decode(errors='replace').strip()}")
+    return np.frombuffer(proc.stdout, '<f4').reshape(-1, channels)
+
+
+def to_pcm(samples: 'np.ndarray', sample_rate: int = MIX_RATE) -> PCMAudio:
+    """float32 배열 → 16-bit PCM (PCMEncoder로 인코딩할 때)"""
+    import numpy as np
+
+    data = np.clip(np.round(samples * 32767.0), -32768, 32767).astype('<i2').tobytes()
+    return PCMAudio(data, sample_rate, samples.shape[1])
+
+
+@lru_cache(maxsize=8)
+def _cached_bgm(path: str, mtime_ns: int, size: int, sample_rate: int, channels: int) -> 'np.ndarray':
+    samples = decode_float(path, sample_rate, channels)
+    samples.flags.writeable = False
+    return samples
+
+
+def load_bgm(path: str, sample_rate: int = MIX_RATE, channels: int = MIX_CHANNELS) -> 'np.ndarray':
+    """디코딩한 BGM (읽기 전용, 파일이 바뀌면 다시 디코딩)"""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    return _cached_bgm(path, stat.st_mtime_ns, stat.st_size, sample_rate, channels)
+
+
+def clear_cache():
+    _cached_bgm.cache_clear()
+
+
+def fit_length(samples: 'np.ndarray', length: int) -> 'np.ndarray':
+    """반복해서 채우거나 잘라 length 샘플로"""
+    import numpy as np
+
+    if len(samples) == 0:
+        return np.zeros((length, samples.shape[1]), np.float32)
+    if len(samples) >= length:
+        return samples[:length]
+    repeats = -(-length // len(samples))
+    return np.tile(samples, (repeats, 1))[:length]
+
+
+def duck_envelope(voice: 'np.ndarray', sample_rate: int, settings: MixSettings = DEFAULT_MIX) -> 'np.ndarray':
+    """BGM 게인 곡선 (샘플별, 말하는 구간은 duck_gain, 나머지는 1.0)
+
+    20ms 블록 RMS로 말하는 구간을 찾고, release 동안 유지한 뒤 attack 길이 이동 평균으로
+    경계를 부드럽게 만듭니다. 블록 단위로 계산해 샘플 수에 비례한 반복이 없습니다.
+    """
+    import numpy as np
+
+    n = len(voice)
+    if settings.duck_gain >= 1.0 or n == 0:
+        return np.ones(n, np.float32)
+
+    block = max(1, int(sample_rate * 0.02))
+    blocks = -(-n // block)
+    mono = np.zeros(blocks * block, np.float32)
+    mono[:n] = voice.mean(axis=1)
+    rms = np.sqrt(np.mean(mono.reshape(blocks, block) ** 2, axis=1))
+    active = (rms >= settings.duck_threshold).astype(np.float32)
+
+    # release: 말이 끝난 뒤에도 잠시 줄인 상태 유지
+    hold = max(1, int(settings.duck_release * sample_rate / block))
+    active = (np.convolve(active, np.ones(hold, np.float32))[:blocks] > 0).astype(np.float32)
+
+    # attack: 줄이기 시작할 때와 돌아올 때 선형으로
+    ramp = max(1, int(settings.duck_attack * sample_rate / block))
+    if ramp > 1:
+        padded = np.concatenate([np.full(ramp - 1, active[0], np.float32), active])
+        active = np.convolve(padded, np.ones(ramp, np.float32) / ramp, mode='valid')
+
+    gain = 1.0 - (1.0 - settings.duck_gain) * active
+    centers = (np.arange(blocks) + 0.5) * block
+    return np.interp(np.arange(n), centers, gain).astype(np.float32)
+
+
+def fade_envelope(n: int, sample_rate: int, fade_in: float, fade_out: float) -> 'np.ndarray':
+    """앞뒤 선형 페이드 곡선"""
+    import numpy as np
+
+    gain = np.ones(n, np.float32)
+    fade_in_n = min(n, int(fade_in * sample_rate))
+    fade_out_n = min(n, int(fade_out * sample_rate))
+    if fade_in_n:
+        gain[:fade_in_n] = np.linspace(0.0, 1.0, fade_in_n, dtype=np.float32)
+    if fade_out_n:
+        gain[n - fade_out_n:] *= np.linspace(1.0, 0.0, fade_out_n, dtype=np.float32)
+    return gain
+
+
+def mix(voice: 'np.ndarray', bgm: 'np.ndarray', sample_rate: int = MIX_RATE,
+        settings: MixSettings = DEFAULT_MIX, length: Optional[int] = None) -> 'np.ndarray':
+    """내레이션 + BGM (길이는 length, 없으면 내레이션 길이; BGM은 반복해서 채움)"""
+    import numpy as np
+
+    length = len(voice) if length is None else length
+    if len(voice) < length:
+        voice = np.concatenate([voice, np.zeros((length - len(voice), voice.shape[1]), np.float32)])
+    voice = voice[:length]
+
+    bgm_gain = settings.bgm_gain * duck_envelope(voice, sample_rate, settings)
+    bgm_gain *= fade_envelope(length, sample_rate, settings.fade_in, settings.fade_out)
+
+    out = voice * np.float32(settings.voice_gain) + fit_length(bgm, length) * bgm_gain[:, None]
+    peak = float(np.abs(out).max()) if length else 0.0
+    if peak > settings.limit:
+        out *= np.float32(settings.limit / peak)
+    return out
+
+
+def mix_files(voice_file: str, bgm_file: str, settings: MixSettings = DEFAULT_MIX,
+              sample_rate: int = MIX_RATE, channels: int = MIX_CHANNELS) -> 'np.ndarray':
+    """파일 두 개 → 믹스 배열 (BGM 디코딩은 캐시)"""
+    voice = decode_float(voice_file, sample_rate, channels)
+    return mix(voice, load_bgm(bgm_file, sample_rate, channels), sample_rate, settings)
+
+
+def mux_cmd(video_file: str, output_file: str, sample_rate: int = MIX_RATE,
+            channels: int = MIX_CHANNELS):
+    """비디오 스트림 복사 + stdin의 float32 오디오를 AAC로 한 번 인코딩하는 ffmpeg 명령"""
+    return [
+        'ffmpeg', '-y', '-loglevel', 'error',
+        '-i', video_file,
+        '-f', 'f32le', '-ar', str(sample_rate), '-ac', str(channels), '-i', 'pipe:0',
+        '-map', '0:v:0', '-map', '1:a:0',
+        '-c:v', 'copy',
+        '-c:a', 'aac',
+        '-shortest',
+        output_file
+    ]
+
+
+def to_bytes(samples: 'np.ndarray') -> bytes:
+    """mux_cmd stdin용 (f32le 인터리브)"""
+    import numpy as np
+
+    return np.ascontiguousarray(samples, dtype='<f4').tobytes()
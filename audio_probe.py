@@ -0,0 +1,188 @@
+"""
+나레이션 길이 측정 (디코딩 없이 헤더만)
+
+영상 길이를 나레이션에 맞춰 정해 두면 잘려 나갈 프레임을 렌더링/인코딩하지 않고,
+나레이션이 영상 끝에서 잘리지도 않습니다.
+
+- WAV: RIFF 헤더 (프레임 수 / 샘플레이트)
+- MP3: Xing/Info 헤더의 프레임 수, 없으면 프레임 헤더를 따라가며 샘플 수 합산
+- 그 밖의 형식: ffprobe (없으면 ffmpeg -i) 한 번
+
+결과는 (경로, 수정 시각, 크기) 기준으로 캐시합니다.
+"""
+import math
+import os
+import re
+import shutil
+import subprocess
+import wave
+from functools import lru_cache
+from typing import Optional
+
+# 나레이션이 없을 때 기본 영상 길이 (초)
+DEFAULT_DURATION = 15.0
+# 나레이션이 끝난 뒤 여유 (초)
+TAIL_PADDING = 0.5
+# 유튜브 쇼츠 최대 길이
+MAX_SHORTS_DURATION = 60.0
+
+# (MPEG-1 여부, 레이어) → 비트레이트 인덱스별 kbps
+_BITRATES = {
+    (True, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+# 버전 비트 (3: MPEG-1, 2: MPEG-2, 0: MPEG-2.5) → 샘플레이트 인덱스별 Hz
+_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+
+def _mp3_frame(data: bytes, pos: int) -> Optional[tuple]:
+    """pos의 MP3 프레임 헤더 → (프레임 바이트 수, 프레임당 샘플 수, 샘플레이트, MPEG-1, 모노)"""
+    if pos + 4 > len(data) or data[pos] != 0xFF or data[pos + 1] & 0xE0 != 0xE0:
+        return None
+    b1, b2, b3 = data[pos + 1], data[pos + 2], data[pos + 3]
+    version, layer = (b1 >> 3) & 3, 4 - ((b1 >> 1) & 3)
+    bitrate_index, rate_index, padding = b2 >> 4, (b2 >> 2) & 3, (b2 >> 1) & 1
+    if version == 1 or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    mpeg1 = version == 3
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    bitrate = _BITRATES[(mpeg1, layer)][bitrate_index] * 1000
+    if layer == 1:
+        size, samples = (12 * bitrate // sample_rate + padding) * 4, 384
+    elif layer == 2:
+        size, samples = 144 * bitrate // sample_rate + padding, 1152
+    else:
+        size, samples = (144 if mpeg1 else 72) * bitrate // sample_rate + padding, 1152 if mpeg1 else 576
+    return size, samples, sample_rate, mpeg1, b3 >> 6 == 3
+
+
+def _id3v2_size(data: bytes) -> int:
+    if data[:3] != b'ID3' or len(data) < 10:
+        return 0
+    size = 0
+    for b in data[6:10]:
+        size = (size << 7) | (b & 0x7F)
+    return size + 10 + (10 if data[5] & 0x10 else 0)
+
+
+def mp3_duration(path: str) -> float:
+    """MP3 길이 (Xing/Info 헤더 또는 프레임 헤더 합산)"""
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    pos = _id3v2_size(data)
+    samples = 0
+    sample_rate = 0
+    first = True
+
+    while pos + 4 <= len(data):
+        frame = _mp3_frame(data, pos)
+        if frame is None or pos + frame[0] > len(data):
+            if data[pos:pos + 3] == b'TAG':   # ID3v1
+                break
+            # 다음 동기 바이트로 (프레임 사이의 잡음 건너뜀)
+            pos = data.find(b'\xff', pos + 1)
+            if pos < 0:
+                break
+            continue
+
+        size, frame_samples, sample_rate, mpeg1, mono = frame
+        if first:
+            first = False
+            # VBR/LAME 정보 프레임: 전체 프레임 수가 들어 있음 (이 프레임 자체는 무음)
+            offset = pos + 4 + ((17 if mono else 32) if mpeg1 else (9 if mono else 17))
+            if data[offset:offset + 4] in (b'Xing', b'Info'):
+                flags = int.from_bytes(data[offset + 4:offset + 8], 'big')
+                if flags & 1:
+                    frames = int.from_bytes(data[offset + 8:offset + 12], 'big')
+                    return frames * frame_samples / sample_rate
+                pos += size
+                continue
+
+        samples += frame_samples
+        pos += size
+
+    if not sample_rate:
+        raise ValueError(f"MP3 프레임을 찾지 못했습니다: {path}")
+    return samples / sample_rate
+
+
+def wav_duration(path: str) -> float:
+    with wave.open(path, 'rb') as f:
+        return f.getnframes() / f.getframerate()
+
+
+def ffprobe_duration(path: str) -> float:
+    """ffprobe로 컨테이너 길이 (없으면 ffmpeg -i 출력의 Duration)"""
+    if shutil.which('ffprobe'):
+        result = subprocess.run(['ffprobe', '-v', 'error', '-show_entries', 'format=duration',
+                                 '-of', 'default=noprint_wrappers=1:nokey=1', path],
+                                capture_output=True, text=True)
+        try:
+            return float(result.stdout.strip())
+        except ValueError:
+            pass
+
+    result = subprocess.run(['ffmpeg', '-hide_banner', '-i', path], capture_output=True, text=True)
+    match = re.search(r'Duration: (\d+):(\d+):([\d.]+)', result.stderr)
+    if not match:
+        raise ValueError(f"오디오 길이를 알 수 없습니다: {path}")
+    h, m, s = match.groups()
+    return int(h) * 3600 + int(m) * 60 + float(s)
+
+
+@lru_cache(maxsize=256)
+def _cached_duration(path: str, mtime_ns: int, size: int) -> float:
+    suffix = os.path.splitext(path)[1].lower()
+    try:
+        if suffix == '.wav':
+            return wav_duration(path)
+        if suffix == '.mp3':
+            return mp3_duration(path)
+    except (wave.Error, EOFError, ValueError):
+        pass   # 헤더가 예상과 다르면 ffprobe로
+    return ffprobe_duration(path)
+
+
+def probe_duration(path: str) -> float:
+    """오디오 길이 (초, 파일이 바뀌면 다시 측정)"""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    return _cached_duration(path, stat.st_mtime_ns, stat.st_size)
+
+
+def clear_cache():
+    _cached_duration.cache_clear()
+
+
+def video_duration(
+    audio_file: Optional[str],
+    default: float = DEFAULT_DURATION,
+    padding: float = TAIL_PADDING,
+    minimum: float = 1.0,
+    maximum: float = MAX_SHORTS_DURATION,
+    fps: int = 30
+) -> float:
+    """나레이션에 맞춘 영상 길이 (나레이션 + 여유, 프레임 단위로 올림)
+
+    나레이션이 없거나 길이를 잴 수 없으면 default를 씁니다.
+    """
+    if not audio_file or not os.path.exists(audio_file):
+        return default
+    try:
+        seconds = probe_duration(audio_file) + padding
+    except (OSError, ValueError) as e:
+        print(f"나레이션 길이 측정 실패 ({e}), 기본 {default}초 사용")
+        return default
+    seconds = min(max(seconds, minimum), maximum)
+    return frame_count(seconds, fps) / fps
+
+
+def frame_count(duration: float, fps: int) -> int:
+    """길이를 덮는 프레임 수"""
+    return max(1, math.ceil(duration * fps - 1e-6))
@@ -11,6 +11,7 @@ cron 설정 예시:
 사용법:
     python auto_scheduler.py --mode daily
     python auto_scheduler.py --mode test --count 3
+    python auto_scheduler.py --mode daily --price-mode deal   # 예산 대신 예산 내 추천 실거래가
 """
 
 import argparse
@@ -53,8 +54,12 @@ class AutoScheduler:
         with open(self.log_file, 'a', encoding='utf-8') as f:
             f.write(log_msg + '\n')
 
-    def generate_daily_shorts(self, count: int = 3) -> list:
-        """일일 쇼츠 생성"""
+    def generate_daily_shorts(self, count: int = 3, price_mode: str = 'budget') -> list:
+        """일일 쇼츠 생성
+
+        price_mode='budget'이면 4-8억 랜덤 예산을 --price로 그대로 넘기고,
+        'deal'이면 예산별 추천 실거래가(deal_prices)를 넘깁니다.
+        """
         self.log(f"일일 쇼츠 생성 시작 ({count}개)")
 
         results = []
@@ -62,7 +67,11 @@ class AutoScheduler:
         # 랜덤하게 전략 선택 (다양성 확보)
         selected_strategies = random.sample(self.strategies, min(count, len(self.strategies)))
 
-        for i, strategy in enumerate(selected_strategies, 1):
+        # 4-8억 랜덤 예산 (deal 모드: 가격 인덱스 한 번 만들고 예산 전체를 한꺼번에 질의)
+        budgets = [random.randint(400000000, 800000000) for _ in selected_strategies]
+        prices = self.deal_prices(budgets) if price_mode == 'deal' else budgets
+
+        for i, (strategy, price) in enumerate(zip(selected_strategies, prices), 1):
             self.log(f"[{i}/{count}] 생성 중: {strategy['lang']} - {strategy['country']} - {strategy['theme']}")
 
             try:
@@ -73,7 +82,7 @@ class AutoScheduler:
                     '--lang', strategy['lang'],
                     '--country', strategy['country'],
                     '--theme', strategy['theme'],
-                    '--price', str(random.randint(400000000, 800000000))  # 4-8억 랜덤
+                    '--price', str(price)
                 ]
 
                 result = subprocess.run(
@@ -109,6 +118,35 @@ class AutoScheduler:
         self.log(f"일일 생성 완료: 성공 {sum(1 for r in results if r['success'])}/{count}")
         return results
 
+    def deal_prices(self, budgets: list) -> list:
+        """예산별 추천 매물 가격 (실거래 데이터가 없거나 추천이 없으면 예산 그대로)"""
+        xlsx_files = sorted(Path(__file__).parent.glob('*.xlsx'))
+        if not xlsx_files:
+            return list(budgets)
+
+        try:
+            from data_processor import RealEstateDataProcessor
+
+            processor = RealEstateDataProcessor(str(xlsx_files[0]))
+            processor.load_data()
+            processor.clean_data()
+            results = processor.build_price_index().sweep(budgets, top_n=1)
+        except Exception as e:
+            self.log(f"실거래 데이터 질의 실패, 랜덤 예산 사용: {e}")
+            return list(budgets)
+
+        prices = []
+        for budget, result in zip(budgets, results):
+            deals = result['deals']
+            if len(deals):
+                price = int(deals['거래금액_숫자'].iloc[0])
+                self.log(f"예산 {budget/100000000:.1f}억 → 추천 실거래 {price/100000000:.2f}억 "
+                         f"({result['count']}건 중)")
+            else:
+                price = budget
+            prices.append(price)
+        return prices
+
     def create_upload_queue(self, results: list):
         """업로드 큐 생성"""
         queue = []
@@ -218,6 +256,8 @@ def main():
                        help='실행 모드')
     parser.add_argument('--count', type=int, default=3,
                        help='생성할 쇼츠 수')
+    parser.add_argument('--price-mode', default='budget', choices=['budget', 'deal'],
+                       help='--price로 넘길 값: 랜덤 예산(budget) 또는 예산 내 추천 실거래가(deal, xlsx 필요)')
 
     args = parser.parse_args()
 
@@ -225,13 +265,13 @@ def main():
 
     if args.mode == 'daily':
         # 일일 모드: 쇼츠 생성 + 업로드 큐 생성
-        results = scheduler.generate_daily_shorts(args.count)
+        results = scheduler.generate_daily_shorts(args.count, args.price_mode)
         scheduler.create_upload_queue(results)
 
     elif args.mode == 'test':
         # 테스트 모드: 소량 생성
         print(f"테스트 모드: {args.count}개 생성")
-        results = scheduler.generate_daily_shorts(args.count)
+        results = scheduler.generate_daily_shorts(args.count, args.price_mode)
         scheduler.log(f"테스트 결과: {json.dumps(results, indent=2, ensure_ascii=False)}")
 
     elif args.mode == 'analyze':
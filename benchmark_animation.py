@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+가격 추이 애니메이션 렌더러 벤치마크 (FuncAnimation vs Agg 파이프)
+
+사용법:
+    python benchmark_animation.py
+    python benchmark_animation.py --months 24 --duration 30 --json output/bench_animation.json
+"""
+
+import argparse
+import json
+import os
+import resource
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def measure(func, *args, **kwargs) -> dict:
+    """벽시계 시간, 프로세스 CPU, 자식 프로세스(ffmpeg) CPU 측정"""
+    self_before = resource.getrusage(resource.RUSAGE_SELF)
+    child_before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    start = time.perf_counter()
+
+    result = func(*args, **kwargs)
+
+    wall = time.perf_counter() - start
+    self_after = resource.getrusage(resource.RUSAGE_SELF)
+    child_after = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    return {
+        'result': result,
+        'wall_s': wall,
+        'cpu_s': (self_after.ru_utime - self_before.ru_utime) + (self_after.ru_stime - self_before.ru_stime),
+        'child_cpu_s': (child_after.ru_utime - child_before.ru_utime) + (child_after.ru_stime - child_before.ru_stime),
+    }
+
+
+def sample_trend(months: int) -> pd.DataFrame:
+    """벤치마크용 월별 가격 추이"""
+    rng = np.random.default_rng(0)
+    prices = 500000000 * np.exp(np.cumsum(rng.normal(0.005, 0.02, months)))
+    labels = [f"{2020 + i // 12}{i % 12 + 1:02d}" for i in range(months)]
+    return pd.DataFrame({'년월': labels, '평균가격': prices})
+
+
+def run_animation_benchmark(months: int = 12, duration: int = 15, output_dir: str = 'output/bench',
+                            renderers=('funcanimation', 'pipe')) -> list:
+    """렌더러별 애니메이션 생성 시간 측정"""
+    from visualizer import RealEstateVisualizer
+
+    os.makedirs(output_dir, exist_ok=True)
+    visualizer = RealEstateVisualizer(output_dir)
+    trend = sample_trend(months)
+
+    results = []
+    for renderer in renderers:
+        output_file = os.path.join(output_dir, f'trend_{renderer}.mp4')
+        stats = measure(visualizer.create_price_trend_animation, trend,
+                        output_file=output_file, duration=duration, renderer=renderer)
+        results.append({
+            'benchmark': 'price_trend_animation',
+            'renderer': renderer,
+            'months': months,
+            'duration': duration,
+            'wall_s': round(stats['wall_s'], 3),
+            'cpu_s': round(stats['cpu_s'], 3),
+            'child_cpu_s': round(stats['child_cpu_s'], 3),
+            'bytes': os.path.getsize(output_file) if stats['result'] else None,
+        })
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='애니메이션 렌더러 벤치마크')
+    parser.add_argument('--months', type=int, default=12, help='월 데이터 포인트 수')
+    parser.add_argument('--duration', type=int, default=15, help='영상 길이 (초)')
+    parser.add_argument('--json', default=None, help='결과 JSON 저장 경로 (선택)')
+    args = parser.parse_args()
+
+    results = run_animation_benchmark(args.months, args.duration)
+
+    print(f"\n{'renderer':<15}{'wall(s)':>10}{'cpu(s)':>10}{'ffmpeg cpu(s)':>15}{'bytes':>12}")
+    for r in results:
+        print(f"{r['renderer']:<15}{r['wall_s']:>10.2f}{r['cpu_s']:>10.2f}{r['child_cpu_s']:>15.2f}{r['bytes'] or 0:>12,}")
+
+    if len(results) == 2 and results[1]['wall_s'] > 0:
+        print(f"\n속도 향상: {results[0]['wall_s'] / results[1]['wall_s']:.1f}x")
+
+    if args.json:
+        os.makedirs(os.path.dirname(args.json) or '.', exist_ok=True)
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
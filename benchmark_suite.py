@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+데이터 처리 / 렌더링 벤치마크 (합성 KB 데이터)
+
+결과는 커밋별로 output/bench/results/에 저장되고, 직전 결과(또는 --compare로 지정한
+파일)와 비교해 느려진 항목을 표시합니다.
+
+사용법:
+    python benchmark_suite.py
+    python benchmark_suite.py --sizes 10000 1000000 10000000 --repeat 3
+    python benchmark_suite.py --compare output/bench/results/20250101_120000_abc1234.json
+    python benchmark_suite.py --skip-render
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import subprocess
+from datetime import datetime
+
+from benchmark_animation import measure, run_animation_benchmark
+from synthetic_data import ensure_dataset
+
+RESULTS_DIR = 'output/bench/results'
+
+
+def git_revision() -> str:
+    """현재 커밋 (작업 트리가 수정되어 있으면 -dirty)"""
+    try:
+        rev = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                             capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                               capture_output=True, text=True).stdout.strip()
+        return rev + ('-dirty' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run_data_benchmarks(rows: int, repeat: int = 1, data_dir: str = 'output/bench/data') -> list:
+    """데이터 함수별 시간 (repeat회 중 최솟값)"""
+    from data_processor import RealEstateDataProcessor
+    from investment_analyzer import InvestmentAnalyzer
+
+    path = ensure_dataset(rows, data_dir)
+    best = {}
+
+    for _ in range(repeat):
+        processor = RealEstateDataProcessor(path)
+        steps = [
+            ('load_data', processor.load_data),
+            ('clean_data', processor.clean_data),
+            ('find_hot_deals', lambda: processor.find_hot_deals(top_n=10, max_price=600000000)),
+            ('calculate_price_trend', processor.calculate_price_trend),
+            ('find_investment_opportunities', lambda: InvestmentAnalyzer(
+                location_index=processor.location_index
+            ).find_investment_opportunities(processor.df, budget=600000000, min_roi=0.06)),
+        ]
+        for name, step in steps:
+            with contextlib.redirect_stdout(io.StringIO()):
+                stats = measure(step)
+            if name not in best or stats['wall_s'] < best[name]['wall_s']:
+                best[name] = stats
+
+    return [{
+        'benchmark': name,
+        'rows': rows,
+        'format': os.path.splitext(path)[1].lstrip('.'),
+        'wall_s': round(stats['wall_s'], 4),
+        'cpu_s': round(stats['cpu_s'], 4),
+        'child_cpu_s': round(stats['child_cpu_s'], 4),
+    } for name, stats in best.items()]
+
+
+def run_render_benchmarks(renderers=('pipe',), output_dir: str = 'output/bench') -> list:
+    """애니메이션 렌더러, 정지 화면 인코딩, 썸네일 렌더링/저장 프로필별 시간"""
+    import numpy as np
+    from PIL import Image
+    from benchmark_thumbnails import run_encode_benchmark, run_thumbnail_benchmark
+    from video_composer import VideoComposer
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = run_animation_benchmark(12, 15, output_dir=output_dir, renderers=renderers)
+
+    image = np.linspace(0, 255, 1920 * 1080 * 3).reshape(1920, 1080, 3).astype(np.uint8)
+    still = os.path.join(output_dir, 'still.png')
+    Image.fromarray(image).save(still)
+    output_file = os.path.join(output_dir, 'still.mp4')
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        stats = measure(VideoComposer(output_dir).encode_still, still, output_file, 15)
+    results.append({
+        'benchmark': 'encode_still',
+        'duration': 15,
+        'wall_s': round(stats['wall_s'], 3),
+        'cpu_s': round(stats['cpu_s'], 3),
+        'child_cpu_s': round(stats['child_cpu_s'], 3),
+        'bytes': os.path.getsize(output_file) if stats['result'] else None,
+    })
+
+    results += run_thumbnail_benchmark(30, output_dir=os.path.join(output_dir, 'thumbnails'))
+    results += run_encode_benchmark(10, output_dir=os.path.join(output_dir, 'thumbnails'))
+    return results
+
+
+def result_key(r: dict) -> str:
+    """실행 간 비교용 항목 이름"""
+    parts = [r['benchmark'], r.get('renderer')]
+    if 'rows' in r:
+        parts.append(f"{r['rows']:,} rows")
+    return ' / '.join(p for p in parts if p)
+
+
+def save_results(results: list, results_dir: str = RESULTS_DIR) -> str:
+    os.makedirs(results_dir, exist_ok=True)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    revision = git_revision()
+    path = os.path.join(results_dir, f'{timestamp}_{revision}.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'revision': revision,
+            'timestamp': timestamp,
+            'python': platform.python_version(),
+            'machine': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'results': results,
+        }, f, indent=2, ensure_ascii=False)
+    return path
+
+
+def previous_results(current: str, results_dir: str = RESULTS_DIR):
+    """current 이전의 가장 최근 결과 파일"""
+    files = sorted(glob.glob(os.path.join(results_dir, '*.json')))
+    earlier = [f for f in files if os.path.basename(f) < os.path.basename(current)]
+    return earlier[-1] if earlier else None
+
+
+def compare(baseline_file: str, current_file: str, threshold: float = 0.10):
+    """항목별 벽시계 시간 비교 (threshold 이상 느려지면 표시)"""
+    with open(baseline_file, encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(current_file, encoding='utf-8') as f:
+        current = json.load(f)
+
+    base = {result_key(r): r['wall_s'] for r in baseline['results']}
+    print(f"\n비교: {baseline['revision']} ({baseline['timestamp']}) → {current['revision']}")
+    print(f"{'benchmark':<50}{'base(s)':>10}{'now(s)':>10}{'ratio':>8}")
+
+    regressions = 0
+    for r in current['results']:
+        key = result_key(r)
+        if key not in base or not base[key]:
+            print(f"{key:<50}{'-':>10}{r['wall_s']:>10.3f}{'new':>8}")
+            continue
+        ratio = r['wall_s'] / base[key]
+        flag = ''
+        if ratio > 1 + threshold:
+            flag = '  ▲ slower'
+            regressions += 1
+        elif ratio < 1 - threshold:
+            flag = '  ▼ faster'
+        print(f"{key:<50}{base[key]:>10.3f}{r['wall_s']:>10.3f}{ratio:>7.2f}x{flag}")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='데이터 처리 / 렌더링 벤치마크')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000],
+                        help='합성 데이터 행 수 (10만 행 초과는 parquet/csv)')
+    parser.add_argument('--repeat', type=int, default=1, help='반복 횟수 (최솟값 사용)')
+    parser.add_argument('--renderers', nargs='+', default=['pipe'],
+                        choices=['pipe', 'funcanimation'], help='애니메이션 렌더러')
+    parser.add_argument('--skip-render', action='store_true', help='렌더링 벤치마크 생략')
+    parser.add_argument('--compare', default=None, help='비교 기준 결과 파일 (기본: 직전 결과)')
+    parser.add_argument('--threshold', type=float, default=0.10, help='느려짐 표시 기준 (비율)')
+    args = parser.parse_args()
+
+    results = []
+    for rows in args.sizes:
+        print(f"데이터 벤치마크: {rows:,}행")
+        results += run_data_benchmarks(rows, args.repeat)
+    if not args.skip_render:
+        print("렌더링 벤치마크")
+        results += run_render_benchmarks(tuple(args.renderers))
+
+    print(f"\n{'benchmark':<50}{'wall(s)':>10}{'cpu(s)':>10}{'child(s)':>10}")
+    for r in results:
+        print(f"{result_key(r):<50}{r['wall_s']:>10.3f}{r['cpu_s']:>10.3f}{r['child_cpu_s']:>10.3f}")
+
+    path = save_results(results)
+    print(f"\n결과 저장: {path}")
+
+    baseline = args.compare or previous_results(path)
+    if baseline:
+        compare(baseline, path, args.threshold)
+
+
+if __name__ == "__main__":
+    main()
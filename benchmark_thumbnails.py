@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+썸네일 렌더링 벤치마크 (초당 썸네일 수)
+
+legacy: 행마다 draw.line으로 그라데이션을 그리고 폰트를 매번 다시 로드 (이전 방식)
+cached: 스타일별 NumPy 그라데이션과 폰트 캐시 재사용 (텍스트만 그림)
+wrap-legacy / wrap-cached: 제목 줄바꿈만 (단어마다 textbbox vs text_layout 단어 폭 캐시)
+encode: 저장 프로필별 (png, png-fast, png-small, jpeg, webp) 저장 시간과 파일 크기
+
+사용법:
+    python benchmark_thumbnails.py
+    python benchmark_thumbnails.py --count 60 --save --json output/bench/thumbnails.json
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from PIL import Image, ImageDraw
+
+import image_profiles
+import text_layout
+import thumbnail_generator as tg
+from thumbnail_generator import ThumbnailGenerator
+
+TITLES = [
+    "SEOUL REAL ESTATE CRASH!",
+    "Tokyo vs Seoul: 40% CHEAPER apartments",
+    "The investment secret nobody tells you",
+]
+
+# 줄바꿈 벤치마크용 긴 제목 (es/ja)
+LONG_TITLES = [
+    "⚠️ ¡ADVERTENCIA! Inmobiliaria Seúl 40% MÁS BARATA que Nueva York, Londres y Tokio - "
+    "¡descubre por qué los inversores internacionales están comprando ahora mismo!",
+    "💰 ¡SECRETO! Invierte en Seúl vs Singapur - ¡35% Diferencia! La estrategia que los bancos no te cuentan",
+    "東京の不動産、今が買い時！ソウルと比べて40%安い理由と、海外投資家が注目する三つのポイントを徹底解説します",
+]
+
+
+def legacy_background(color, width, height, strength=0.3):
+    """이전 방식: 1920번 draw.line"""
+    img = Image.new('RGB', (width, height), color)
+    draw = ImageDraw.Draw(img)
+    for y in range(height):
+        darkness = int(255 * (y / height) * strength)
+        draw.line([(0, y), (width, y)], fill=tuple(max(0, c - darkness) for c in color))
+    return img
+
+
+def render_legacy(generator: ThumbnailGenerator, title: str, subtitle: str, style: str):
+    """캐시를 비우고 이전처럼 배경을 행 단위로 그린 뒤 렌더링"""
+    tg.load_font.cache_clear()
+    bg_color = tg.STYLES.get(style, tg.DEFAULT_STYLE)[0]
+    tg.gradient_background.cache_clear()
+    legacy_background(bg_color, generator.width, generator.height)
+    return generator.render_viral_thumbnail(title, subtitle, style)
+
+
+def legacy_wrap(draw: ImageDraw.ImageDraw, title: str, font, max_width: int) -> list:
+    """이전 방식: 단어를 붙일 때마다 늘어나는 줄 전체를 textbbox로 다시 측정"""
+    lines, current_line = [], ""
+    for word in title.split():
+        test_line = current_line + word + " "
+        bbox = draw.textbbox((0, 0), test_line, font=font)
+        if bbox[2] - bbox[0] < max_width:
+            current_line = test_line
+        else:
+            if current_line:
+                lines.append(current_line.strip())
+            current_line = word + " "
+    if current_line:
+        lines.append(current_line.strip())
+    return lines
+
+
+def run_layout_benchmark(count: int = 300) -> list:
+    """제목 줄바꿈만 비교 (A/B 변형처럼 같은 단어가 반복되는 경우)"""
+    generator = ThumbnailGenerator(tempfile.mkdtemp(prefix='thumb_bench_'))
+    font = tg.load_fonts(*tg.VIRAL_FONTS)[0]
+    font_for = generator._title_font_for(font)
+    draw = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+    max_width = generator.width - 100
+    prefixes = ["🔥 SHOCKING!", "⚠️ WARNING!", "💰 SECRET!"]
+
+    variants = {
+        'wrap-legacy': lambda t: legacy_wrap(draw, t, font, max_width),
+        'wrap-cached': lambda t: text_layout.fit_text(t, font_for, max_width, tg.TITLE_BOX_HEIGHT,
+                                                      tg.VIRAL_FONTS[0][1], tg.TITLE_MIN_SIZE),
+    }
+
+    results = []
+    for name, wrap in variants.items():
+        text_layout.clear_cache()
+        start = time.perf_counter()
+        cpu = time.process_time()
+        for i in range(count):
+            wrap(f"{prefixes[i % 3]} {LONG_TITLES[i % len(LONG_TITLES)]}")
+        wall = time.perf_counter() - start
+        results.append({
+            'benchmark': 'title_layout',
+            'renderer': name,
+            'count': count,
+            'wall_s': round(wall, 3),
+            'cpu_s': round(time.process_time() - cpu, 3),
+            'child_cpu_s': 0.0,
+            'per_second': round(count / wall, 1),
+        })
+    return results
+
+
+def run_encode_benchmark(count: int = 10, output_dir: str = None) -> list:
+    """같은 썸네일들을 프로필별로 저장 (장당 저장 시간, 평균 크기)"""
+    output_dir = output_dir or tempfile.mkdtemp(prefix='thumb_bench_')
+    generator = ThumbnailGenerator(output_dir)
+    styles = list(tg.STYLES)
+    images = [generator.render_viral_thumbnail(TITLES[i % len(TITLES)], f"#{i} Check NOW!",
+                                               styles[i % len(styles)])
+              for i in range(count)]
+
+    results = []
+    for name in image_profiles.PROFILES:
+        encoded = [image_profiles.save_image(img, os.path.join(output_dir, f'encode_{i}'), name)
+                   for i, img in enumerate(images)]
+        seconds = sum(e.seconds for e in encoded)
+        results.append({
+            'benchmark': 'thumbnail_encode',
+            'renderer': name,
+            'count': count,
+            'wall_s': round(seconds, 3),
+            'cpu_s': round(seconds, 3),
+            'child_cpu_s': 0.0,
+            'per_second': round(count / seconds, 1),
+            'kb_per_image': round(sum(e.bytes for e in encoded) / count / 1024, 1),
+        })
+    return results
+
+
+def run_thumbnail_benchmark(count: int = 30, save: bool = False, output_dir: str = None) -> list:
+    """방식별 초당 썸네일 수"""
+    output_dir = output_dir or tempfile.mkdtemp(prefix='thumb_bench_')
+    generator = ThumbnailGenerator(output_dir)
+    styles = list(tg.STYLES)
+
+    def job(i):
+        return TITLES[i % len(TITLES)], f"#{i} Check NOW!", styles[i % len(styles)]
+
+    variants = {
+        'legacy': lambda i: render_legacy(generator, *job(i)),
+        'cached': lambda i: generator.render_viral_thumbnail(*job(i)),
+    }
+
+    results = []
+    for name, render in variants.items():
+        tg.clear_caches()
+        start = time.perf_counter()
+        cpu = time.process_time()
+        for i in range(count):
+            img = render(i)
+            if save:
+                img.save(os.path.join(output_dir, f'{name}_{i % 3}.png'), quality=95)
+        wall = time.perf_counter() - start
+        results.append({
+            'benchmark': 'thumbnails',
+            'renderer': name + ('+save' if save else ''),
+            'count': count,
+            'wall_s': round(wall, 3),
+            'cpu_s': round(time.process_time() - cpu, 3),
+            'child_cpu_s': 0.0,
+            'per_second': round(count / wall, 1),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='썸네일 렌더링 벤치마크')
+    parser.add_argument('--count', type=int, default=30, help='방식별 썸네일 수')
+    parser.add_argument('--save', action='store_true', help='PNG 저장 시간 포함')
+    parser.add_argument('--json', default=None, help='결과 JSON 저장 경로 (선택)')
+    args = parser.parse_args()
+
+    results = run_thumbnail_benchmark(args.count, args.save)
+    layout_results = run_layout_benchmark(args.count * 10)
+    encode_results = run_encode_benchmark(min(args.count, 10))
+
+    print(f"\n{'renderer':<15}{'count':>8}{'wall(s)':>10}{'thumbs/s':>10}")
+    for r in results:
+        print(f"{r['renderer']:<15}{r['count']:>8}{r['wall_s']:>10.2f}{r['per_second']:>10.1f}")
+
+    if results[1]['wall_s'] > 0:
+        print(f"\n속도 향상: {results[0]['wall_s'] / results[1]['wall_s']:.1f}x")
+
+    print(f"\n{'layout':<15}{'count':>8}{'wall(s)':>10}{'titles/s':>10}")
+    for r in layout_results:
+        print(f"{r['renderer']:<15}{r['count']:>8}{r['wall_s']:>10.2f}{r['per_second']:>10.1f}")
+    results += layout_results
+
+    print(f"\n{'encode':<15}{'count':>8}{'ms/img':>10}{'KB/img':>10}")
+    for r in encode_results:
+        print(f"{r['renderer']:<15}{r['count']:>8}{r['wall_s'] * 1000 / r['count']:>10.1f}{r['kb_per_image']:>10.1f}")
+    results += encode_results
+
+    if args.json:
+        os.makedirs(os.path.dirname(args.json) or '.', exist_ok=True)
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
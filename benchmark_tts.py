@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+TTS 백엔드 처리량 벤치마크 (초당 파일 수 / 초당 글자 수)
+
+백엔드마다 같은 스크립트 묶음을 synthesize_batch로 합성합니다.
+segments: 여러 톤 세그먼트를 한 파일로 만들 때
+  legacy = 세그먼트마다 MP3 저장 + concat (이전 방식)
+  piped  = 세그먼트 PCM을 ffmpeg 하나에 흘려 한 번 인코딩 (ProVoiceGenerator)
+gtts는 네트워크, pyttsx3/piper는 설치된 엔진과 음성 모델이 필요하므로
+사용할 수 없는 백엔드는 건너뛰고 사유를 표시합니다.
+
+사용법:
+    python benchmark_tts.py
+    python benchmark_tts.py --backends stub pyttsx3 piper --count 20
+    python benchmark_tts.py --backends stub --lang ko --json output/bench/tts.json
+    python benchmark_tts.py --segments 12 --segment-backend pyttsx3
+"""
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import subprocess
+import time
+
+from tts_backends import BACKENDS, get_backend
+
+SCRIPTS = {
+    'ko': "서울 부동산 핫딜! 자양동 래미안크레시티 84제곱미터, 5억 7천만원! 지금 바로 확인해보세요!",
+    'en': "Seoul real estate alert! Prime apartment, 84 square meters, 430 thousand dollars. Check it now!",
+    'es': "¡Alerta inmobiliaria en Seúl! Apartamento de 84 metros cuadrados por 430 mil dólares.",
+    'ja': "ソウル不動産速報！84平米のマンションが4300万円。今すぐチェック！",
+}
+
+
+def run_tts_benchmark(backends=('stub',), count: int = 8, lang: str = 'en',
+                      output_dir: str = None) -> list:
+    """백엔드별 count개 합성 시간 (실패한 백엔드는 error만 기록)"""
+    output_dir = output_dir or tempfile.mkdtemp(prefix='tts_bench_')
+    script = SCRIPTS.get(lang, SCRIPTS['en'])
+
+    results = []
+    for name in backends:
+        backend = get_backend(name)
+        requests = [(f"{i}. {script}", lang, os.path.join(output_dir, f'{name}_{i}.mp3'))
+                    for i in range(count)]
+
+        start = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            outputs = backend.synthesize_batch(requests)
+        except Exception as e:
+            results.append({'benchmark': 'tts', 'renderer': name, 'count': 0,
+                            'error': f'{type(e).__name__}: {e}'})
+            continue
+        wall = time.perf_counter() - start
+
+        done = [r for r, out in zip(requests, outputs) if out]
+        chars = sum(len(r[0]) for r in done)
+        results.append({
+            'benchmark': 'tts',
+            'renderer': name,
+            'count': len(done),
+            'wall_s': round(wall, 3),
+            'cpu_s': round(time.process_time() - cpu, 3),
+            'child_cpu_s': 0.0,
+            'per_second': round(len(done) / wall, 2),
+            'chars_per_second': round(chars / wall, 1),
+            'kb_per_file': round(sum(os.path.getsize(r[2]) for r in done) / max(len(done), 1) / 1024, 1),
+            'concurrency': backend.max_concurrent,
+        })
+        if not done:
+            results[-1]['error'] = '합성된 파일 없음'
+
+    shutil.rmtree(output_dir, ignore_errors=True)
+    return results
+
+
+def legacy_segments(backend, items, output_file: str, work_dir: str) -> str:
+    """이전 방식: 세그먼트마다 MP3로 저장한 뒤 concat demuxer로 합침"""
+    temp_files = []
+    for i, (script, lang, style) in enumerate(items):
+        backend.set_style(*style)
+        temp_files.append(backend.synthesize(script, lang, os.path.join(work_dir, f'segment_{i}.mp3')))
+
+    concat_file = os.path.join(work_dir, 'concat_list.txt')
+    with open(concat_file, 'w') as f:
+        for temp in temp_files:
+            f.write(f"file '{os.path.abspath(temp)}'\n")
+    subprocess.run(['ffmpeg', '-y', '-loglevel', 'error', '-f', 'concat', '-safe', '0',
+                    '-i', concat_file, '-c', 'copy', output_file], check=True)
+    for temp in temp_files + [concat_file]:
+        os.remove(temp)
+    return output_file
+
+
+def run_segment_benchmark(backend: str = 'stub', segments: int = 8, lang: str = 'en',
+                          output_dir: str = None) -> list:
+    """여러 세그먼트 → MP3 하나: legacy vs piped"""
+    from pro_voice_generator import ProVoiceGenerator
+
+    output_dir = output_dir or tempfile.mkdtemp(prefix='tts_bench_')
+    styles = list(ProVoiceGenerator.STYLES)
+    script = SCRIPTS.get(lang, SCRIPTS['en'])
+    specs = [{'text': f"{i}. {script}", 'style': styles[i % len(styles)]} for i in range(segments)]
+
+    generator = ProVoiceGenerator(output_dir, backend=backend)
+    items = [(s['text'], lang, ProVoiceGenerator.STYLES[s['style']]) for s in specs]
+    variants = {
+        'legacy': lambda out: legacy_segments(generator.backend, items, out, output_dir),
+        'piped': lambda out: generator.generate_multi_segment_audio(specs, out, lang),
+    }
+
+    results = []
+    for name, run in variants.items():
+        output_file = os.path.join(output_dir, f'segments_{name}.mp3')
+        start = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            ok = run(output_file) is not None
+        except Exception as e:
+            print(f"✗ {name} 실패: {e}")
+            ok = False
+        wall = time.perf_counter() - start
+        results.append({
+            'benchmark': 'tts_segments',
+            'renderer': f'{backend}/{name}',
+            'count': segments if ok else 0,
+            'wall_s': round(wall, 3),
+            'cpu_s': round(time.process_time() - cpu, 3),
+            'child_cpu_s': 0.0,
+            'per_second': round(segments / wall, 2) if ok else 0.0,
+        })
+    generator.close()
+
+    shutil.rmtree(output_dir, ignore_errors=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='TTS 백엔드 처리량 벤치마크')
+    parser.add_argument('--backends', nargs='+', default=['stub'], choices=list(BACKENDS),
+                        help='비교할 백엔드')
+    parser.add_argument('--count', type=int, default=8, help='백엔드별 나레이션 수')
+    parser.add_argument('--lang', default='en', choices=list(SCRIPTS), help='스크립트 언어')
+    parser.add_argument('--segments', type=int, default=8, help='세그먼트 결합 벤치마크의 세그먼트 수 (0이면 생략)')
+    parser.add_argument('--segment-backend', default='stub', choices=list(BACKENDS),
+                        help='세그먼트 결합 벤치마크 백엔드')
+    parser.add_argument('--json', default=None, help='결과 JSON 저장 경로 (선택)')
+    args = parser.parse_args()
+
+    results = run_tts_benchmark(args.backends, args.count, args.lang)
+
+    print(f"\n{'backend':<10}{'count':>7}{'wall(s)':>10}{'files/s':>10}{'chars/s':>10}{'KB/file':>10}")
+    for r in results:
+        if r['count']:
+            print(f"{r['renderer']:<10}{r['count']:>7}{r['wall_s']:>10.2f}{r['per_second']:>10.2f}"
+                  f"{r['chars_per_second']:>10.1f}{r['kb_per_file']:>10.1f}")
+        if r.get('error'):
+            print(f"{r['renderer']:<10}  건너뜀: {r['error']}")
+
+    if args.segments:
+        segment_results = run_segment_benchmark(args.segment_backend, args.segments, args.lang)
+        print(f"\n{'segments':<18}{'count':>7}{'wall(s)':>10}{'seg/s':>10}")
+        for r in segment_results:
+            print(f"{r['renderer']:<18}{r['count']:>7}{r['wall_s']:>10.2f}{r['per_second']:>10.2f}")
+        results += segment_results
+
+    if args.json:
+        os.makedirs(os.path.dirname(args.json) or '.', exist_ok=True)
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,18 +5,29 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 
+from location_index import LocationIndex
+
 
 class RealEstateDataProcessor:
     def __init__(self, excel_file):
         self.excel_file = excel_file
         self.df = None
         self.top_deals = None
+        self.price_index = None
+        self.hedonic_index = None
+        self.location_index = LocationIndex()
 
     def load_data(self):
-        """엑셀 파일 로드"""
+        """데이터 파일 로드 (엑셀, 대용량은 .parquet / .csv)"""
         print(f"데이터 로딩 중: {self.excel_file}")
-        # KB 실거래 데이터는 보통 12번째 행부터 실제 헤더가 시작됨
-        self.df = pd.read_excel(self.excel_file, header=12)
+        suffix = str(self.excel_file).lower().rsplit('.', 1)[-1]
+        if suffix == 'parquet':
+            self.df = pd.read_parquet(self.excel_file)
+        elif suffix == 'csv':
+            self.df = pd.read_csv(self.excel_file)
+        else:
+            # KB 실거래 데이터는 보통 12번째 행부터 실제 헤더가 시작됨
+            self.df = pd.read_excel(self.excel_file, header=12)
         print(f"총 {len(self.df)}개의 거래 데이터 로드 완료")
         return self.df
 
@@ -53,6 +64,10 @@ class RealEstateDataProcessor:
             self.df['거래금액_숫자'] = self.df['거래금액_숫자'] * 10000
             print(f"거래금액 변환 완료: {price_col} → 거래금액_숫자 (원 단위)")
 
+        # 위치 토큰화 (정수 ID + 조회 테이블)
+        self.df['위치ID'] = self.location_index.encode(self.df)
+        print(f"위치 토큰화 완료: {len(self.location_index.table)}개 위치")
+
         # 날짜 처리
         date_columns = [col for col in self.df.columns if '년' in col or '날짜' in col or '계약' in col]
         if date_columns:
@@ -60,14 +75,28 @@ class RealEstateDataProcessor:
 
         return self.df
 
+    def build_price_index(self, analyzer=None):
+        """가격 정렬 인덱스 생성 (clean_data 후 한 번, 이후 예산별 질의는 이진 탐색)"""
+        from price_index import PriceIndex
+
+        if analyzer is None:
+            from investment_analyzer import InvestmentAnalyzer
+            analyzer = InvestmentAnalyzer(location_index=self.location_index)
+        self.price_index = PriceIndex(self.df, analyzer)
+        return self.price_index
+
     def find_hot_deals(self, top_n=3, max_price=600000000):
         """핫딜 찾기 (6억 이하)"""
         if '거래금액_숫자' not in self.df.columns:
             print("거래금액 데이터가 없습니다.")
             return None
 
-        # 6억 이하 필터링
-        filtered_df = self.df[self.df['거래금액_숫자'] <= max_price].copy()
+        # 6억 이하 필터링 (인덱스가 있으면 가격순 prefix만 사용)
+        if self.price_index is not None:
+            rows = self.price_index.features_under(max_price)['행번호']
+            filtered_df = self.df.iloc[rows].copy()
+        else:
+            filtered_df = self.df[self.df['거래금액_숫자'] <= max_price].copy()
 
         # 최근 거래 우선
         if '계약년월' in self.df.columns and '계약일' in self.df.columns:
@@ -105,6 +134,25 @@ class RealEstateDataProcessor:
             return trend
         return None
 
+    def calculate_hedonic_trend(self):
+        """품질 보정(헤도닉) 월별 가격 추이"""
+        from hedonic_index import HedonicPriceIndex
+
+        if '계약년월' not in self.df.columns or '거래금액_숫자' not in self.df.columns:
+            return None
+
+        # 기존 지수가 있으면 아직 넣지 않은 거래(이미 있는 월의 늦은 신고 포함)만 누적 후 재적합
+        if self.hedonic_index is None:
+            self.hedonic_index = HedonicPriceIndex()
+        if self.hedonic_index.update(self.df) or self.hedonic_index.coef is None:
+            self.hedonic_index.fit()
+
+        trend = self.hedonic_index.index()
+        if trend is not None:
+            print("\n월별 헤도닉 가격 지수:")
+            print(trend)
+        return trend
+
     def generate_script(self):
         """Generate English voice script"""
         if self.top_deals is None or len(self.top_deals) == 0:
@@ -0,0 +1,202 @@
+"""
+ffmpeg 작업 실행기 (asyncio)
+
+ffmpeg 작업을 큐에 넣고 동시에 N개씩, 작업마다 -threads를 나눠 실행합니다.
+-progress 출력으로 진행률을 읽고, 작업별 시간 제한과 취소를 지원하며
+결과는 FFmpegResult로 돌려줍니다.
+"""
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+from parallel_render import default_workers
+
+
+@dataclass
+class FFmpegJob:
+    """ffmpeg 명령 하나 (cmd는 'ffmpeg'으로 시작, 마지막 인자가 출력 파일)"""
+    cmd: List[str]
+    name: str = ''
+    timeout: Optional[float] = None
+    input: Optional[bytes] = None
+
+
+@dataclass
+class FFmpegResult:
+    """작업 결과 (progress는 마지막 -progress 블록: frame, fps, speed, out_time 등)"""
+    name: str
+    cmd: List[str]
+    returncode: Optional[int]
+    elapsed: float
+    stderr: str = ''
+    progress: Dict[str, str] = field(default_factory=dict)
+    timed_out: bool = False
+    cancelled: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0 and not (self.timed_out or self.cancelled)
+
+    @property
+    def output(self) -> str:
+        return self.cmd[-1]
+
+
+class FFmpegRunner:
+    """ffmpeg 작업을 동시에 max_jobs개까지 실행
+
+    여러 작업을 함께 실행할 때(run_all / run_batch)는 코어를 작업당 나눠
+    -threads를 붙입니다 (기본: 8코어 → 4개 동시 실행, 각 -threads 2).
+    작업 하나만 실행할 때(run_sync, run_all에 작업 1개)는 ffmpeg가 모든 코어를 쓰도록
+    -threads를 붙이지 않고, threads_per_job을 직접 준 경우에만 그 값으로 제한합니다.
+    """
+
+    def __init__(
+        self,
+        max_jobs: Optional[int] = None,
+        threads_per_job: Optional[int] = None,
+        on_progress: Optional[Callable[[str, Dict[str, str]], None]] = None
+    ):
+        cores = default_workers()
+        self.max_jobs = max_jobs or max(1, cores // 2)
+        # 직접 준 값은 모든 작업에, 코어 분할 값은 동시에 실행할 때만 적용
+        self.threads_per_job = threads_per_job
+        self.batch_threads = threads_per_job or max(1, cores // self.max_jobs)
+        self.on_progress = on_progress
+        self._procs = set()
+        self._cancelled = set()   # cancel_all로 종료한 프로세스
+
+    def _prepare(self, cmd: Sequence[str], threads: Optional[int] = None) -> List[str]:
+        """진행률 출력과 작업당 스레드 수(threads가 있을 때만) 추가"""
+        cmd = list(cmd)
+        extra = ['-progress', 'pipe:1', '-nostats']
+        if threads and '-threads' not in cmd:
+            cmd[-1:-1] = ['-threads', str(threads)]
+        return cmd[:1] + extra + cmd[1:]
+
+    async def _read_progress(self, stream, name: str, progress: dict):
+        block = {}
+        async for raw in stream:
+            key, _, value = raw.decode(errors='replace').strip().partition('=')
+            if not key:
+                continue
+            block[key] = value
+            if key == 'progress':
+                progress.clear()
+                progress.update(block)
+                block = {}
+                if self.on_progress:
+                    self.on_progress(name, dict(progress))
+
+    async def _feed(self, stdin, data: bytes):
+        try:
+            stdin.write(data)
+            await stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            stdin.close()
+
+    async def run(self, job: FFmpegJob, semaphore: Optional[asyncio.Semaphore] = None,
+                  threads: Optional[int] = None) -> FFmpegResult:
+        """작업 하나 실행 (semaphore가 있으면 슬롯을 얻은 뒤 시작)
+
+        threads가 없으면 threads_per_job (생성할 때 주지 않았으면 제한 없음)을 씁니다.
+        """
+        if semaphore is not None:
+            async with semaphore:
+                return await self.run(job, threads=threads)
+
+        cmd = self._prepare(job.cmd, threads or self.threads_per_job)
+        start = time.perf_counter()
+        progress = {}
+
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE if job.input is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        self._procs.add(proc)
+
+        io = [self._read_progress(proc.stdout, job.name, progress), proc.stderr.read()]
+        if job.input is not None:
+            io.append(self._feed(proc.stdin, job.input))
+
+        timed_out = False
+        stderr = b''
+        try:
+            outputs = await asyncio.wait_for(asyncio.gather(*io), job.timeout)
+            stderr = outputs[1]
+            await proc.wait()
+        except asyncio.TimeoutError:
+            timed_out = True
+        finally:
+            # 작업이 바깥에서 취소되어도 ffmpeg를 종료하고 회수한 뒤 CancelledError를 전파
+            self._procs.discard(proc)
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+
+        cancelled = proc in self._cancelled
+        self._cancelled.discard(proc)
+
+        return FFmpegResult(
+            name=job.name,
+            cmd=cmd,
+            returncode=proc.returncode,
+            elapsed=time.perf_counter() - start,
+            stderr=stderr.decode(errors='replace'),
+            progress=progress,
+            timed_out=timed_out,
+            cancelled=cancelled
+        )
+
+    async def run_all(self, jobs: Sequence[FFmpegJob]) -> List[FFmpegResult]:
+        """작업 목록을 max_jobs개씩 동시에 실행 (결과는 입력 순서)"""
+        semaphore = asyncio.Semaphore(self.max_jobs)
+        # 동시에 실행될 때만 코어를 나눔
+        threads = self.batch_threads if min(len(jobs), self.max_jobs) > 1 else None
+        tasks = [asyncio.ensure_future(self.run(job, semaphore, threads)) for job in jobs]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except asyncio.CancelledError:
+            # gather가 이미 각 작업을 취소했으므로 ffmpeg 정리가 끝날 때까지 기다린 뒤 전파
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    def cancel_all(self):
+        """실행 중인 ffmpeg 프로세스 모두 종료 (해당 결과는 cancelled=True)"""
+        for proc in list(self._procs):
+            if proc.returncode is None:
+                self._cancelled.add(proc)
+                proc.kill()
+
+    def run_sync(self, job: Union[FFmpegJob, List[str]], timeout: Optional[float] = None) -> FFmpegResult:
+        """동기 호출용 (이벤트 루프 밖에서)"""
+        if not isinstance(job, FFmpegJob):
+            job = FFmpegJob(list(job), timeout=timeout)
+        return asyncio.run(self.run(job))
+
+    def run_batch(self, jobs: Sequence[Union[FFmpegJob, List[str]]]) -> List[FFmpegResult]:
+        """동기 배치 실행"""
+        jobs = [job if isinstance(job, FFmpegJob) else FFmpegJob(list(job)) for job in jobs]
+        return asyncio.run(self.run_all(jobs))
+
+
+if __name__ == "__main__":
+    runner = FFmpegRunner(on_progress=lambda name, p: print(
+        f"  {name}: frame={p.get('frame')} fps={p.get('fps')} speed={p.get('speed')}"))
+
+    os.makedirs('output', exist_ok=True)
+    jobs = [
+        FFmpegJob(['ffmpeg', '-y', '-f', 'lavfi', '-i', f'testsrc=size=1080x1920:rate=30:d={d}',
+                   '-c:v', 'libx264', '-pix_fmt', 'yuv420p', f'output/runner_test_{d}.mp4'],
+                  name=f'test_{d}s')
+        for d in (2, 4, 6)
+    ]
+    print(f"{len(jobs)}개 작업, 동시 {runner.max_jobs}개, 작업당 {runner.batch_threads} 스레드")
+    for result in runner.run_batch(jobs):
+        print(f"{result.name}: ok={result.ok} {result.elapsed:.2f}초 speed={result.progress.get('speed')}")
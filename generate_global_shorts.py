@@ -4,6 +4,10 @@
 
 사용법:
     python generate_global_shorts.py --lang en --country US --theme comparison
+    python generate_global_shorts.py --thumbnail-matrix    # 모든 언어 x 국가 x 테마 썸네일만
+    python generate_global_shorts.py --thumbnail-matrix --image-format webp
+    python generate_global_shorts.py --script-matrix --prices 300000000 600000000 1200000000
+    python generate_global_shorts.py --narrate-langs ko en es ja    # 같은 쇼츠의 4개 언어 나레이션 동시 생성
 """
 
 import argparse
@@ -11,27 +15,66 @@ import os
 from pathlib import Path
 import json
 from datetime import datetime
+from functools import cached_property
+from typing import TYPE_CHECKING
 
-from data_processor import RealEstateDataProcessor
-from global_data_api import GlobalRealEstateAPI
-from multilingual_script import MultilingualScriptGenerator
-from thumbnail_generator import ThumbnailGenerator
-from visualizer import RealEstateVisualizer
-from video_composer import VideoComposer
+from audio_probe import video_duration
+from image_profiles import DEFAULT_PROFILE, PROFILES
+from stage_executor import Stage, StageExecutor
+from stage_profiler import StageProfiler
+from tts_backends import BACKENDS
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+LANGS = ['ko', 'en', 'es', 'ja']
+COUNTRIES = ['US', 'JP', 'UK', 'SG', 'CN']
+THEMES = ['comparison', 'bubble_warning', 'investment_secret']
+
+# 테마별 썸네일 (비교 테마는 가격 비교, 나머지는 스타일별 바이럴 썸네일)
+THEME_THUMBNAILS = {
+    'bubble_warning': ('warning', 'warning'),      # (썸네일 스타일, 제목 스타일)
+    'investment_secret': ('secret', 'secret'),
+}
 
 
 class GlobalShortsGenerator:
     """글로벌 바이럴 쇼츠 생성기"""
 
-    def __init__(self, output_dir='output/global'):
+    def __init__(self, output_dir='output/global', profiler: StageProfiler = None,
+                 image_profile: str = DEFAULT_PROFILE, tts_backend='gtts'):
         self.output_dir = Path(output_dir)
+        self.image_profile = image_profile
+        self.tts_backend = tts_backend
         self.output_dir.mkdir(parents=True, exist_ok=True)
-
-        self.api = GlobalRealEstateAPI()
-        self.script_gen = MultilingualScriptGenerator(str(self.output_dir))
-        self.thumb_gen = ThumbnailGenerator(str(self.output_dir))
-        self.visualizer = RealEstateVisualizer(str(self.output_dir))
-        self.composer = VideoComposer(str(self.output_dir))
+        self.profiler = profiler or StageProfiler('global_shorts')
+        self.executor = StageExecutor(profiler=self.profiler)
+
+    # 구성 요소는 처음 쓰일 때 생성 (matplotlib, PIL 등은 해당 단계에서만 로드)
+    @cached_property
+    def api(self):
+        from global_data_api import GlobalRealEstateAPI
+        return GlobalRealEstateAPI()
+
+    @cached_property
+    def script_gen(self):
+        from multilingual_script import MultilingualScriptGenerator
+        return MultilingualScriptGenerator(str(self.output_dir), self.tts_backend)
+
+    @cached_property
+    def thumb_gen(self):
+        from thumbnail_generator import ThumbnailGenerator
+        return ThumbnailGenerator(str(self.output_dir), self.image_profile)
+
+    @cached_property
+    def visualizer(self):
+        from visualizer import RealEstateVisualizer
+        return RealEstateVisualizer(str(self.output_dir))
+
+    @cached_property
+    def composer(self):
+        from video_composer import VideoComposer
+        return VideoComposer(str(self.output_dir))
 
     def generate_shorts(
         self,
@@ -50,7 +93,6 @@ class GlobalShortsGenerator:
 
         # 1. 데이터 준비
         kr_price = kr_data.get('price', 600000000)  # 기본 6억
-        kr_price_억 = kr_price / 100000000
 
         # 2. 글로벌 비교 데이터
         comparisons = self.api.get_global_comparison(kr_price)
@@ -59,11 +101,21 @@ class GlobalShortsGenerator:
             print(f"경고: {country} 데이터 없음, US로 대체")
             country = 'US'
 
-        comp = comparisons[country]
-
         # 3. 스크립트 데이터 준비
-        script_data = {
-            'kr_price_억': kr_price_억,
+        script_data = self._script_data(kr_price, comparisons[country])
+
+        # 4. A/B 테스트 모드
+        if ab_test:
+            return self._generate_ab_test_shorts(script_data, lang, country)
+
+        # 5. 단일 쇼츠 생성
+        return self._generate_single_shorts(script_data, lang, country, theme)
+
+    @staticmethod
+    def _script_data(kr_price: int, comp: dict) -> dict:
+        """글로벌 비교 결과 → 스크립트/썸네일 데이터"""
+        return {
+            'kr_price_억': kr_price / 100000000,
             'kr_price_usd': comp['kr_price_usd'],
             'city': comp['city'],
             'city_price': comp['avg_price'],
@@ -71,12 +123,81 @@ class GlobalShortsGenerator:
             'is_cheaper': comp['is_cheaper']
         }
 
-        # 4. A/B 테스트 모드
-        if ab_test:
-            return self._generate_ab_test_shorts(script_data, lang, country)
+    def build_script_matrix(
+        self,
+        prices: list,
+        langs: list = None,
+        countries: list = None,
+        themes: list = None
+    ) -> 'pd.DataFrame':
+        """테마 x 언어 x 국가 x 가격 조합의 스크립트를 한 번에 생성 (중복 텍스트는 한 번만 포맷)
+
+        Returns:
+            DataFrame [theme, lang, key_country, key_price, script, text_hash, duplicate]
+            (theme은 generate_shorts와 같은 이름, text_hash는 TTS 캐시 키)
+        """
+        rows = []
+        for price in prices:
+            comparisons = self.api.get_global_comparison(price)
+            for country in countries or COUNTRIES:
+                if country not in comparisons:
+                    print(f"경고: {country} 데이터 없음, 건너뜀")
+                    continue
+                rows.append({**self._script_data(price, comparisons[country]),
+                             'key_country': country, 'key_price': price})
+
+        themes = themes or THEMES
+        frame = self.script_gen.generate_script_matrix(rows, [f'global_{t}' for t in themes], langs or LANGS)
+        if not frame.empty:
+            frame['theme'] = frame['theme'].str.replace('global_', '', n=1, regex=False)
+        return frame
+
+    def render_thumbnail_matrix(
+        self,
+        kr_price: int,
+        langs: list = None,
+        countries: list = None,
+        themes: list = None,
+        workers: int = None
+    ) -> list:
+        """언어 x 국가 x 테마 조합의 썸네일을 한 번에 렌더링 (프로세스 풀)
 
-        # 5. 단일 쇼츠 생성
-        return self._generate_single_shorts(script_data, lang, country, theme)
+        Returns:
+            [{'lang', 'country', 'theme', 'thumbnail', 'render_s', 'save_s', 'bytes'}, ...]
+        """
+        from thumbnail_generator import ThumbnailSpec
+
+        comparisons = self.api.get_global_comparison(kr_price)
+        out_dir = self.output_dir / 'thumbnails'
+
+        combos, specs = [], []
+        for country in countries or COUNTRIES:
+            if country not in comparisons:
+                print(f"경고: {country} 데이터 없음, 건너뜀")
+                continue
+            data = self._script_data(kr_price, comparisons[country])
+            for lang in langs or LANGS:
+                for theme in themes or THEMES:
+                    output_file = str(out_dir / f'{lang}_{country}_{theme}.png')
+                    if theme in THEME_THUMBNAILS:
+                        style, title_style = THEME_THUMBNAILS[theme]
+                        spec = ThumbnailSpec(output_file, title=self._generate_title(data, lang, title_style),
+                                             subtitle=data['city'], style=style)
+                    else:
+                        spec = ThumbnailSpec(output_file, kind='comparison',
+                                             kr_price=f"${data['kr_price_usd']:,.0f}",
+                                             global_price=f"${data['city_price']:,.0f}",
+                                             city=f"{data.get('emoji', '🌍')} {data['city']}",
+                                             diff_pct=data['diff'])
+                    combos.append((lang, country, theme))
+                    specs.append(spec)
+
+        results = self.thumb_gen.render_batch(specs, workers=workers)
+        return [
+            {'lang': lang, 'country': country, 'theme': theme, 'thumbnail': r.output_file,
+             'render_s': round(r.render_s, 4), 'save_s': round(r.save_s, 4), 'bytes': r.bytes}
+            for (lang, country, theme), r in zip(combos, results)
+        ]
 
     def _generate_single_shorts(
         self,
@@ -87,87 +208,171 @@ class GlobalShortsGenerator:
     ) -> dict:
         """단일 쇼츠 생성"""
 
+        prepared = self._prepare_shorts(data, lang, country, theme, with_video=True)
+        base_name = prepared['base_name']
+        video_file = prepared['video']
+
+        # 5. 최종 합성 (음성과 영상이 모두 끝난 뒤)
+        print(f"[5/5] 최종 합성")
+        if video_file and prepared['audio_file']:
+            with self.profiler.stage(f'{theme}/5_compose'):
+                final_video = self.composer.create_shorts_video(
+                    video_file,
+                    prepared['audio_file'],
+                    output_file=str(self.output_dir / f'{base_name}_final.mp4')
+                )
+            return self._finish_shorts(data, lang, country, prepared, final_video)
+
+        return {'success': False, 'error': '비디오/음성 생성 실패'}
+
+    def _prepare_shorts(
+        self,
+        data: dict,
+        lang: str,
+        country: str,
+        theme: str,
+        with_video: bool = False,
+        narration: dict = None
+    ) -> dict:
+        """스크립트, 음성, 썸네일 생성 (1~3단계, with_video면 4단계 영상까지)
+
+        스크립트 이후 음성(네트워크, 스레드)과 썸네일(CPU, 프로세스)은 동시에 실행되고,
+        영상 인코딩(ffmpeg, 스레드)은 둘 다 나오면 나레이션 길이에 맞춰 시작됩니다.
+        narration(generate_narrations 결과 항목)을 주면 스크립트와 음성은 그것을 사용합니다.
+        """
+
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         base_name = f"{lang}_{country}_{theme}_{timestamp}"
 
         # 1. 스크립트 생성
-        print(f"[1/5] 스크립트 생성 ({lang})")
-        script = self.script_gen.generate_viral_script(
-            f'global_{theme}',
-            data,
-            lang
-        )
-        print(f"스크립트: {script}\n")
-
-        # 2. 음성 생성
-        print(f"[2/5] 음성 생성")
-        audio_file = self.script_gen.generate_voice(
-            script,
-            lang,
-            str(self.output_dir / f'{base_name}_audio.mp3')
-        )
+        if narration is None:
+            print(f"[1/5] 스크립트 생성 ({lang})")
+            with self.profiler.stage(f'{theme}/1_script'):
+                script = self._script(data, lang, theme)
+            print(f"스크립트: {script}\n")
+        else:
+            script = narration['script']
+
+        # 2~4. 음성 / 썸네일 (/ 비디오) 동시 생성
+        print(f"[2/5] 음성 생성 + [3/5] 썸네일 생성" + (" + [4/5] 비디오 생성" if with_video else ""))
+        stages = []
+        if narration is None:
+            stages.append(Stage(f'{theme}/2_voice', self._generate_voice,
+                                (script, lang, str(self.output_dir / f'{base_name}_audio.mp3'))))
+        stages += [
+            Stage(f'{theme}/3_thumbnail', self.thumb_gen.create_comparison_thumbnail, kwargs=dict(
+                kr_price=f"${data['kr_price_usd']:,.0f}",
+                global_price=f"${data['city_price']:,.0f}",
+                city=f"{data.get('emoji', '🌍')} {data['city']}",
+                diff_pct=data['diff'],
+                output_file=str(self.output_dir / f'{base_name}_thumbnail.png')
+            ), kind='process'),
+        ]
+        if with_video:
+            # 썸네일을 나레이션 길이의 비디오로 (음성을 새로 만들면 그 결과를 기다림)
+            video_file = str(self.output_dir / f'{base_name}_video.mp4')
+            if narration is None:
+                stages.append(Stage(f'{theme}/4_video', self._image_to_video, (video_file,),
+                                    deps=(f'{theme}/3_thumbnail', f'{theme}/2_voice')))
+            else:
+                stages.append(Stage(f'{theme}/4_video', self._image_to_video,
+                                    (narration['audio_file'], video_file),
+                                    deps=(f'{theme}/3_thumbnail',)))
+        results = self.executor.run(stages)
+
+        return {
+            'base_name': base_name,
+            'theme': theme,
+            'script': script,
+            'audio_file': narration['audio_file'] if narration else results[f'{theme}/2_voice'],
+            'thumbnail': results[f'{theme}/3_thumbnail'],
+            'video': results.get(f'{theme}/4_video')
+        }
 
-        # 3. 썸네일 생성
-        print(f"[3/5] 썸네일 생성")
-        thumbnail = self.thumb_gen.create_comparison_thumbnail(
-            kr_price=f"${data['kr_price_usd']:,.0f}",
-            global_price=f"${data['city_price']:,.0f}",
-            city=f"{data.get('emoji', '🌍')} {data['city']}",
-            diff_pct=data['diff'],
-            output_file=str(self.output_dir / f'{base_name}_thumbnail.png')
-        )
+    def _script(self, data: dict, lang: str, theme: str) -> str:
+        return self.script_gen.generate_viral_script(f'global_{theme}', data, lang)
 
-        # 4. 비디오 생성 (썸네일을 15초 비디오로)
-        print(f"[4/5] 비디오 생성")
-        video_file = self._image_to_video(
-            thumbnail,
-            str(self.output_dir / f'{base_name}_video.mp4')
-        )
+    def _generate_voice(self, script: str, lang: str, output_file: str):
+        """음성 하나 (시간 초과/재시도 포함)"""
+        return self.script_gen.generate_voices([(script, lang, output_file)])[0]
 
-        # 5. 최종 합성
-        print(f"[5/5] 최종 합성")
-        if video_file and audio_file:
-            final_video = self.composer.create_shorts_video(
-                video_file,
-                audio_file,
-                output_file=str(self.output_dir / f'{base_name}_final.mp4')
+    def generate_narrations(self, data: dict, country: str, items: list) -> list:
+        """(언어, 테마) 목록의 스크립트를 만들고 음성을 동시에 생성
+
+        Returns:
+            [{'lang', 'theme', 'script', 'audio_file'}, ...] (입력 순서, 실패하면 audio_file=None)
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        narrations = [
+            {'lang': lang, 'theme': theme, 'script': self._script(data, lang, theme),
+             'audio_file': str(self.output_dir / f"{lang}_{country}_{theme}_{timestamp}_audio.mp3")}
+            for lang, theme in items
+        ]
+
+        print(f"나레이션 {len(narrations)}개 동시 생성")
+        with self.profiler.stage('narration'):
+            audio_files = self.script_gen.generate_voices(
+                [(n['script'], n['lang'], n['audio_file']) for n in narrations]
             )
+        for narration, audio_file in zip(narrations, audio_files):
+            narration['audio_file'] = audio_file
+        return narrations
 
-            result = {
-                'success': True,
-                'lang': lang,
-                'country': country,
-                'theme': theme,
-                'script': script,
-                'files': {
-                    'video': final_video,
-                    'audio': audio_file,
-                    'thumbnail': thumbnail
-                },
-                'metadata': {
-                    'title': self._generate_title(data, lang, 'shocking'),
-                    'description': script,
-                    'hashtags': self._generate_hashtags(theme, lang),
-                    'upload_time': '08:00'  # 미국 시간대 고려
-                }
-            }
+    def generate_multilang_narrations(self, kr_price: int, langs: list, country: str = 'US',
+                                      theme: str = 'comparison') -> list:
+        """같은 쇼츠의 여러 언어 나레이션을 동시에 생성"""
+        comparisons = self.api.get_global_comparison(kr_price)
+        if country not in comparisons:
+            print(f"경고: {country} 데이터 없음, US로 대체")
+            country = 'US'
+        data = self._script_data(kr_price, comparisons[country])
+        return self.generate_narrations(data, country, [(lang, theme) for lang in langs])
 
-            # 메타데이터 저장
-            meta_file = self.output_dir / f'{base_name}_metadata.json'
-            with open(meta_file, 'w', encoding='utf-8') as f:
-                json.dump(result, f, ensure_ascii=False, indent=2)
+    def _finish_shorts(
+        self,
+        data: dict,
+        lang: str,
+        country: str,
+        prepared: dict,
+        final_video: str
+    ) -> dict:
+        """결과 정리 및 메타데이터 저장"""
+
+        theme = prepared['theme']
+        script = prepared['script']
+        result = {
+            'success': True,
+            'lang': lang,
+            'country': country,
+            'theme': theme,
+            'script': script,
+            'files': {
+                'video': final_video,
+                'audio': prepared['audio_file'],
+                'thumbnail': prepared['thumbnail']
+            },
+            'metadata': {
+                'title': self._generate_title(data, lang, 'shocking'),
+                'description': script,
+                'hashtags': self._generate_hashtags(theme, lang),
+                'upload_time': '08:00'  # 미국 시간대 고려
+            }
+        }
 
-            print(f"\n{'='*60}")
-            print(f"✓ 쇼츠 생성 완료!")
-            print(f"{'='*60}")
-            print(f"비디오: {final_video}")
-            print(f"썸네일: {thumbnail}")
-            print(f"메타데이터: {meta_file}")
-            print(f"{'='*60}\n")
+        # 메타데이터 저장
+        meta_file = self.output_dir / f"{prepared['base_name']}_metadata.json"
+        with open(meta_file, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
 
-            return result
+        print(f"\n{'='*60}")
+        print(f"✓ 쇼츠 생성 완료!")
+        print(f"{'='*60}")
+        print(f"비디오: {final_video}")
+        print(f"썸네일: {prepared['thumbnail']}")
+        print(f"메타데이터: {meta_file}")
+        print(f"{'='*60}\n")
 
-        return {'success': False, 'error': '비디오/음성 생성 실패'}
+        return result
 
     def _generate_ab_test_shorts(
         self,
@@ -175,43 +380,58 @@ class GlobalShortsGenerator:
         lang: str,
         country: str
     ) -> list:
-        """A/B 테스트용 여러 쇼츠 생성"""
+        """A/B 테스트용 여러 쇼츠 생성 (영상 인코딩/합성은 ffmpeg 배치로 동시 실행)"""
 
         print(f"\n{'='*60}")
         print(f"A/B 테스트 모드: 3개 버전 생성")
         print(f"{'='*60}\n")
 
-        results = []
         themes = ['comparison', 'bubble_warning', 'investment_secret']
 
-        for theme in themes:
+        # 세 버전의 나레이션을 먼저 동시에 생성
+        narrations = self.generate_narrations(data, country, [(lang, theme) for theme in themes])
+
+        prepared = []
+        for theme, narration in zip(themes, narrations):
+            if not narration['audio_file']:
+                print(f"테마 {theme} 생성 실패: 음성 없음")
+                continue
             try:
-                result = self._generate_single_shorts(data, lang, country, theme)
-                results.append(result)
+                item = self._prepare_shorts(data, lang, country, theme, narration=narration)
+                if item['thumbnail'] and item['audio_file']:
+                    prepared.append(item)
             except Exception as e:
                 print(f"테마 {theme} 생성 실패: {e}")
                 continue
 
-        return results
-
-    def _image_to_video(self, image_file: str, output_file: str, duration: int = 15) -> str:
-        """이미지를 비디오로 변환"""
+        if not prepared:
+            return []
+
+        print(f"[4/5] 비디오 생성 ({len(prepared)}개 동시)")
+        with self.profiler.stage('ab_test/4_video'):
+            videos = self.composer.encode_stills([
+                (item['thumbnail'], str(self.output_dir / f"{item['base_name']}_video.mp4"),
+                 video_duration(item['audio_file']))
+                for item in prepared
+            ])
+
+        print(f"[5/5] 최종 합성 ({len(prepared)}개 동시)")
+        ready = [(item, video) for item, video in zip(prepared, videos) if video]
+        with self.profiler.stage('ab_test/5_compose'):
+            finals = self.composer.create_shorts_videos([
+                (video, item['audio_file'], str(self.output_dir / f"{item['base_name']}_final.mp4"))
+                for item, video in ready
+            ])
+
+        return [
+            self._finish_shorts(data, lang, country, item, final)
+            for (item, _), final in zip(ready, finals) if final
+        ]
+
+    def _image_to_video(self, image_file: str, audio_file: str, output_file: str) -> str:
+        """이미지를 나레이션 길이의 비디오로 변환 (정지 화면이므로 프레임 1장만 인코딩)"""
         try:
-            import subprocess
-            cmd = [
-                'ffmpeg',
-                '-loop', '1',
-                '-i', image_file,
-                '-c:v', 'libx264',
-                '-t', str(duration),
-                '-pix_fmt', 'yuv420p',
-                '-vf', 'scale=1080:1920:force_original_aspect_ratio=decrease,pad=1080:1920:(ow-iw)/2:(oh-ih)/2:black',
-                '-y',
-                output_file
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0:
-                return output_file
+            return self.composer.encode_still(image_file, output_file, video_duration(audio_file))
         except Exception as e:
             print(f"비디오 변환 실패: {e}")
         return None
@@ -253,36 +473,78 @@ class GlobalShortsGenerator:
 
 def main():
     parser = argparse.ArgumentParser(description='글로벌 바이럴 쇼츠 생성')
-    parser.add_argument('--lang', default='en', choices=['ko', 'en', 'es', 'ja'],
+    parser.add_argument('--lang', default='en', choices=LANGS,
                        help='언어 선택')
-    parser.add_argument('--country', default='US', choices=['US', 'JP', 'UK', 'SG', 'CN'],
+    parser.add_argument('--country', default='US', choices=COUNTRIES,
                        help='비교 국가')
     parser.add_argument('--theme', default='comparison',
-                       choices=['comparison', 'bubble_warning', 'investment_secret'],
+                       choices=THEMES,
                        help='테마 선택')
     parser.add_argument('--price', type=int, default=600000000,
                        help='한국 부동산 가격 (원)')
     parser.add_argument('--ab-test', action='store_true',
                        help='A/B 테스트 모드 (3개 버전 생성)')
+    parser.add_argument('--profile', action='store_true',
+                       help='가장 느린 단계의 cProfile 통계 저장 (output/profile)')
+    parser.add_argument('--thumbnail-matrix', action='store_true',
+                       help='모든 언어 x 국가 x 테마 썸네일만 생성')
+    parser.add_argument('--script-matrix', action='store_true',
+                       help='모든 테마 x 언어 x 국가 x 가격 스크립트만 생성 (CSV)')
+    parser.add_argument('--prices', type=int, nargs='+', default=None,
+                       help='--script-matrix용 가격 목록 (원, 기본: --price)')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='썸네일 배치 렌더링 프로세스 수 (기본: 코어 수)')
+    parser.add_argument('--narrate-langs', nargs='+', choices=LANGS, default=None,
+                       help='선택한 테마의 나레이션만 여러 언어로 동시 생성')
+    parser.add_argument('--tts', default='gtts', choices=list(BACKENDS),
+                       help='TTS 백엔드 (gtts: 네트워크, pyttsx3/piper: 오프라인, stub: 테스트용 비프음)')
+    parser.add_argument('--image-format', default=DEFAULT_PROFILE, choices=list(PROFILES),
+                       help='썸네일 저장 프로필 (png, png-fast, png-small, jpeg, webp)')
 
     args = parser.parse_args()
 
-    # 생성기 초기화
-    generator = GlobalShortsGenerator()
-
-    # 데이터 준비
-    kr_data = {
-        'price': args.price
-    }
-
-    # 쇼츠 생성
-    result = generator.generate_shorts(
-        kr_data,
-        lang=args.lang,
-        country=args.country,
-        theme=args.theme,
-        ab_test=args.ab_test
-    )
+    if args.narrate_langs:
+        generator = GlobalShortsGenerator(profiler=StageProfiler('global_shorts', enabled=False),
+                                          tts_backend=args.tts)
+        narrations = generator.generate_multilang_narrations(args.price, args.narrate_langs,
+                                                             args.country, args.theme)
+        for n in narrations:
+            print(f"  [{n['lang']}] {n['audio_file'] or '실패'}")
+        return
+
+    if args.script_matrix:
+        generator = GlobalShortsGenerator(profiler=StageProfiler('global_shorts', enabled=False))
+        frame = generator.build_script_matrix(args.prices or [args.price])
+        output_file = generator.output_dir / 'script_matrix.csv'
+        frame.to_csv(output_file, index=False, encoding='utf-8-sig')
+        print(f"\n{len(frame)}개 스크립트 → {output_file}")
+        return
+
+    if args.thumbnail_matrix:
+        generator = GlobalShortsGenerator(profiler=StageProfiler('global_shorts', enabled=False),
+                                          image_profile=args.image_format)
+        results = generator.render_thumbnail_matrix(args.price, workers=args.workers)
+        print(f"\n{len([r for r in results if r['thumbnail']])}개 썸네일 → {generator.output_dir / 'thumbnails'}")
+        return
+
+    with StageProfiler('global_shorts', profile=args.profile) as profiler:
+        # 생성기 초기화
+        generator = GlobalShortsGenerator(profiler=profiler, image_profile=args.image_format,
+                                          tts_backend=args.tts)
+
+        # 데이터 준비
+        kr_data = {
+            'price': args.price
+        }
+
+        # 쇼츠 생성
+        result = generator.generate_shorts(
+            kr_data,
+            lang=args.lang,
+            country=args.country,
+            theme=args.theme,
+            ab_test=args.ab_test
+        )
 
     if isinstance(result, list):
         print(f"\n총 {len(result)}개 쇼츠 생성 완료!")
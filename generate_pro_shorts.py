@@ -11,17 +11,20 @@ Professional Investment Analysis Shorts Generator
 사용법:
     python generate_pro_shorts.py
     python generate_pro_shorts.py --budget 800000000 --city "New York"
+    python generate_pro_shorts.py --objective roi --max-per-dong 1
+    python generate_pro_shorts.py --profile
+    python generate_pro_shorts.py --tts piper    # 로컬 신경망 TTS (PIPER_VOICES 모델 필요)
 """
 
 import argparse
 from pathlib import Path
 import os
 
-from data_processor import RealEstateDataProcessor
-from investment_analyzer import InvestmentAnalyzer
-from pro_voice_generator import ProVoiceGenerator
-from pro_video_creator import ProVideoCreator
-from global_data_api import GlobalRealEstateAPI
+from stage_profiler import StageProfiler
+from tts_backends import BACKENDS
+
+# Heavy modules (pandas, scipy, pyttsx3, matplotlib, MoviePy) are imported by
+# the stage that needs them, so --help and argument errors return immediately
 
 
 def main():
@@ -33,9 +36,29 @@ def main():
                        help='Comparison city')
     parser.add_argument('--data', default=None,
                        help='Excel data file (optional)')
+    parser.add_argument('--objective', default='score', choices=['score', 'roi'],
+                       help='Portfolio objective: total score or 5-year expected profit')
+    parser.add_argument('--max-per-dong', type=int, default=None,
+                       help='Max properties per dong in a portfolio (optional)')
+    parser.add_argument('--trend', default='mean', choices=['mean', 'hedonic'],
+                       help='Monthly price series for market cycle: raw mean or hedonic index')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Render the final video in N parallel chunks (moviepy backend)')
+    parser.add_argument('--backend', default='ffmpeg', choices=['ffmpeg', 'moviepy'],
+                       help='Final assembly: single ffmpeg timeline or MoviePy frame pipeline')
+    parser.add_argument('--tts', default='pyttsx3', choices=list(BACKENDS),
+                       help='TTS backend (pyttsx3/piper: offline, gtts: network, stub: test tones)')
+    parser.add_argument('--profile', action='store_true',
+                       help='Dump cProfile stats for the slowest stage (output/profile)')
 
     args = parser.parse_args()
 
+    with StageProfiler('pro_shorts', profile=args.profile) as profiler:
+        run(args, profiler)
+
+
+def run(args, profiler):
+    """6-stage pipeline (per-stage timings recorded by profiler)"""
     print("="*70)
     print("🎬 PROFESSIONAL INVESTMENT ANALYSIS SHORTS GENERATOR")
     print("="*70)
@@ -44,6 +67,7 @@ def main():
     print("="*70)
 
     # 1. 데이터 로드
+    profiler.begin('1_load')
     print("\n[1/6] Loading real estate data...")
     base_dir = Path(__file__).parent
 
@@ -58,19 +82,26 @@ def main():
             return
         excel_file = str(xlsx_files[0])
 
+    from data_processor import RealEstateDataProcessor
+
     processor = RealEstateDataProcessor(excel_file)
     processor.load_data()
     processor.clean_data()
 
     # 2. 투자 분석
+    profiler.begin('2_analyze')
     print("\n[2/6] Analyzing investment opportunities...")
-    analyzer = InvestmentAnalyzer()
+    from investment_analyzer import InvestmentAnalyzer
+
+    analyzer = InvestmentAnalyzer(location_index=processor.location_index)
+    price_index = processor.build_price_index(analyzer)
 
     # 투자 기회 발견
     opportunities = analyzer.find_investment_opportunities(
         processor.df,
         budget=args.budget,
-        min_roi=0.06
+        min_roi=0.06,
+        price_index=price_index
     )
 
     if not opportunities:
@@ -83,7 +114,10 @@ def main():
     print(f"Price: ${top_pick['price_usd']:,.0f} | Score: {top_pick['score']}/100")
 
     # 시장 분석
-    trend_data = processor.calculate_price_trend()
+    if args.trend == 'hedonic':
+        trend_data = processor.calculate_hedonic_trend()
+    else:
+        trend_data = processor.calculate_price_trend()
     if trend_data is not None and len(trend_data) > 0:
         market_analysis = analyzer.analyze_market_cycle(trend_data)
         print(f"\nMarket Cycle: {market_analysis['cycle']}")
@@ -98,6 +132,8 @@ def main():
         }
 
     # 글로벌 비교
+    from global_data_api import GlobalRealEstateAPI
+
     global_api = GlobalRealEstateAPI()
     comparison = global_api.get_global_comparison(top_pick['price'])
 
@@ -116,12 +152,32 @@ def main():
         comparison_city=args.city
     )
 
+    # 반복매매 지수 성장률 (ROI 예측 입력)
+    historical_growth = analyzer.estimate_historical_growth(processor.df)
+
+    # 예산 내 포트폴리오 조합
+    portfolios = analyzer.build_portfolios(
+        opportunities,
+        budget=args.budget,
+        objective=args.objective,
+        max_per_dong=args.max_per_dong,
+        historical_growth=historical_growth
+    )
+    if portfolios:
+        best = portfolios[0]
+        print(f"\nBest portfolio: {len(best['properties'])} properties, "
+              f"₩{best['total_price']/100000000:.1f}억 / ₩{args.budget/100000000:.1f}억")
+
     # 3. 투자 리포트 생성
+    profiler.begin('3_report')
     print("\n[3/6] Generating investment report...")
     report = analyzer.generate_investment_report(
         opportunities[:3],  # Top 3
         market_analysis,
-        global_roi
+        global_roi,
+        portfolios=portfolios,
+        budget=args.budget,
+        historical_growth=historical_growth
     )
 
     print("\n" + "="*70)
@@ -129,8 +185,21 @@ def main():
     print("="*70)
 
     # 4. 음성 생성 (프로 품질)
+    profiler.begin('4_narration')
     print("\n[4/6] Generating professional narration...")
-    voice_gen = ProVoiceGenerator()
+    from pro_voice_generator import ProVoiceGenerator
+
+    voice_gen = ProVoiceGenerator(backend=args.tts)
+
+    # 포트폴리오 내레이션 (2개 이상 조합일 때만)
+    portfolio_line = ""
+    if portfolios and len(portfolios[0]['properties']) > 1:
+        best = portfolios[0]
+        portfolio_line = (
+            f"Best portfolio: {len(best['properties'])} properties "
+            f"for {best['total_price']/100000000:.1f} hundred million won, "
+            f"{best['expected_profit']/100000000:.1f} hundred million projected profit.\n"
+        )
 
     # 투자 스크립트 (간결하고 임팩트 있게)
     investment_script = f"""
@@ -153,7 +222,7 @@ Seoul net ROI: {global_roi['seoul']['net_roi']:.1f} percent annually.
 
 Winner: {global_roi['winner']} by {global_roi['advantage']:.1f} percent!
 
-Five year projection: {global_roi['seoul']['profit']/100000000:.1f} billion won profit.
+{portfolio_line}Five year projection: {global_roi['seoul']['profit']/100000000:.1f} billion won profit.
 
 Action: {'Buy now' if market_analysis['cycle'] == 'bull_market' else 'Wait for better timing' if market_analysis['cycle'] == 'bear_market' else 'Selective buying'}.
 
@@ -173,14 +242,20 @@ Check it out!
     print(f"✓ Narration: {audio_file}")
 
     # 5. 영상 생성 (프로 품질)
+    profiler.begin('5_video')
     print("\n[5/6] Creating professional video...")
+    from pro_video_creator import ProVideoCreator
+
     video_creator = ProVideoCreator()
 
-    # 데이터 시각화
+    # 데이터 시각화 (인트로 + 시각화 + 아웃트로가 나레이션 길이에 맞도록)
+    viz_duration = video_creator.data_viz_duration(audio_file)
+    print(f"Data visualization: {viz_duration:.2f}s "
+          f"(total {viz_duration + video_creator.INTRO_DURATION + video_creator.OUTRO_DURATION:.2f}s)")
     viz_file = video_creator.create_data_visualization(
         top_pick,
         market_analysis,
-        duration=10.0
+        duration=viz_duration
     )
 
     if not viz_file:
@@ -188,6 +263,7 @@ Check it out!
         return
 
     # 6. 최종 쇼츠 조립
+    profiler.begin('6_assemble')
     print("\n[6/6] Assembling final shorts...")
 
     final_shorts = video_creator.create_final_shorts(
@@ -195,7 +271,9 @@ Check it out!
         data_viz_file=viz_file,
         audio_file=audio_file,
         outro_text=f"Grade {top_pick['investment_grade']} Deal!",
-        output_file='output/pro/investment_shorts_final.mp4'
+        output_file='output/pro/investment_shorts_final.mp4',
+        workers=args.workers,
+        backend=args.backend
     )
 
     if final_shorts:
@@ -1,7 +1,6 @@
 """
 글로벌 부동산 데이터 API 연동
 """
-import requests
 from typing import Dict, Optional
 
 
@@ -17,6 +16,8 @@ class GlobalRealEstateAPI:
         try:
             # 무료 환율 API 사용
             url = f"https://api.exchangerate-api.com/v4/latest/{from_currency}"
+            import requests
+
             response = requests.get(url, timeout=5)
             data = response.json()
 
@@ -0,0 +1,110 @@
+"""
+이미지 저장 프로필 (PNG / JPEG / WebP)
+
+썸네일은 업로드용이라 용량이 중요하고, ffmpeg에 넘기는 중간 이미지는 인코딩 시간이
+중요합니다. 프로필마다 Pillow 저장 옵션을 정해 두고 저장 시간과 크기를 함께 돌려줍니다.
+차트처럼 바로 다시 읽는 중간 이미지는 파일 대신 메모리로 넘깁니다 (figure_to_image).
+"""
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable
+
+# PIL은 저장할 때만 필요 (CLI가 프로필 이름만 읽을 때는 로드하지 않음)
+if TYPE_CHECKING:
+    from PIL import Image
+
+
+@dataclass(frozen=True)
+class ImageProfile:
+    """Pillow 저장 형식 + 옵션"""
+    name: str
+    format: str
+    suffix: str
+    options: Dict = field(default_factory=dict)
+
+
+PROFILES = {
+    # Pillow 기본 압축 (이전과 같은 파일)
+    'png': ImageProfile('png', 'PNG', '.png', {'compress_level': 6}),
+    # 중간 파일용: 압축을 거의 하지 않아 저장이 빠름
+    'png-fast': ImageProfile('png-fast', 'PNG', '.png', {'compress_level': 1}),
+    'png-small': ImageProfile('png-small', 'PNG', '.png', {'compress_level': 9, 'optimize': True}),
+    'jpeg': ImageProfile('jpeg', 'JPEG', '.jpg', {'quality': 90, 'optimize': True, 'progressive': True}),
+    'webp': ImageProfile('webp', 'WEBP', '.webp', {'quality': 90, 'method': 4}),
+}
+DEFAULT_PROFILE = 'png'
+
+
+@dataclass
+class EncodeResult:
+    """저장 결과 (실제 경로는 프로필 확장자로 바뀔 수 있음)"""
+    path: str
+    profile: str
+    bytes: int
+    seconds: float
+
+
+def get_profile(profile) -> ImageProfile:
+    """이름 또는 ImageProfile → ImageProfile"""
+    if isinstance(profile, ImageProfile):
+        return profile
+    if profile not in PROFILES:
+        raise ValueError(f"알 수 없는 이미지 프로필: {profile} (사용 가능: {', '.join(PROFILES)})")
+    return PROFILES[profile]
+
+
+def output_path(path: str, profile=DEFAULT_PROFILE) -> str:
+    """프로필에 맞는 확장자로 바꾼 경로"""
+    return str(Path(path).with_suffix(get_profile(profile).suffix))
+
+
+def save_image(img: 'Image.Image', path: str, profile=DEFAULT_PROFILE) -> EncodeResult:
+    """프로필 옵션으로 저장하고 시간/크기 반환
+
+    JPEG는 알파 채널이 없으므로 RGB로 변환해서 저장합니다.
+    """
+    profile = get_profile(profile)
+    path = output_path(path, profile)
+    if profile.format == 'JPEG' and img.mode not in ('RGB', 'L'):
+        img = img.convert('RGB')
+
+    start = time.perf_counter()
+    img.save(path, format=profile.format, **profile.options)
+    elapsed = time.perf_counter() - start
+    return EncodeResult(path, profile.name, os.path.getsize(path), elapsed)
+
+
+def figure_to_image(fig, dpi: float = None) -> 'Image.Image':
+    """matplotlib Figure → PIL 이미지 (PNG로 저장했다 다시 읽지 않음)
+
+    Agg 캔버스에 직접 그려 RGBA 버퍼를 가져오므로 plt.savefig(..., dpi)와 같은 픽셀이 나옵니다
+    (배경색은 figure의 facecolor).
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from PIL import Image
+
+    if dpi is not None:
+        fig.set_dpi(dpi)
+    canvas = FigureCanvasAgg(fig)
+    canvas.draw()
+    return Image.frombuffer('RGBA', canvas.get_width_height(), canvas.buffer_rgba(),
+                            'raw', 'RGBA', 0, 1).convert('RGB')
+
+
+def summarize(results: Iterable[EncodeResult]) -> Dict[str, dict]:
+    """프로필별 장수, 총 크기, 총 저장 시간"""
+    summary = {}
+    for r in results:
+        s = summary.setdefault(r.profile, {'count': 0, 'bytes': 0, 'seconds': 0.0})
+        s['count'] += 1
+        s['bytes'] += r.bytes
+        s['seconds'] += r.seconds
+    return summary
+
+
+def print_summary(results: Iterable[EncodeResult]):
+    for name, s in summarize(results).items():
+        print(f"  {name:<10}{s['count']:>5}장  {s['bytes'] / 1024 / s['count']:>8.0f} KB/장  "
+              f"{s['seconds'] * 1000 / s['count']:>7.1f} ms/장")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+CLI 시작 시간 (import) 예산 확인
+
+각 진입점을 `python -X importtime`으로 새 프로세스에서 실행해 import 시간 합계와
+로드된 무거운 모듈을 확인합니다. 예산 초과나 금지 모듈 로드가 있으면 종료 코드 1.
+
+사용법:
+    python import_budget.py
+    python import_budget.py --scale 2      # 느린 머신 (예산 2배)
+    python import_budget.py --verbose      # 가장 오래 걸린 import 목록
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+# 미디어/네트워크 모듈 (해당 단계에서만 로드되어야 함)
+MEDIA = ('moviepy', 'matplotlib', 'gtts', 'pyttsx3', 'requests', 'PIL')
+# 데이터 모듈 (데이터 단계부터 필요)
+DATA = ('pandas', 'numpy', 'scipy')
+
+# (이름, 인자, import 예산(ms), 금지 모듈)
+TARGETS = [
+    ('main.py --help', ['main.py', '--help'], 150, MEDIA + DATA),
+    ('generate_global_shorts.py --help', ['generate_global_shorts.py', '--help'], 150, MEDIA + DATA),
+    ('generate_pro_shorts.py --help', ['generate_pro_shorts.py', '--help'], 150, MEDIA + DATA),
+    ('auto_scheduler.py --help', ['auto_scheduler.py', '--help'], 150, MEDIA + DATA),
+    ('data only', ['-c', 'from data_processor import RealEstateDataProcessor; '
+                         'from investment_analyzer import InvestmentAnalyzer'], 1500, MEDIA),
+]
+
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)')
+
+
+def measure_imports(args: list, cwd: str = None) -> dict:
+    """새 프로세스에서 실행하고 -X importtime 출력 해석"""
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-X', 'importtime'] + args,
+                          capture_output=True, text=True, cwd=cwd)
+    wall = time.perf_counter() - start
+
+    total_us = 0
+    modules = {}
+    for line in proc.stderr.splitlines():
+        m = IMPORT_LINE.match(line)
+        if not m:
+            continue
+        cumulative, indent, name = int(m.group(2)), m.group(3), m.group(4)
+        if not indent:
+            total_us += cumulative
+            modules[name] = cumulative
+
+    return {
+        'returncode': proc.returncode,
+        'wall_ms': wall * 1000,
+        'import_ms': total_us / 1000,
+        'top_level': modules,
+        'loaded': {line.split('|')[-1].strip() for line in proc.stderr.splitlines()
+                   if IMPORT_LINE.match(line)},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CLI import 시간 예산 확인')
+    parser.add_argument('--scale', type=float, default=1.0, help='예산 배율 (느린 머신용)')
+    parser.add_argument('--verbose', action='store_true', help='오래 걸린 최상위 import 출력')
+    args = parser.parse_args()
+
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    failures = 0
+
+    print(f"{'target':<36}{'import(ms)':>12}{'budget':>10}{'wall(ms)':>10}  heavy modules")
+    for name, cmd, budget_ms, forbidden in TARGETS:
+        stats = measure_imports(cmd, cwd)
+        budget = budget_ms * args.scale
+        heavy = sorted(m for m in stats['loaded'] if m.split('.')[0] in forbidden and '.' not in m)
+
+        problems = []
+        if stats['returncode'] != 0:
+            problems.append(f"exit {stats['returncode']}")
+        if stats['import_ms'] > budget:
+            problems.append('over budget')
+        if heavy:
+            problems.append('forbidden: ' + ', '.join(heavy))
+
+        mark = '✗' if problems else '✓'
+        print(f"{mark} {name:<34}{stats['import_ms']:>12.0f}{budget:>10.0f}{stats['wall_ms']:>10.0f}  "
+              f"{'; '.join(problems) if problems else '-'}")
+        failures += bool(problems)
+
+        if args.verbose:
+            top = sorted(stats['top_level'].items(), key=lambda kv: kv[1], reverse=True)[:8]
+            for module, us in top:
+                print(f"      {module:<40}{us / 1000:>8.1f} ms")
+
+    if failures:
+        print(f"\n✗ {failures}개 진입점이 예산을 넘거나 무거운 모듈을 미리 로드합니다.")
+        sys.exit(1)
+    print("\n✓ 모든 진입점이 import 예산 안에 있습니다.")
+
+
+if __name__ == "__main__":
+    main()
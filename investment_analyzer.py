@@ -5,16 +5,49 @@ Real investment value analysis for decision-making
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple, Union
+
+from portfolio_optimizer import PortfolioOptimizer
+from repeat_sales_index import RepeatSalesIndex
+from location_index import LocationIndex
 
 
 class InvestmentAnalyzer:
     """투자 가치 분석 및 추천 시스템"""
 
-    def __init__(self):
+    # ROI 전망에 쓸 연간 성장률 범위 (짧은 기간의 급등/급락을 5년 복리로 키우지 않도록)
+    GROWTH_RANGE = (-0.05, 0.10)
+
+    def __init__(
+        self,
+        location_index: Optional[LocationIndex] = None,
+        premium_locations: Optional[Dict[str, List[str]]] = None
+    ):
         self.risk_threshold = 0.15  # 15% 위험 임계값
         self.roi_target = 0.08      # 연 8% 목표 수익률
 
+        # 구별 프리미엄 지역 ('*' 키는 모든 구에 적용)
+        self.premium_locations = premium_locations or {'광진구': ['자양', '구의', '광장']}
+        self.location_index = location_index
+        self._premium_ids = None
+
+    def premium_mask(self, df: pd.DataFrame) -> np.ndarray:
+        """프리미엄 지역 여부 (위치 ID에 대한 isin)"""
+        if self.location_index is not None and '위치ID' in df.columns:
+            index = self.location_index
+            ids = df['위치ID'].to_numpy()
+        else:
+            # 토큰화되지 않은 데이터: 임시 인덱스로 한 번 변환
+            index = LocationIndex()
+            ids = index.encode(df)
+            self._premium_ids = None
+
+        # 조회 테이블이 커졌을 때만 프리미엄 ID 집합 재계산
+        if self._premium_ids is None or self._premium_ids[0] is not index or self._premium_ids[1] != len(index.table):
+            self._premium_ids = (index, len(index.table), index.premium_ids(self.premium_locations))
+
+        return np.isin(ids, self._premium_ids[2])
+
     def analyze_market_cycle(self, trend_data: pd.DataFrame) -> Dict:
         """시장 사이클 분석 (상승/하락/횡보)"""
 
@@ -54,6 +87,26 @@ class InvestmentAnalyzer:
             'trend': 'upward' if recent_change > 0 else 'downward'
         }
 
+    def estimate_historical_growth(self, df: pd.DataFrame, default: float = 0.06) -> float:
+        """반복매매 지수 기반 연간 성장률 (쌍이 부족하면 기본값, GROWTH_RANGE로 제한)"""
+        index = RepeatSalesIndex()
+        index.load_or_fit(df)
+        growth = index.annual_growth()
+
+        if growth is None:
+            print(f"반복매매 데이터 부족, 기본 성장률 사용: {default*100:.1f}%")
+            return default
+
+        low, high = self.GROWTH_RANGE
+        if not low <= growth <= high:
+            clamped = min(max(growth, low), high)
+            print(f"⚠️ 반복매매 지수 연간 성장률 {growth*100:.1f}%는 장기 전망으로 쓰기 어려워 "
+                  f"{clamped*100:.1f}%로 제한합니다")
+            return clamped
+
+        print(f"반복매매 지수 연간 성장률: {growth*100:.1f}%")
+        return growth
+
     def calculate_roi_projection(
         self,
         current_price: float,
@@ -87,88 +140,180 @@ class InvestmentAnalyzer:
 
         return projections
 
+    def score_features(self, df: pd.DataFrame) -> pd.DataFrame:
+        """예산과 무관한 점수 요소 계산 (벡터화)"""
+
+        def column(name, default):
+            if name in df.columns:
+                return df[name]
+            return pd.Series(default, index=df.index)
+
+        price = column('거래금액_숫자', 0)
+        area = column('전용면적(㎡)', 0)
+        floor = column('층', 0)
+        building_age = 2025 - column('건축년도', 2000)
+        location = column('번지', '')
+
+        price_per_sqm = price / area
+
+        # 예산 적합도(+30)를 제외한 점수
+        great_value = price_per_sqm < 15000000  # 1500만원/㎡ 이하
+        high_floor = floor >= 10
+        new_building = building_age < 10
+        premium = pd.Series(self.premium_mask(df), index=df.index)
+
+        base_score = (
+            25 * great_value
+            + 15 * high_floor
+            + np.where(new_building, 20, np.where(building_age < 20, 10, 0))
+            + 10 * premium
+        )
+
+        return pd.DataFrame({
+            '가격': price,
+            '면적': area,
+            '평당가': price_per_sqm,
+            '층': floor,
+            '건물연령': building_age,
+            '위치': location,
+            '가성비': great_value,
+            '고층': high_floor,
+            '신축': new_building,
+            '프리미엄': premium,
+            '기본점수': base_score.astype(int),
+            '행번호': np.arange(len(df))
+        }, index=df.index)
+
     def find_investment_opportunities(
         self,
         df: pd.DataFrame,
         budget: float = 600000000,  # 6억
-        min_roi: float = 0.06        # 연 6% 최소 수익
+        min_roi: float = 0.06,       # 연 6% 최소 수익
+        price_index=None
     ) -> List[Dict]:
         """투자 기회 발견"""
 
-        opportunities = []
-
-        for idx, row in df.iterrows():
-            price = row.get('거래금액_숫자', 0)
+        # 가격 인덱스가 있으면 예산 이하 구간만 사용 (전체 재계산 없음)
+        if price_index is not None:
+            features = price_index.features_under(budget)
+        else:
+            features = self.score_features(df)
+            features = features[~(features['가격'] > budget)]
 
-            if price > budget:
-                continue
+        # 가격 대비 면적 (가성비)
+        features = features[~(features['면적'] == 0)]
 
-            # 가격 대비 면적 (가성비)
-            area = row.get('전용면적(㎡)', 0)
-            if area == 0:
-                continue
+        # 1. 가격 (예산의 80% 이하면 좋음)
+        budget_fit = features['가격'] < budget * 0.8
+        scores = features['기본점수'] + 30 * budget_fit
 
-            price_per_sqm = price / area
+        # 50점 이상만 추천
+        selected = scores >= 50
+        features = features[selected]
+        budget_fit = budget_fit[selected]
+        scores = scores[selected]
 
-            # 층수 (높은 층 선호)
-            floor = row.get('층', 0)
+        opportunities = []
 
-            # 건축년도 (신축 선호)
-            year = row.get('건축년도', 2000)
-            building_age = 2025 - year
+        for feat, fit, score in zip(features.itertuples(index=False), budget_fit, scores):
+            row = df.iloc[feat.행번호]
+            price = feat.가격
+            price_per_sqm = feat.평당가
+            building_age = feat.건물연령
 
-            # 점수 계산
-            score = 0
             reasons = []
-
-            # 1. 가격 (예산의 80% 이하면 좋음)
-            if price < budget * 0.8:
-                score += 30
+            if fit:
                 reasons.append(f"Budget fit: ${price/10000:.0f}M under budget")
-
-            # 2. 가성비 (평당 가격)
-            if price_per_sqm < 15000000:  # 1500만원/㎡ 이하
-                score += 25
+            if feat.가성비:
                 reasons.append(f"Great value: ${price_per_sqm/10000:.0f}/sqm")
-
-            # 3. 층수
-            if floor >= 10:
-                score += 15
-                reasons.append(f"High floor: {floor}F")
-
-            # 4. 신축도
-            if building_age < 10:
-                score += 20
+            if feat.고층:
+                reasons.append(f"High floor: {feat.층}F")
+            if feat.신축:
                 reasons.append(f"New building: {building_age}y old")
-            elif building_age < 20:
-                score += 10
-
-            # 5. 위치 프리미엄
-            location = row.get('번지', '')
-            if any(premium in str(location) for premium in ['자양', '구의', '광장']):
-                score += 10
+            if feat.프리미엄:
                 reasons.append("Premium location")
 
-            if score >= 50:  # 50점 이상만 추천
-                opportunities.append({
-                    'score': score,
-                    'price': price,
-                    'price_usd': price * 0.00075,
-                    'area_sqm': area,
-                    'area_sqft': area * 10.764,
-                    'price_per_sqm': price_per_sqm,
-                    'floor': floor,
-                    'building_age': building_age,
-                    'location': location,
-                    'apartment': row.get('단지명', 'Unknown'),
-                    'reasons': reasons,
-                    'investment_grade': 'A' if score >= 80 else 'B' if score >= 65 else 'C'
-                })
+            dong = row.get('법정동') or (str(row.get('시군구', '')).split() or [''])[-1]
+            score = int(score)
+
+            opportunities.append({
+                'score': score,
+                'price': price,
+                'price_usd': price * 0.00075,
+                'area_sqm': feat.면적,
+                'area_sqft': feat.면적 * 10.764,
+                'price_per_sqm': price_per_sqm,
+                'floor': feat.층,
+                'building_age': building_age,
+                'location': feat.위치,
+                'dong': dong,
+                'apartment': row.get('단지명', 'Unknown'),
+                'reasons': reasons,
+                'investment_grade': 'A' if score >= 80 else 'B' if score >= 65 else 'C'
+            })
 
         # 점수순 정렬
         opportunities.sort(key=lambda x: x['score'], reverse=True)
         return opportunities
 
+    def build_portfolios(
+        self,
+        opportunities: List[Dict],
+        budget: float = 600000000,
+        objective: str = 'score',
+        max_per_dong: Union[int, Dict, None] = None,
+        historical_growth: float = 0.06,
+        top_k: int = 5
+    ) -> List[Dict]:
+        """예산 내 최적 매물 조합 (점수 합 또는 5년 예상 수익 최대화)"""
+
+        if not opportunities:
+            return []
+
+        # 매물별 5년 예상 수익 (moderate 시나리오)
+        profits = [
+            self.calculate_roi_projection(o['price'], historical_growth)['moderate']['profit']
+            for o in opportunities
+        ]
+
+        if objective == 'roi':
+            values = profits
+        else:
+            values = [o['score'] for o in opportunities]
+
+        optimizer = PortfolioOptimizer(top_k=top_k)
+        solutions = optimizer.optimize(
+            [o['price'] for o in opportunities],
+            values,
+            budget,
+            groups=[o.get('dong', '') for o in opportunities],
+            max_per_group=max_per_dong
+        )
+
+        portfolios = []
+        for rank, (indices, value) in enumerate(solutions, 1):
+            picks = sorted((opportunities[i] for i in indices), key=lambda x: x['score'], reverse=True)
+            total_price = sum(p['price'] for p in picks)
+
+            dongs = {}
+            for p in picks:
+                dongs[p.get('dong', '')] = dongs.get(p.get('dong', ''), 0) + 1
+
+            portfolios.append({
+                'rank': rank,
+                'objective': objective,
+                'value': value,
+                'properties': picks,
+                'total_score': sum(p['score'] for p in picks),
+                'expected_profit': sum(profits[i] for i in indices),
+                'total_price': total_price,
+                'total_price_usd': total_price * 0.00075,
+                'remaining_budget': budget - total_price,
+                'dongs': dongs
+            })
+
+        return portfolios
+
     def compare_global_roi(
         self,
         seoul_price: float,
@@ -241,7 +386,10 @@ class InvestmentAnalyzer:
         self,
         opportunities: List[Dict],
         market_analysis: Dict,
-        global_comparison: Dict
+        global_comparison: Dict,
+        portfolios: Optional[List[Dict]] = None,
+        budget: float = 600000000,
+        historical_growth: Optional[float] = None
     ) -> str:
         """투자 리포트 생성 (영어)"""
 
@@ -250,6 +398,36 @@ class InvestmentAnalyzer:
 
         top_pick = opportunities[0]
 
+        # 포트폴리오 순위 (있으면)
+        portfolio_section = ""
+        if portfolios:
+            lines = [f"\n📦 PORTFOLIO OPTIONS (budget {budget/100000000:.1f}억)"]
+            for p in portfolios:
+                lines.append(
+                    f"#{p['rank']}: {len(p['properties'])} properties, "
+                    f"{p['total_price']/100000000:.1f}억, score {p['total_score']}, "
+                    f"5y profit {p['expected_profit']/100000000:.1f}억"
+                )
+                for prop in p['properties']:
+                    lines.append(
+                        f"   - {prop.get('dong', '')} {prop['apartment']} "
+                        f"({prop['price']/100000000:.1f}억, {prop['floor']}F, Grade {prop['investment_grade']})"
+                    )
+            portfolio_section = '\n'.join(lines) + '\n'
+
+        # 반복매매 성장률 기반 TOP PICK 수익 예측 (있으면)
+        projection_section = ""
+        if historical_growth is not None:
+            projection = self.calculate_roi_projection(top_pick['price'], historical_growth)
+            projection_section = (
+                f"\n📈 ROI PROJECTION (repeat-sales growth {historical_growth*100:.1f}%/yr)\n"
+                + '\n'.join(
+                    f"• {name.capitalize()}: {p['roi_pct']:+.1f}% over 5 years "
+                    f"({p['profit']/100000000:+.1f}억)"
+                    for name, p in projection.items()
+                ) + '\n'
+            )
+
         report = f"""INVESTMENT ALERT: Seoul Real Estate Analysis
 
 🎯 TOP PICK - Grade {top_pick['investment_grade']}
@@ -282,11 +460,11 @@ Seoul vs {global_comparison['comparison_city']}:
 2. Target Hold: 5 years
 3. Expected ROI: {global_comparison['seoul']['net_roi']:.1f}% per year
 4. Risk Level: {'LOW' if market_analysis['volatility'] < 5 else 'MEDIUM' if market_analysis['volatility'] < 10 else 'HIGH'}
-
+{projection_section}{portfolio_section}
 ⚡ ACTION ITEMS:
 {'• BUY NOW - Market is favorable' if market_analysis['cycle'] == 'bull_market' else '• WAIT - Monitor for better entry point' if market_analysis['cycle'] == 'bear_market' else '• SELECTIVE BUYING - Choose premium locations'}
-• Budget allocation: {top_pick['price']/100000000:.1f}억 / 6억
-• Reserve: {(600000000 - top_pick['price'])/100000000:.1f}억 for opportunities
+• Budget allocation: {top_pick['price']/100000000:.1f}억 / {budget/100000000:.0f}억
+• Reserve: {(budget - top_pick['price'])/100000000:.1f}억 for opportunities
 
 🎬 Ready for viral content!
 """
@@ -0,0 +1,67 @@
+"""
+위치 토큰 인덱스 (위치 문자열 → 정수 ID)
+
+위치 문자열(SOURCE_COLUMNS 중 데이터에 있는 첫 컬럼, 보통 시군구)은 수집할 때 한 번만
+정수 ID로 바꾸고 조회 테이블에 모읍니다.
+프리미엄 지역 점수처럼 위치별로 계산하는 값은 거래마다 문자열을 비교하지 않고
+테이블 크기만큼만 계산한 뒤 ID로 가져옵니다.
+"""
+import re
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, List
+
+
+class LocationIndex:
+    """'서울특별시 광진구 자양동' 같은 위치 문자열을 정수 ID로 변환
+
+    수집 시 한 번만 토큰화하고, 이후 위치 조건은 작은 조회 테이블에서
+    ID 집합으로 바꾼 뒤 isin으로 평가합니다.
+    """
+
+    SOURCE_COLUMNS = ['시군구', '법정동', '번지']
+
+    def __init__(self):
+        self.table = pd.DataFrame({'위치': pd.Series(dtype=str),
+                                   '구': pd.Series(dtype=str),
+                                   '동': pd.Series(dtype=str)})
+
+    def encode(self, df: pd.DataFrame) -> np.ndarray:
+        """위치 컬럼을 정수 ID 배열로 변환 (처음 보는 위치는 테이블에 추가)"""
+        source = next((c for c in self.SOURCE_COLUMNS if c in df.columns), None)
+        if source is None:
+            return np.full(len(df), -1, dtype=np.int64)
+
+        keys = df[source].fillna('').astype(str).str.strip()
+        known = pd.Index(self.table['위치'])
+
+        new = pd.unique(keys[~keys.isin(known)])
+        if len(new):
+            tokens = pd.Series(new).str.split()
+            self.table = pd.concat([self.table, pd.DataFrame({
+                '위치': new,
+                '구': tokens.apply(lambda t: next((x for x in t if x.endswith(('구', '군'))), '')),
+                '동': tokens.str[-1].fillna('')
+            })], ignore_index=True)
+            known = pd.Index(self.table['위치'])
+
+        return known.get_indexer(keys).astype(np.int64)
+
+    def ids_matching(self, names: Iterable[str], district: str = None) -> np.ndarray:
+        """동 이름에 names 중 하나가 포함된 위치 ID (district 지정 시 해당 구만)"""
+        names = [n for n in names if n]
+        if not names or self.table.empty:
+            return np.empty(0, dtype=np.int64)
+
+        mask = self.table['동'].str.contains('|'.join(re.escape(str(n)) for n in names), regex=True)
+        if district:
+            mask &= self.table['구'] == district
+        return np.flatnonzero(mask.to_numpy())
+
+    def premium_ids(self, premium_locations: Dict[str, List[str]]) -> np.ndarray:
+        """구별 프리미엄 지역 설정을 위치 ID 집합으로 변환 ('*': 전체 구)"""
+        ids = [
+            self.ids_matching(names, None if district == '*' else district)
+            for district, names in premium_locations.items()
+        ]
+        return np.unique(np.concatenate(ids)) if ids else np.empty(0, dtype=np.int64)
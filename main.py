@@ -4,26 +4,65 @@
 
 사용법:
     python main.py
+    python main.py --trend hedonic
+    python main.py --profile
+    python main.py --bgm bgm.mp3              # 배경음악만 바꾸면 4단계부터 다시 생성
+    python main.py --force 3_narration        # 특정 단계만 캐시 무시
 
 단계:
     1. 데이터 로드 및 분석 (Pandas)
     2. 시각화 생성 (Matplotlib)
-    3. 음성 내레이션 생성 (gTTS)
+    3. 음성 나레이션 생성 (gTTS)
     4. 영상 합성 (FFmpeg)
     5. 최종 쇼츠 영상 출력
+    (영상 길이를 나레이션 길이에 맞추므로 3단계를 먼저 실행하고 그 길이만큼만 2단계 렌더링)
+
+각 단계의 결과물은 입력(데이터/코드/상위 결과물 해시, 파라미터) 기준으로
+output/cache/stages에 캐시되어, 입력이 같으면 다시 만들지 않습니다.
 """
 
+import argparse
 import os
 import sys
+import time
 from pathlib import Path
 
-from data_processor import RealEstateDataProcessor
-from visualizer import RealEstateVisualizer
-from voice_generator import VoiceGenerator
-from video_composer import VideoComposer
+from stage_cache import StageCache
+from stage_profiler import StageProfiler
+from tts_backends import BACKENDS
+
+# pandas / matplotlib / gTTS 등 무거운 모듈은 각 단계가 시작될 때 로드
+# (--help와 인자 오류는 즉시 응답, import_budget.py로 확인)
+
+STAGES = ['1_data', '2_visualize', '3_narration', '4_compose', '5_shorts_format']
 
 
 def main():
+    parser = argparse.ArgumentParser(description='부동산 실거래 쇼츠 영상 생성')
+    parser.add_argument('--trend', default='mean', choices=['mean', 'hedonic'],
+                        help='가격 추이: 월 평균(mean) 또는 품질 보정 지수(hedonic)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='애니메이션을 N개 프로세스로 나눠 렌더링 (선택)')
+    parser.add_argument('--profile', action='store_true',
+                        help='가장 느린 단계의 cProfile 통계 저장 (output/profile)')
+    parser.add_argument('--bgm', default=None, help='배경음악 파일 (선택)')
+    parser.add_argument('--tts', default='gtts', choices=list(BACKENDS),
+                        help='TTS 백엔드 (gtts: 네트워크, pyttsx3/piper: 오프라인, stub: 테스트용 비프음)')
+    parser.add_argument('--force', nargs='+', default=[], choices=STAGES + ['all'],
+                        metavar='STAGE', help=f"캐시를 무시하고 다시 만들 단계 ({', '.join(STAGES)}, all)")
+    parser.add_argument('--no-cache', action='store_true', help='단계 캐시 사용 안 함')
+    args = parser.parse_args()
+
+    cache = StageCache(force=args.force, enabled=not args.no_cache)
+    with StageProfiler('main', profile=args.profile) as profiler:
+        try:
+            run(args, profiler, cache)
+        finally:
+            cache.summary()
+
+
+def run(args, profiler, cache):
+    """5단계 파이프라인 (단계별 시간/자원은 profiler, 재사용은 cache가 기록)"""
     print("=" * 60)
     print("부동산 실거래 쇼츠 영상 자동 생성 시스템")
     print("=" * 60)
@@ -44,17 +83,33 @@ def main():
     os.makedirs(output_dir, exist_ok=True)
 
     # 1단계: 데이터 처리
+    profiler.begin('1_data')
     print("\n[1/5] 데이터 로드 및 분석")
     print("-" * 60)
-    processor = RealEstateDataProcessor(excel_file)
 
-    try:
+    def analyze():
+        from data_processor import RealEstateDataProcessor
+
+        processor = RealEstateDataProcessor(excel_file)
         processor.load_data()
         processor.analyze_data()
         processor.clean_data()
+        processor.build_price_index()
         hot_deals = processor.find_hot_deals(top_n=3, max_price=600000000)
-        trend_data = processor.calculate_price_trend()
-        script = processor.generate_script()
+        if args.trend == 'hedonic':
+            trend_data = processor.calculate_hedonic_trend()
+        else:
+            trend_data = processor.calculate_price_trend()
+        return hot_deals, trend_data, processor.generate_script()
+
+    try:
+        hot_deals, trend_data, script = cache.value('1_data', {
+            'data': cache.file(excel_file),
+            'trend': args.trend,
+            'code': [cache.file(base_dir / name) for name in
+                     ('data_processor.py', 'location_index.py', 'hedonic_index.py',
+                      'price_index.py', 'investment_analyzer.py')],
+        }, analyze)
 
         if hot_deals is None or len(hot_deals) == 0:
             print("핫딜 데이터가 없습니다. 프로그램을 종료합니다.")
@@ -66,59 +121,60 @@ def main():
         traceback.print_exc()
         return
 
-    # 2단계: 시각화 생성
-    print("\n[2/5] 시각화 그래프 생성")
+    # 3단계 먼저: 영상 길이가 나레이션 길이로 정해지므로, 시각화는 그 길이만큼만
+    # 렌더링해 -shortest로 잘려 나갈 프레임을 만들지 않음
+    profiler.begin('3_narration')
+    print("\n[3/5] 음성 나레이션 생성")
     print("-" * 60)
-    visualizer = RealEstateVisualizer(str(output_dir))
+    from audio_probe import probe_duration, video_duration
 
-    try:
-        # 가격 추이 애니메이션
-        if trend_data is not None and len(trend_data) > 0:
-            video_file = visualizer.create_price_trend_animation(
-                trend_data,
-                output_file=str(output_dir / 'price_trend.mp4'),
-                duration=15
-            )
-        else:
-            print("가격 추이 데이터가 없어 핫딜 차트만 생성합니다.")
-            # 핫딜 차트를 이미지로 저장
-            chart_file = visualizer.create_hot_deals_chart(
-                hot_deals,
-                output_file=str(output_dir / 'hot_deals.png')
-            )
-            # 이미지를 비디오로 변환 (15초)
-            video_file = convert_image_to_video(chart_file, str(output_dir / 'price_trend.mp4'))
+    narration_key = cache.key('3_narration', {
+        'script': script,
+        'lang': 'ko',
+        'tts': args.tts,
+        'code': [cache.file(base_dir / name) for name in
+                 ('voice_generator.py', 'tts_backends.py', 'pcm_audio.py')],
+    })
+    audio_file = cache.fetch('3_narration', narration_key, str(output_dir / 'narration.mp3'))
+    if audio_file is None:
+        start = time.perf_counter()
+        audio_file = generate_narration(script, str(output_dir), args.tts)
+        audio_file = cache.store('3_narration', narration_key, audio_file, time.perf_counter() - start)
 
-    except Exception as e:
-        print(f"시각화 생성 중 오류 발생: {e}")
-        import traceback
-        traceback.print_exc()
+    if audio_file is None:
+        print("음성 생성에 실패했습니다. 프로그램을 종료합니다.")
         return
 
-    # 3단계: 음성 내레이션 생성
-    print("\n[3/5] 음성 내레이션 생성")
-    print("-" * 60)
-    voice_gen = VoiceGenerator(str(output_dir))
+    duration = video_duration(audio_file)
+    print(f"나레이션 {probe_duration(audio_file):.2f}초 → 영상 {duration:.2f}초")
 
-    try:
-        audio_file = voice_gen.generate_narration(
-            script,
-            output_file=str(output_dir / 'narration.mp3')
-        )
-
-        if audio_file is None:
-            print("음성 생성에 실패했습니다. 프로그램을 종료합니다.")
-            return
+    profiler.begin('2_visualize')
+    print("\n[2/5] 시각화 그래프 생성")
+    print("-" * 60)
+    viz_key = cache.key('2_visualize', {
+        'trend': cache.frame(trend_data),
+        'hot_deals': cache.frame(hot_deals),
+        'duration': duration,
+        'code': [cache.file(base_dir / name) for name in
+                 ('visualizer.py', 'video_composer.py', 'parallel_render.py')],
+    })
+    video_file = cache.fetch('2_visualize', viz_key, str(output_dir / 'price_trend.mp4'))
+    if video_file is None:
+        # 함께 실행할 단계가 없으므로 직접 호출 (--workers면 렌더링 안에서 청크별 프로세스를 띄움)
+        start = time.perf_counter()
+        video_file = render_visualization(trend_data, hot_deals, str(output_dir), args.workers, duration)
+        video_file = cache.store('2_visualize', viz_key, video_file, time.perf_counter() - start)
 
-    except Exception as e:
-        print(f"음성 생성 중 오류 발생: {e}")
-        import traceback
-        traceback.print_exc()
+    if video_file is None:
+        print("시각화 생성에 실패했습니다. 프로그램을 종료합니다.")
         return
 
     # 4단계: 영상 합성
+    profiler.begin('4_compose')
     print("\n[4/5] 영상 합성")
     print("-" * 60)
+    from video_composer import VideoComposer
+
     composer = VideoComposer(str(output_dir))
 
     if not composer.check_ffmpeg():
@@ -130,22 +186,33 @@ def main():
         return
 
     try:
-        final_video = composer.create_shorts_video(
+        final_video = cache.run('4_compose', {
+            'video': cache.file(video_file),
+            'audio': cache.file(audio_file),
+            'bgm': cache.file(args.bgm),
+            'code': [cache.file(base_dir / 'video_composer.py'), cache.file(base_dir / 'audio_mix.py')],
+        }, str(output_dir / 'shorts_final.mp4'), lambda: composer.create_shorts_video(
             video_file,
             audio_file,
-            output_file=str(output_dir / 'shorts_final.mp4')
-        )
+            output_file=str(output_dir / 'shorts_final.mp4'),
+            bgm_file=args.bgm
+        ))
 
         if final_video:
             # 5단계: 쇼츠 포맷으로 변환
+            profiler.begin('5_shorts_format')
             print("\n[5/5] 쇼츠 포맷 변환 (1080x1920)")
             print("-" * 60)
-            shorts_video = composer.convert_to_shorts_format(
+            shorts_video = cache.run('5_shorts_format', {
+                'video': cache.file(final_video),
+                'size': [1080, 1920],
+                'code': cache.file(base_dir / 'video_composer.py'),
+            }, str(output_dir / 'shorts_1080x1920.mp4'), lambda: composer.convert_to_shorts_format(
                 final_video,
                 output_file=str(output_dir / 'shorts_1080x1920.mp4'),
                 width=1080,
                 height=1920
-            )
+            ))
 
             if shorts_video:
                 print("\n" + "=" * 60)
@@ -165,32 +232,66 @@ def main():
         return
 
 
-def convert_image_to_video(image_file, output_file, duration=15):
-    """이미지를 비디오로 변환 (FFmpeg 사용)"""
+def render_visualization(trend_data, hot_deals, output_dir, workers=None, duration=15):
+    """2단계: 가격 추이 애니메이션 (추이가 없으면 핫딜 차트 정지 영상, 길이는 duration초)"""
+    from visualizer import RealEstateVisualizer
+
+    visualizer = RealEstateVisualizer(output_dir)
+
     try:
-        import subprocess
-        cmd = [
-            'ffmpeg',
-            '-loop', '1',
-            '-i', image_file,
-            '-c:v', 'libx264',
-            '-t', str(duration),
-            '-pix_fmt', 'yuv420p',
-            '-vf', 'scale=1080:1920:force_original_aspect_ratio=decrease,pad=1080:1920:(ow-iw)/2:(oh-ih)/2:black',
-            '-y',
-            output_file
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode == 0:
-            print(f"✓ 이미지를 비디오로 변환 완료: {output_file}")
-            return output_file
-        else:
-            print(f"이미지 변환 실패: {result.stderr}")
-            return None
+        # 가격 추이 애니메이션
+        if trend_data is not None and len(trend_data) > 0:
+            return visualizer.create_price_trend_animation(
+                trend_data,
+                output_file=os.path.join(output_dir, 'price_trend.mp4'),
+                duration=duration,
+                workers=workers
+            )
+
+        print("가격 추이 데이터가 없어 핫딜 차트만 생성합니다.")
+        # 핫딜 차트를 이미지로 저장
+        chart_file = visualizer.create_hot_deals_chart(
+            hot_deals,
+            output_file=os.path.join(output_dir, 'hot_deals.png')
+        )
+        # 이미지를 나레이션 길이의 비디오로 변환
+        return convert_image_to_video(chart_file, os.path.join(output_dir, 'price_trend.mp4'), duration)
+
+    except Exception as e:
+        print(f"시각화 생성 중 오류 발생: {e}")
+        import traceback
+        traceback.print_exc()
+        return None
+
+
+def generate_narration(script, output_dir, tts='gtts'):
+    """3단계: 음성 나레이션"""
+    from voice_generator import VoiceGenerator
+
+    voice_gen = VoiceGenerator(output_dir, backend=tts)
+
+    try:
+        return voice_gen.generate_narration(
+            script,
+            output_file=os.path.join(output_dir, 'narration.mp3')
+        )
     except Exception as e:
-        print(f"이미지 변환 중 오류: {e}")
+        print(f"음성 생성 중 오류 발생: {e}")
+        import traceback
+        traceback.print_exc()
         return None
 
 
+def convert_image_to_video(image_file, output_file, duration=15):
+    """이미지를 비디오로 변환 (정지 화면이므로 프레임 1장만 인코딩)"""
+    from video_composer import VideoComposer
+
+    composer = VideoComposer(os.path.dirname(output_file) or '.')
+    result = composer.encode_still(image_file, output_file, duration)
+    if result:
+        print(f"✓ 이미지를 비디오로 변환 완료: {output_file}")
+    return result
+
+
 if __name__ == "__main__":
     main()
@@ -1,17 +1,176 @@
 """
 다국어 바이럴 스크립트 생성 (영어, 스페인어, 일본어)
+
+테마별 스크립트는 모듈의 SCRIPT_TEMPLATES (str.format 템플릿)를 한 번만 파싱해 두고
+(compiled_template), 호출마다 필요한 한 언어만 채웁니다.
 """
-from gtts import gTTS
+import hashlib
 import os
-from typing import Dict, List
+from functools import lru_cache
+from string import Formatter
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from narration_runner import NarrationRequest, NarrationRunner
+from tts_backends import TTSBackend, get_backend
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# 테마 → 언어 → 템플릿 (없는 언어는 영어 사용)
+SCRIPT_TEMPLATES = {
+    'global_comparison': {
+        'ko': (
+            "충격! 서울 {kr_price_억:.1f}억 아파트, "
+            "{city} ${city_price:,}와 비교하면 {abs_diff:.0f}% "
+            "{cheaper}! "
+            "이게 바로 {verdict}입니다! "
+            "지금 바로 확인하세요!"
+        ),
+        'en': (
+            "SHOCKING! Seoul ${kr_price_usd:,} apartment "
+            "vs {city} ${city_price:,} - {abs_diff:.0f}% "
+            "{cheaper}! "
+            "This is {verdict}! "
+            "Check it NOW!"
+        ),
+        'es': (
+            "¡IMPACTANTE! Apartamento en Seúl ${kr_price_usd:,} "
+            "vs {city} ${city_price:,} - ¡{abs_diff:.0f}% "
+            "{cheaper}! "
+            "¡Esta es {verdict}! "
+            "¡Compruébalo AHORA!"
+        ),
+        'ja': (
+            "衝撃! ソウル${kr_price_usd:,}マンション、"
+            "{city} ${city_price:,}と比べて{abs_diff:.0f}% "
+            "{cheaper}! "
+            "これが{verdict}です! "
+            "今すぐ確認!"
+        ),
+    },
+    'bubble_warning': {
+        'ko': (
+            "⚠️ 경고! 한국 부동산 {bubble_pct:.0f}% 과열! "
+            "지난 {years}년간 {increase_pct:.0f}% 상승! "
+            "글로벌 평균 대비 {vs_global:.0f}% 높음! "
+            "투자 전 반드시 확인하세요!"
+        ),
+        'en': (
+            "⚠️ WARNING! Korean real estate {bubble_pct:.0f}% OVERHEATED! "
+            "Rose {increase_pct:.0f}% in past {years} years! "
+            "{vs_global:.0f}% HIGHER than global average! "
+            "MUST check before investing!"
+        ),
+        'es': (
+            "⚠️ ¡ADVERTENCIA! ¡Inmobiliaria coreana {bubble_pct:.0f}% SOBRECALENTADA! "
+            "¡Subió {increase_pct:.0f}% en {years} años! "
+            "¡{vs_global:.0f}% MÁS ALTO que promedio global! "
+            "¡DEBES verificar antes de invertir!"
+        ),
+    },
+    'investment_secret': {
+        'ko': (
+            "💰 비밀 공개! {location} 투자로 "
+            "연 {annual_return:.0f}% 수익! "
+            "{years}년 후 {profit_억:.1f}억 수익 예상! "
+            "지금이 마지막 기회입니다!"
+        ),
+        'en': (
+            "💰 SECRET revealed! Invest in {location} for "
+            "{annual_return:.0f}% annual return! "
+            "Projected ${profit_usd:,} profit in {years} years! "
+            "This is your LAST chance!"
+        ),
+        'es': (
+            "💰 ¡SECRETO revelado! ¡Invierte en {location} para "
+            "{annual_return:.0f}% retorno anual! "
+            "¡Ganancia proyectada de ${profit_usd:,} en {years} años! "
+            "¡Esta es tu ÚLTIMA oportunidad!"
+        ),
+    },
+    'failure_story': {
+        'ko': (
+            "😱 실화! {year}년 {location} 투자, "
+            "{loss_억:.1f}억 손실! "
+            "원인: {reason}! "
+            "같은 실수 하지 마세요!"
+        ),
+        'en': (
+            "😱 TRUE STORY! {year} investment in {location}, "
+            "${loss_usd:,} LOSS! "
+            "Reason: {reason}! "
+            "Don't make the SAME mistake!"
+        ),
+        'es': (
+            "😱 ¡HISTORIA REAL! Inversión {year} en {location}, "
+            "¡PÉRDIDA de ${loss_usd:,}! "
+            "Razón: {reason}! "
+            "¡No cometas el MISMO error!"
+        ),
+    },
+}
+
+# data['is_cheaper']에 따라 고르는 단어 (참, 거짓)
+SCRIPT_CHOICES = {
+    'global_comparison': {
+        'ko': {'cheaper': ('더 싸다', '더 비싸'), 'verdict': ('기회', '버블')},
+        'en': {'cheaper': ('CHEAPER', 'MORE EXPENSIVE'), 'verdict': ('your OPPORTUNITY', 'a BUBBLE')},
+        'es': {'cheaper': ('MÁS BARATO', 'MÁS CARO'), 'verdict': ('tu OPORTUNIDAD', 'una BURBUJA')},
+        'ja': {'cheaper': ('安い', '高い'), 'verdict': ('チャンス', 'バブル')},
+    },
+}
+
+
+class ScriptTemplate:
+    """한 번 파싱한 str.format 템플릿 (사용하는 필드 목록 포함)"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.fields = tuple(dict.fromkeys(
+            name for _, name, _, _ in Formatter().parse(text) if name
+        ))
+
+    def key(self, values: Dict) -> tuple:
+        """결과를 결정하는 값 (같으면 같은 스크립트, 없는 필드는 KeyError)"""
+        return tuple(values[name] for name in self.fields)
+
+    def render(self, values: Dict) -> str:
+        return self.text.format_map(values)
+
+
+@lru_cache(maxsize=None)
+def compiled_template(theme: str, lang: str) -> ScriptTemplate:
+    """테마/언어별 템플릿 (프로세스당 한 번 파싱)"""
+    templates = SCRIPT_TEMPLATES[theme]
+    return ScriptTemplate(templates.get(lang, templates['en']))
+
+
+def script_values(theme: str, lang: str, data: Dict) -> Dict:
+    """템플릿에 채울 값 (데이터 + abs_diff + is_cheaper에 따른 단어)"""
+    values = dict(data)
+    if 'diff' in data:
+        values['abs_diff'] = abs(data['diff'])
+    choices = SCRIPT_CHOICES.get(theme, {})
+    if 'is_cheaper' in data:
+        # 템플릿과 같은 언어의 단어 (템플릿이 없는 언어는 영어)
+        words = choices.get(lang if lang in SCRIPT_TEMPLATES[theme] else 'en', {})
+        for name, (yes, no) in words.items():
+            values[name] = yes if data['is_cheaper'] else no
+    return values
+
+
+def text_hash(script: str, lang: str) -> str:
+    """TTS 캐시 키 (언어 + 텍스트)"""
+    return hashlib.sha256(f'{lang}\n{script}'.encode('utf-8')).hexdigest()[:16]
 
 
 class MultilingualScriptGenerator:
     """다국어 스크립트 및 음성 생성"""
 
-    def __init__(self, output_dir='output'):
+    def __init__(self, output_dir='output', tts_backend='gtts'):
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
+        self.tts = get_backend(tts_backend)
 
         # 언어별 템플릿
         self.templates = {
@@ -44,6 +203,7 @@ class MultilingualScriptGenerator:
                 'outro': "今すぐチェックしてコメントしてください!"
             }
         }
+        self._intro_templates = {}
 
     def generate_viral_script(
         self,
@@ -57,154 +217,101 @@ class MultilingualScriptGenerator:
         if lang not in self.templates:
             lang = 'en'
 
-        template = self.templates[lang].get(style, self.templates[lang]['intro'])
-
-        # 테마별 스크립트
-        if theme == 'global_comparison':
-            script = self._generate_comparison_script(data, lang)
-        elif theme == 'bubble_warning':
-            script = self._generate_warning_script(data, lang)
-        elif theme == 'investment_secret':
-            script = self._generate_secret_script(data, lang)
-        elif theme == 'failure_story':
-            script = self._generate_failure_script(data, lang)
-        else:
-            script = self._generate_default_script(data, lang)
-
-        return script
-
-    def _generate_comparison_script(self, data: Dict, lang: str) -> str:
-        """글로벌 비교 스크립트"""
-        templates = {
-            'ko': (
-                f"충격! 서울 {data['kr_price_억']:.1f}억 아파트, "
-                f"{data['city']} ${data['city_price']:,}와 비교하면 {abs(data['diff']):.0f}% "
-                f"{'더 싸다' if data['is_cheaper'] else '더 비싸'}! "
-                f"이게 바로 {'기회' if data['is_cheaper'] else '버블'}입니다! "
-                f"지금 바로 확인하세요!"
-            ),
-            'en': (
-                f"SHOCKING! Seoul ${data['kr_price_usd']:,} apartment "
-                f"vs {data['city']} ${data['city_price']:,} - {abs(data['diff']):.0f}% "
-                f"{'CHEAPER' if data['is_cheaper'] else 'MORE EXPENSIVE'}! "
-                f"This is {'your OPPORTUNITY' if data['is_cheaper'] else 'a BUBBLE'}! "
-                f"Check it NOW!"
-            ),
-            'es': (
-                f"¡IMPACTANTE! Apartamento en Seúl ${data['kr_price_usd']:,} "
-                f"vs {data['city']} ${data['city_price']:,} - ¡{abs(data['diff']):.0f}% "
-                f"{'MÁS BARATO' if data['is_cheaper'] else 'MÁS CARO'}! "
-                f"¡Esta es {'tu OPORTUNIDAD' if data['is_cheaper'] else 'una BURBUJA'}! "
-                f"¡Compruébalo AHORA!"
-            ),
-            'ja': (
-                f"衝撃! ソウル${data['kr_price_usd']:,}マンション、"
-                f"{data['city']} ${data['city_price']:,}と比べて{abs(data['diff']):.0f}% "
-                f"{'安い' if data['is_cheaper'] else '高い'}! "
-                f"これが{'チャンス' if data['is_cheaper'] else 'バブル'}です! "
-                f"今すぐ確認!"
-            )
-        }
-        return templates.get(lang, templates['en'])
-
-    def _generate_warning_script(self, data: Dict, lang: str) -> str:
-        """버블 경고 스크립트"""
-        templates = {
-            'ko': (
-                f"⚠️ 경고! 한국 부동산 {data['bubble_pct']:.0f}% 과열! "
-                f"지난 {data['years']}년간 {data['increase_pct']:.0f}% 상승! "
-                f"글로벌 평균 대비 {data['vs_global']:.0f}% 높음! "
-                f"투자 전 반드시 확인하세요!"
-            ),
-            'en': (
-                f"⚠️ WARNING! Korean real estate {data['bubble_pct']:.0f}% OVERHEATED! "
-                f"Rose {data['increase_pct']:.0f}% in past {data['years']} years! "
-                f"{data['vs_global']:.0f}% HIGHER than global average! "
-                f"MUST check before investing!"
-            ),
-            'es': (
-                f"⚠️ ¡ADVERTENCIA! ¡Inmobiliaria coreana {data['bubble_pct']:.0f}% SOBRECALENTADA! "
-                f"¡Subió {data['increase_pct']:.0f}% en {data['years']} años! "
-                f"¡{data['vs_global']:.0f}% MÁS ALTO que promedio global! "
-                f"¡DEBES verificar antes de invertir!"
-            )
-        }
-        return templates.get(lang, templates['en'])
-
-    def _generate_secret_script(self, data: Dict, lang: str) -> str:
-        """투자 비밀 스크립트"""
-        templates = {
-            'ko': (
-                f"💰 비밀 공개! {data['location']} 투자로 "
-                f"연 {data['annual_return']:.0f}% 수익! "
-                f"{data['years']}년 후 {data['profit_억']:.1f}억 수익 예상! "
-                f"지금이 마지막 기회입니다!"
-            ),
-            'en': (
-                f"💰 SECRET revealed! Invest in {data['location']} for "
-                f"{data['annual_return']:.0f}% annual return! "
-                f"Projected ${data['profit_usd']:,} profit in {data['years']} years! "
-                f"This is your LAST chance!"
-            ),
-            'es': (
-                f"💰 ¡SECRETO revelado! ¡Invierte en {data['location']} para "
-                f"{data['annual_return']:.0f}% retorno anual! "
-                f"¡Ganancia proyectada de ${data['profit_usd']:,} en {data['years']} años! "
-                f"¡Esta es tu ÚLTIMA oportunidad!"
-            )
-        }
-        return templates.get(lang, templates['en'])
-
-    def _generate_failure_script(self, data: Dict, lang: str) -> str:
-        """투자 실패담 스크립트"""
-        templates = {
-            'ko': (
-                f"😱 실화! {data['year']}년 {data['location']} 투자, "
-                f"{data['loss_억']:.1f}억 손실! "
-                f"원인: {data['reason']}! "
-                f"같은 실수 하지 마세요!"
-            ),
-            'en': (
-                f"😱 TRUE STORY! {data['year']} investment in {data['location']}, "
-                f"${data['loss_usd']:,} LOSS! "
-                f"Reason: {data['reason']}! "
-                f"Don't make the SAME mistake!"
-            ),
-            'es': (
-                f"😱 ¡HISTORIA REAL! Inversión {data['year']} en {data['location']}, "
-                f"¡PÉRDIDA de ${data['loss_usd']:,}! "
-                f"Razón: {data['reason']}! "
-                f"¡No cometas el MISMO error!"
-            )
-        }
-        return templates.get(lang, templates['en'])
+        template, values = self._compile(theme, data, lang)
+        return template.render(values)
+
+    def _compile(self, theme: str, data: Dict, lang: str) -> Tuple['ScriptTemplate', Dict]:
+        """(테마, 언어) → 미리 파싱한 템플릿과 채울 값"""
+        if theme in SCRIPT_TEMPLATES:
+            return compiled_template(theme, lang), script_values(theme, lang, data)
+
+        # 기본 스크립트 (인스턴스 템플릿의 intro)
+        intro = self.templates[lang]['intro']
+        if intro not in self._intro_templates:
+            self._intro_templates[intro] = ScriptTemplate(intro)
+        return self._intro_templates[intro], {'topic': data.get('topic', 'Real Estate')}
+
+    def generate_script_matrix(
+        self,
+        rows: Iterable[Dict],
+        themes: Sequence[str],
+        langs: Sequence[str]
+    ) -> 'pd.DataFrame':
+        """테마 x 언어 x 데이터 행 조합의 스크립트를 한 번에 생성
+
+        rows의 각 dict는 스크립트 데이터이며, 'key_'로 시작하는 항목(예: key_country,
+        key_price)은 결과 프레임의 식별 컬럼으로 그대로 들어갑니다.
+        템플릿이 실제로 쓰는 값만으로 중복을 판단하므로 (예: 국가와 무관한 테마)
+        같은 결과는 한 번만 포맷합니다.
+
+        Returns:
+            DataFrame [theme, lang, key_*, script, text_hash, duplicate]
+            (text_hash는 언어 + 텍스트 해시로 TTS 캐시 키, duplicate는 앞 행과 같은 텍스트)
+        """
+        import pandas as pd
+
+        rendered = {}   # (템플릿, 사용 값) → 스크립트
+        seen = set()
+        records = []
+        skipped = 0
 
-    def _generate_default_script(self, data: Dict, lang: str) -> str:
-        """기본 스크립트"""
-        return self.templates[lang]['intro'].format(topic=data.get('topic', 'Real Estate'))
+        for data in rows:
+            keys = {k: v for k, v in data.items() if k.startswith('key_')}
+            for theme in themes:
+                for lang in langs:
+                    script_lang = lang if lang in self.templates else 'en'
+                    try:
+                        template, values = self._compile(theme, data, script_lang)
+                        cache_key = (id(template), template.key(values))
+                    except KeyError:
+                        skipped += 1
+                        continue
+
+                    if cache_key not in rendered:
+                        rendered[cache_key] = template.render(values)
+                    script = rendered[cache_key]
+                    digest = text_hash(script, lang)
+
+                    records.append({'theme': theme, 'lang': lang, **keys, 'script': script,
+                                    'text_hash': digest, 'duplicate': digest in seen})
+                    seen.add(digest)
+
+        frame = pd.DataFrame.from_records(records)
+        print(f"스크립트 매트릭스: {len(records)}개 조합, 고유 텍스트 {len(seen)}개 "
+              f"(포맷 {len(rendered)}회" + (f", 데이터 부족 {skipped}개 건너뜀)" if skipped else ")"))
+        return frame
 
     def generate_voice(self, script: str, lang: str = 'en', filename: str = None) -> str:
         """다국어 음성 생성"""
         if filename is None:
             filename = f'{self.output_dir}/narration_{lang}.mp3'
 
-        # gTTS 언어 코드 매핑
-        gtts_langs = {
-            'ko': 'ko',
-            'en': 'en',
-            'es': 'es',
-            'ja': 'ja'
-        }
-
         try:
-            tts = gTTS(text=script, lang=gtts_langs.get(lang, 'en'), slow=False)
-            tts.save(filename)
+            self.tts.synthesize(script, lang, filename)
             print(f"음성 생성 완료 ({lang}): {filename}")
             return filename
         except Exception as e:
             print(f"음성 생성 실패: {e}")
             return None
 
+    def generate_voices(
+        self,
+        requests: Sequence[Tuple[str, str, str]],
+        backend: Union[str, TTSBackend, None] = None,
+        max_concurrent: int = 4,
+        timeout: Optional[float] = 30.0,
+        retries: int = 2
+    ) -> List[Optional[str]]:
+        """(스크립트, 언어, 파일) 목록을 동시에 음성으로 (시간 초과/재시도 포함, 기본은 self.tts)
+
+        Returns:
+            입력 순서의 파일 경로 (실패한 항목은 None)
+        """
+        runner = NarrationRunner(backend or self.tts, max_concurrent=max_concurrent,
+                                 timeout=timeout, retries=retries)
+        results = runner.run_batch([NarrationRequest(*request) for request in requests])
+        return [result.output_file for result in results]
+
     def generate_ab_test_scripts(self, data: Dict, lang: str = 'en') -> List[Dict]:
         """A/B 테스트용 다양한 스크립트 생성"""
         scripts = []
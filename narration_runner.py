@@ -0,0 +1,183 @@
+"""
+나레이션 동시 생성기 (asyncio)
+
+여러 (스크립트, 언어, 출력 경로) 요청을 한꺼번에 합성합니다. 네트워크 TTS 호출은
+세마포어로 동시 실행 수를 제한한 작업 스레드에서 실행하고, 요청마다 시간 제한과
+점점 늘어나는 대기 후 재시도를 적용합니다.
+"""
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple, Union
+
+from tts_backends import StubToneBackend, TTSBackend, get_backend
+
+
+@dataclass
+class NarrationRequest:
+    """나레이션 하나"""
+    script: str
+    lang: str
+    output_file: str
+    name: str = ''
+
+
+@dataclass
+class NarrationResult:
+    """생성 결과 (실패하면 output_file=None, error에 마지막 사유)"""
+    name: str
+    output_file: Optional[str]
+    elapsed: float
+    attempts: int
+    error: str = ''
+    timed_out: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.output_file is not None
+
+
+class _Attempt:
+    """시도 하나의 상태 (시간 초과로 버린 스레드가 나중에 끝나면 임시 파일을 지움)"""
+
+    def __init__(self, part_file: str):
+        self.part_file = part_file
+        self.lock = threading.Lock()
+        self.done = False
+        self.abandoned = False
+
+    def finish(self) -> bool:
+        with self.lock:
+            if self.abandoned:
+                _remove(self.part_file)
+                return False
+            self.done = True
+            return True
+
+    def abandon(self) -> bool:
+        """버림 표시 (이미 끝났으면 False)"""
+        with self.lock:
+            if self.done:
+                return False
+            self.abandoned = True
+            return True
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class NarrationRunner:
+    """나레이션 요청을 동시에 max_concurrent개까지 생성
+
+    각 시도는 output_file + '.<n>.part'에 쓰고 성공하면 output_file로 옮기므로,
+    시간 초과나 실패한 시도가 최종 파일을 덮어쓰지 않습니다. 실패하면
+    backoff * 2^n초 기다렸다가 최대 retries번 다시 시도합니다.
+    backend는 tts_backends 이름/객체 또는 backend(script, lang, output_file) 함수이며,
+    동시 실행 수는 백엔드의 max_concurrent를 넘지 않습니다.
+    """
+
+    def __init__(
+        self,
+        backend: Union[str, TTSBackend, None] = None,
+        max_concurrent: int = 4,
+        timeout: Optional[float] = 30.0,
+        retries: int = 2,
+        backoff: float = 0.5
+    ):
+        self.backend = get_backend(backend)
+        self.max_concurrent = min(max_concurrent, getattr(self.backend, 'max_concurrent', max_concurrent))
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+
+    def _call(self, request: NarrationRequest, attempt: _Attempt) -> bool:
+        """작업 스레드에서 실행"""
+        self.backend(request.script, request.lang, attempt.part_file)
+        return attempt.finish()
+
+    async def synthesize(
+        self,
+        request: NarrationRequest,
+        semaphore: Optional[asyncio.Semaphore] = None,
+        pool: Optional[ThreadPoolExecutor] = None
+    ) -> NarrationResult:
+        """요청 하나 (semaphore가 있으면 슬롯을 얻은 뒤 시작)"""
+        if semaphore is not None:
+            async with semaphore:
+                return await self.synthesize(request, pool=pool)
+
+        loop = asyncio.get_running_loop()
+        name = request.name or os.path.basename(request.output_file)
+        os.makedirs(os.path.dirname(request.output_file) or '.', exist_ok=True)
+        start = time.perf_counter()
+        error, timed_out = '', False
+
+        for n in range(self.retries + 1):
+            if n:
+                await asyncio.sleep(self.backoff * 2 ** (n - 1))
+
+            attempt = _Attempt(f'{request.output_file}.{n}.part')
+            future = loop.run_in_executor(pool, self._call, request, attempt)
+            try:
+                if await asyncio.wait_for(future, self.timeout):
+                    os.replace(attempt.part_file, request.output_file)
+                    return NarrationResult(name, request.output_file, time.perf_counter() - start, n + 1)
+            except asyncio.TimeoutError:
+                # 스레드는 멈출 수 없으므로 버림 표시만 (끝나면 임시 파일을 스스로 지움)
+                if not attempt.abandon():
+                    os.replace(attempt.part_file, request.output_file)
+                    return NarrationResult(name, request.output_file, time.perf_counter() - start, n + 1)
+                error, timed_out = f'{self.timeout}초 시간 초과', True
+            except Exception as e:
+                _remove(attempt.part_file)
+                error, timed_out = f'{type(e).__name__}: {e}', False
+
+        return NarrationResult(name, None, time.perf_counter() - start, self.retries + 1, error, timed_out)
+
+    async def synthesize_all(self, requests: Sequence[NarrationRequest]) -> List[NarrationResult]:
+        """모든 요청을 동시에 생성하고 전부 끝나면 반환 (결과는 입력 순서)"""
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+        pool = ThreadPoolExecutor(max_workers=self.max_concurrent, thread_name_prefix='tts')
+        try:
+            return list(await asyncio.gather(*(self.synthesize(r, semaphore, pool) for r in requests)))
+        finally:
+            # 시간 초과로 버린 스레드는 기다리지 않음
+            pool.shutdown(wait=False)
+
+    def run_batch(
+        self,
+        requests: Sequence[Union[NarrationRequest, Tuple[str, str, str]]]
+    ) -> List[NarrationResult]:
+        """동기 배치 실행 ((script, lang, path) 튜플도 가능)"""
+        requests = [r if isinstance(r, NarrationRequest) else NarrationRequest(*r) for r in requests]
+        start = time.perf_counter()
+        results = asyncio.run(self.synthesize_all(requests))
+
+        failed = [r for r in results if not r.ok]
+        print(f"나레이션 {len(results) - len(failed)}/{len(results)}개 생성 완료 "
+              f"({time.perf_counter() - start:.2f}초, 동시 {self.max_concurrent}개)")
+        for r in failed:
+            print(f"✗ 나레이션 실패 ({r.name}, {r.attempts}회 시도): {r.error}")
+        return results
+
+
+if __name__ == "__main__":
+    # 네트워크 없이 동작 확인: 지연 0.5초, 처음 2번 실패
+    backend = StubToneBackend(latency=0.5, failures=2)
+    runner = NarrationRunner(backend, max_concurrent=4, timeout=2.0, retries=2, backoff=0.1)
+
+    os.makedirs('output', exist_ok=True)
+    requests = [
+        NarrationRequest(f"Narration test in {lang}", lang, f'output/narration_test_{lang}.wav', name=lang)
+        for lang in ('ko', 'en', 'es', 'ja')
+    ]
+    for result in runner.run_batch(requests):
+        print(f"{result.name}: ok={result.ok} {result.elapsed:.2f}초 시도 {result.attempts}회")
+    print(f"backend 호출 {backend.calls}회")
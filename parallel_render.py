@@ -0,0 +1,95 @@
+"""
+긴 애니메이션의 병렬 청크 렌더링
+
+프레임 범위를 청크로 나눠 프로세스 풀에서 청크마다 영상 조각을 렌더링하고,
+조각들은 ffmpeg concat demuxer로 다시 인코딩하지 않고 이어 붙입니다.
+"""
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+
+def default_workers() -> int:
+    """사용 가능한 코어 수"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def split_frames(total_frames: int, chunks: int) -> List[Tuple[int, int]]:
+    """프레임 범위를 거의 같은 크기의 [start, end) 청크로 분할"""
+    chunks = max(1, min(chunks, total_frames))
+    bounds = [round(i * total_frames / chunks) for i in range(chunks + 1)]
+    return [(bounds[i], bounds[i + 1]) for i in range(chunks) if bounds[i + 1] > bounds[i]]
+
+
+def concat_segments(
+    segments: List[str],
+    output_file: str,
+    audio_file: Optional[str] = None,
+    duration: Optional[float] = None
+) -> Optional[str]:
+    """concat demuxer로 세그먼트 스트림 복사 결합 (오디오는 선택적으로 함께 mux)"""
+    list_file = output_file + '.concat.txt'
+    with open(list_file, 'w') as f:
+        for segment in segments:
+            f.write(f"file '{os.path.abspath(segment)}'\n")
+
+    cmd = ['ffmpeg', '-y', '-loglevel', 'error', '-f', 'concat', '-safe', '0', '-i', list_file]
+    if audio_file:
+        cmd += ['-i', audio_file, '-map', '0:v', '-map', '1:a', '-c:a', 'aac']
+    cmd += ['-c:v', 'copy']
+    if duration:
+        cmd += ['-t', f'{duration:.3f}']
+    cmd.append(output_file)
+
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    os.remove(list_file)
+
+    if result.returncode != 0:
+        print(f"✗ 세그먼트 결합 실패: {result.stderr}")
+        return None
+    return output_file
+
+
+def render_parallel(
+    render_chunk: Callable[[int, int, str], Optional[str]],
+    total_frames: int,
+    output_file: str,
+    workers: Optional[int] = None,
+    audio_file: Optional[str] = None,
+    fps: int = 30
+) -> Optional[str]:
+    """render_chunk(start, end, segment_file)를 프로세스 풀에서 실행 후 결합
+
+    render_chunk는 피클 가능한 호출 객체여야 합니다
+    (모듈 함수 또는 functools.partial(인스턴스 메서드, ...)).
+    """
+    workers = workers or default_workers()
+    chunks = split_frames(total_frames, workers)
+
+    seg_dir = tempfile.mkdtemp(prefix='segments_', dir=os.path.dirname(os.path.abspath(output_file)))
+    segments = [os.path.join(seg_dir, f'segment_{i:03d}.mp4') for i in range(len(chunks))]
+
+    print(f"병렬 렌더링: {total_frames} 프레임 → {len(chunks)}개 청크 ({workers} 프로세스)")
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(render_chunk, start, end, segment)
+                for (start, end), segment in zip(chunks, segments)
+            ]
+            results = [f.result() for f in futures]
+
+        if not all(results):
+            print("✗ 일부 청크 렌더링 실패")
+            return None
+
+        return concat_segments(segments, output_file, audio_file=audio_file,
+                               duration=total_frames / fps)
+    finally:
+        shutil.rmtree(seg_dir, ignore_errors=True)
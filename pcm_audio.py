@@ -0,0 +1,168 @@
+"""
+PCM 오디오 조각과 ffmpeg 파이프 인코더
+
+TTS 세그먼트를 임시 파일 대신 메모리의 16-bit PCM으로 주고받고,
+ffmpeg 프로세스 하나의 stdin으로 차례로 흘려 보내 한 번만 인코딩합니다.
+"""
+import io
+import os
+import subprocess
+import wave
+from dataclasses import dataclass
+from typing import Iterable, Optional, Union
+
+# 압축 형식별 ffmpeg 인코딩 옵션 (출력 확장자 기준)
+ENCODE_OPTIONS = {
+    '.mp3': ['-codec:a', 'libmp3lame', '-qscale:a', '2', '-f', 'mp3'],
+    '.m4a': ['-codec:a', 'aac', '-b:a', '128k', '-f', 'ipod'],
+    '.ogg': ['-codec:a', 'libvorbis', '-f', 'ogg'],
+    '.wav': ['-codec:a', 'pcm_s16le', '-f', 'wav'],
+}
+
+# ffmpeg로 디코딩할 때 기본 샘플레이트
+PCM_RATE = 22050
+
+
+@dataclass
+class PCMAudio:
+    """16-bit little-endian PCM (채널 인터리브)"""
+    data: bytes
+    sample_rate: int
+    channels: int = 1
+
+    @property
+    def duration(self) -> float:
+        return len(self.data) / (2 * self.channels * self.sample_rate)
+
+    def convert(self, sample_rate: int, channels: int = 1) -> 'PCMAudio':
+        """샘플레이트/채널 맞추기 (채널은 평균, 샘플레이트는 선형 보간)"""
+        if sample_rate == self.sample_rate and channels == self.channels:
+            return self
+        import numpy as np
+
+        samples = np.frombuffer(self.data, '<i2').reshape(-1, self.channels).astype(np.float32)
+        if channels != self.channels:
+            samples = np.repeat(samples.mean(axis=1, keepdims=True), channels, axis=1)
+        if sample_rate != self.sample_rate and len(samples):
+            n = max(1, round(len(samples) * sample_rate / self.sample_rate))
+            src = np.arange(len(samples))
+            dst = np.linspace(0, len(samples) - 1, n)
+            samples = np.stack([np.interp(dst, src, samples[:, c]) for c in range(channels)], axis=1)
+        data = np.clip(np.round(samples), -32768, 32767).astype('<i2').tobytes()
+        return PCMAudio(data, sample_rate, channels)
+
+
+def read_wav(source: Union[str, bytes]) -> PCMAudio:
+    """WAV 파일 또는 바이트 → PCMAudio (16-bit가 아니면 ffmpeg로 변환)"""
+    with wave.open(io.BytesIO(source) if isinstance(source, bytes) else source, 'rb') as f:
+        if f.getsampwidth() == 2:
+            return PCMAudio(f.readframes(f.getnframes()), f.getframerate(), f.getnchannels())
+        sample_rate = f.getframerate()
+    return decode_audio(source, sample_rate)
+
+
+def write_wav(audio: PCMAudio, path: str) -> str:
+    with wave.open(path, 'wb') as f:
+        f.setnchannels(audio.channels)
+        f.setsampwidth(2)
+        f.setframerate(audio.sample_rate)
+        f.writeframes(audio.data)
+    return path
+
+
+def decode_audio(source: Union[str, bytes], sample_rate: int = PCM_RATE, channels: int = 1) -> PCMAudio:
+    """아무 오디오 파일/바이트(MP3 등) → PCMAudio (ffmpeg 파이프, 임시 파일 없음)"""
+    data = source if isinstance(source, bytes) else None
+    cmd = ['ffmpeg', '-loglevel', 'error', '-i', 'pipe:0' if data is not None else source,
+           '-f', 's16le', '-ac', str(channels), '-ar', str(sample_rate), 'pipe:1']
+    proc = subprocess.run(cmd, input=data, capture_output=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg 디코딩 실패: {proc.stderr.decode(errors='replace').strip()}")
+    return PCMAudio(proc.stdout, sample_rate, channels)
+
+
+class PCMEncoder:
+    """PCM 조각을 ffmpeg 하나의 stdin으로 흘려 한 번에 인코딩
+
+    첫 조각의 샘플레이트/채널로 ffmpeg를 띄우고, 형식이 다른 조각은 거기에 맞춰
+    변환합니다. 조각을 쓰는 동안 ffmpeg가 앞 조각을 인코딩하므로 합성과 인코딩이
+    겹칩니다. with 블록이 예외로 끝나면 ffmpeg를 종료하고 덜 쓴 출력 파일을 지웁니다.
+
+        with PCMEncoder('output/narration.mp3') as encoder:
+            for audio in backend.iter_pcm(items):
+                encoder.write(audio)
+    """
+
+    def __init__(self, output_file: str, suffix: Optional[str] = None):
+        self.output_file = output_file
+        suffix = (suffix or os.path.splitext(output_file)[1]).lower()
+        self.options = ENCODE_OPTIONS.get(suffix, ENCODE_OPTIONS['.mp3'])
+        self.proc: Optional[subprocess.Popen] = None
+        self.sample_rate = 0
+        self.channels = 1
+        self.samples = 0
+
+    @property
+    def duration(self) -> float:
+        """지금까지 쓴 길이 (초)"""
+        return self.samples / self.sample_rate if self.sample_rate else 0.0
+
+    def _start(self, sample_rate: int, channels: int):
+        self.sample_rate, self.channels = sample_rate, channels
+        cmd = ['ffmpeg', '-y', '-loglevel', 'error',
+               '-f', 's16le', '-ar', str(sample_rate), '-ac', str(channels), '-i', 'pipe:0',
+               *self.options, self.output_file]
+        self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                                     stderr=subprocess.PIPE)
+
+    def write(self, audio: PCMAudio):
+        if self.proc is None:
+            self._start(audio.sample_rate, audio.channels)
+        audio = audio.convert(self.sample_rate, self.channels)
+        try:
+            self.proc.stdin.write(audio.data)
+        except BrokenPipeError:
+            self.close()   # ffmpeg 오류 메시지로 예외
+            raise
+        self.samples += len(audio.data) // (2 * self.channels)
+
+    def close(self) -> str:
+        """입력을 닫고 인코딩이 끝날 때까지 대기 (실패하면 RuntimeError)"""
+        if self.proc is None:
+            raise RuntimeError("인코딩할 오디오가 없습니다")
+        try:
+            self.proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        stderr = self.proc.stderr.read().decode(errors='replace')
+        self.proc.stderr.close()
+        if self.proc.wait() != 0:
+            if os.path.exists(self.output_file):
+                os.remove(self.output_file)
+            raise RuntimeError(f"ffmpeg 인코딩 실패 (exit {self.proc.returncode}): {stderr.strip()}")
+        return self.output_file
+
+    def abort(self):
+        if self.proc is not None and self.proc.poll() is None:
+            self.proc.kill()
+            self.proc.wait()
+        if os.path.exists(self.output_file):
+            os.remove(self.output_file)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def encode_pcm(chunks: Iterable[PCMAudio], output_file: str, suffix: Optional[str] = None) -> str:
+    """PCM 조각들을 이어서 출력 파일 하나로 인코딩 (ffmpeg 한 번)"""
+    with PCMEncoder(output_file, suffix) as encoder:
+        for audio in chunks:
+            encoder.write(audio)
+    return output_file
+
@@ -0,0 +1,210 @@
+"""
+예산 제약 포트폴리오 최적화 (0/1 배낭 문제)
+
+가격을 버킷 단위로 올림해 예산을 정수 칸으로 나누고, 예산 안에서 점수 합이 큰
+매물 조합을 상위 K개까지 찾습니다. 동별 보유 한도를 지키는 조합만 돌려줍니다.
+"""
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+
+class PortfolioOptimizer:
+    """가격 버킷 동적 계획법으로 상위 K개 매물 조합 탐색
+
+    가격을 bucket_size 단위로 올림하여 예산을 B개 버킷으로 나누고,
+    동(洞)별로 (보유 수, 비용) 상태의 K-best DP를 돌린 뒤
+    동 단위 테이블을 max-plus 합성곱으로 합칩니다.
+    동별 보유 한도(max_per_dong)를 정확하게 지킵니다.
+    """
+
+    # _combine 한 번에 만드는 후보 배열 상한 (원소 수, float64 기준 약 8MB)
+    COMBINE_CHUNK = 1000000
+
+    def __init__(self, bucket_size: float = 10000000, top_k: int = 5):
+        if top_k < 1:
+            raise ValueError(f"top_k는 1 이상이어야 합니다: {top_k}")
+        self.bucket_size = bucket_size  # 가격 버킷 (기본 1천만원)
+        self.top_k = top_k              # 반환할 포트폴리오 수
+
+    def optimize(
+        self,
+        prices: Sequence[float],
+        values: Sequence[float],
+        budget: float,
+        groups: Optional[Sequence] = None,
+        max_per_group: Union[int, Dict, None] = None
+    ) -> List[Tuple[List[int], float]]:
+        """예산 내 가치 합이 큰 순서로 (선택 인덱스, 가치 합) 목록 반환"""
+
+        prices = np.asarray(prices, dtype=float)
+        values = np.asarray(values, dtype=float)
+        K = self.top_k
+        B = int(budget // self.bucket_size)
+
+        if len(prices) == 0 or B <= 0:
+            return []
+
+        # 올림 버킷이라 버킷 합이 예산 이하면 실제 가격 합도 예산 이하
+        costs = np.ceil(prices / self.bucket_size).astype(np.int64)
+        valid = (prices > 0) & (costs <= B) & np.isfinite(values) & (values > 0)
+
+        if groups is None:
+            labels = np.zeros(len(prices), dtype=np.int64)
+            names = [None]
+        else:
+            labels, names = self._factorize(groups)
+
+        # 전역 테이블: D[c, r] = 버킷 비용이 정확히 c인 r번째 최적 가치
+        D = np.full((B + 1, K), -np.inf)
+        D[0, 0] = 0.0
+        stages = []
+
+        for g, name in enumerate(names):
+            members = np.flatnonzero(valid & (labels == g))
+            if len(members) == 0:
+                continue
+
+            cap = self._group_cap(max_per_group, name)
+            m = int(min(len(members), B // costs[members].min()))
+            if cap is not None:
+                m = min(m, int(cap))
+            if m <= 0:
+                continue
+
+            Gv, Gp, item_ptrs = self._group_table(members, costs, values, B, m)
+            D, Dp = self._combine(D, Gv)
+            stages.append((Dp, Gp, item_ptrs))
+
+        # 최종 상위 K개 (빈 포트폴리오 제외)
+        flat = D.ravel()
+        order = np.argsort(-flat, kind='stable')
+        results = []
+        for f in order:
+            if len(results) >= K or not np.isfinite(flat[f]):
+                break
+            c, r = divmod(int(f), K)
+            chosen = self._backtrack(stages, c, r)
+            if chosen:
+                results.append((sorted(chosen), float(flat[f])))
+
+        return results
+
+    def _group_table(self, members, costs, values, B, m):
+        """동 내부 K-best DP: T[k, c, r] (k개 보유, 비용 c)"""
+        K = self.top_k
+        T = np.full((m + 1, B + 1, K), -np.inf)
+        T[0, 0, 0] = 0.0
+        # 포인터 값은 0 ~ 2K-1
+        ptr_dtype = np.min_scalar_type(2 * K - 1)
+        identity = np.broadcast_to(np.arange(K, dtype=ptr_dtype), T.shape)
+        item_ptrs = []
+
+        for j in members:
+            w, v = int(costs[j]), values[j]
+            # 포인터 < K: 미선택(같은 셀의 순위), >= K: 선택(k-1, c-w 셀의 순위)
+            both = np.concatenate([T[1:, w:, :], T[:-1, :B + 1 - w, :] + v], axis=2)
+            order = np.argsort(-both, axis=2, kind='stable')[..., :K]
+
+            T = T.copy()
+            T[1:, w:, :] = np.take_along_axis(both, order, axis=2)
+            ptr = identity.copy()
+            ptr[1:, w:, :] = order
+            item_ptrs.append((int(j), w, ptr))
+
+        # 보유 수를 합쳐 비용별 상위 K개로 축약
+        flat = T.transpose(1, 0, 2).reshape(B + 1, (m + 1) * K)
+        Gp = np.argsort(-flat, axis=1, kind='stable')[:, :K]
+        Gv = np.take_along_axis(flat, Gp, axis=1)
+        return Gv, Gp, item_ptrs
+
+    def _combine(self, D, Gv):
+        """max-plus 합성곱: new[c] = top-K(D[c - c'] + G[c'])
+
+        후보 배열이 B×B×K×K라 예산이 크면 비용 c를 몇 줄씩 나눠 계산합니다.
+        """
+        B1, K = D.shape
+        rows = max(1, self.COMBINE_CHUNK // (B1 * K * K))
+        values = np.empty((B1, K))
+        pointers = np.empty((B1, K), dtype=np.intp)
+
+        for lo in range(0, B1, rows):
+            hi = min(B1, lo + rows)
+            shift = np.arange(lo, hi)[:, None] - np.arange(B1)[None, :]   # (c, c')
+            prev = np.where((shift >= 0)[:, :, None], D[np.clip(shift, 0, None)], -np.inf)
+            cand = (prev[:, :, :, None] + Gv[None, :, None, :]).reshape(hi - lo, -1)
+
+            # 후보 중 상위 K개만 부분 정렬
+            part = np.argpartition(-cand, K - 1, axis=1)[:, :K]
+            part_vals = np.take_along_axis(cand, part, axis=1)
+            order = np.argsort(-part_vals, axis=1, kind='stable')
+            pointers[lo:hi] = np.take_along_axis(part, order, axis=1)
+            values[lo:hi] = np.take_along_axis(cand, pointers[lo:hi], axis=1)
+
+        return values, pointers
+
+    def _backtrack(self, stages, c, r) -> List[int]:
+        """포인터를 역추적하여 선택된 매물 인덱스 복원"""
+        K = self.top_k
+        chosen = []
+
+        for Dp, Gp, item_ptrs in reversed(stages):
+            f = int(Dp[c, r])
+            c_group, rest = divmod(f, K * K)
+            r_prev, r_group = divmod(rest, K)
+
+            k, rk = divmod(int(Gp[c_group, r_group]), K)
+            cc = c_group
+            for j, w, ptr in reversed(item_ptrs):
+                q = int(ptr[k, cc, rk])
+                if q >= K:
+                    chosen.append(j)
+                    rk, k, cc = q - K, k - 1, cc - w
+                else:
+                    rk = q
+
+            c, r = c - c_group, r_prev
+
+        return chosen
+
+    @staticmethod
+    def _factorize(groups):
+        """그룹 라벨을 정수 코드로 변환"""
+        names = []
+        codes = {}
+        labels = np.empty(len(groups), dtype=np.int64)
+        for i, g in enumerate(groups):
+            if g not in codes:
+                codes[g] = len(names)
+                names.append(g)
+            labels[i] = codes[g]
+        return labels, names
+
+    @staticmethod
+    def _group_cap(max_per_group, name):
+        """동별 보유 한도 (int: 전체 동 공통, dict: 동별 지정)"""
+        if max_per_group is None:
+            return None
+        if isinstance(max_per_group, dict):
+            return max_per_group.get(name)
+        return max_per_group
+
+
+if __name__ == "__main__":
+    import time
+
+    # 테스트: 무작위 후보 3,000개
+    rng = np.random.default_rng(0)
+    n = 3000
+    prices = rng.uniform(1.5e8, 6e8, n)
+    scores = rng.integers(50, 100, n).astype(float)
+    dongs = rng.choice(['자양동', '구의동', '광장동', '화양동', '군자동'], n)
+
+    optimizer = PortfolioOptimizer()
+    start = time.perf_counter()
+    portfolios = optimizer.optimize(prices, scores, 600000000, groups=dongs, max_per_group=1)
+    elapsed = time.perf_counter() - start
+
+    print(f"{n}개 후보 최적화: {elapsed:.3f}초")
+    for rank, (items, value) in enumerate(portfolios, 1):
+        total = prices[items].sum() / 100000000
+        print(f"{rank}. 점수 {value:.0f} | {len(items)}개 | {total:.2f}억 | {', '.join(sorted(set(dongs[items].tolist())))}")
@@ -0,0 +1,152 @@
+"""
+가격 정렬 인덱스 (예산별 질의 가속)
+
+거래를 가격순으로 한 번 정렬하고 누적합을 만들어 두면, 예산 B 이하 거래는 항상
+정렬 배열의 앞부분이라 예산마다 전체 표를 다시 거르지 않고 이진 탐색으로 답합니다.
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Sequence
+
+from investment_analyzer import InvestmentAnalyzer
+
+
+class PriceIndex:
+    """거래를 가격순으로 정렬해 두고 예산 B 이하 질의를 이진 탐색으로 처리
+
+    예산 이하 거래는 항상 정렬 배열의 앞부분(prefix)이므로
+    거래 수, 평균 가격은 누적합으로, 추천 매물은 점수 구간별
+    위치 목록으로, ㎡당 가격 중앙값은 예산 순 스윕으로 계산합니다.
+    """
+
+    def __init__(self, df: pd.DataFrame, analyzer: InvestmentAnalyzer = None):
+        self.df = df
+        analyzer = analyzer or InvestmentAnalyzer()
+
+        features = analyzer.score_features(df)
+        features = features[features['가격'].notna()]
+
+        # 가격 오름차순 (같은 가격은 원래 순서 유지)
+        order = np.argsort(features['가격'].to_numpy(), kind='stable')
+        self.features = features.iloc[order]
+        self.prices = self.features['가격'].to_numpy(dtype=float)
+
+        # 누적 집계
+        self.cum_price = np.concatenate([[0.0], np.cumsum(self.prices)])
+        self.price_per_sqm = self.features['평당가'].to_numpy(dtype=float)
+        self.sqm_valid = np.isfinite(self.price_per_sqm)
+
+        # 기본 점수별 위치 목록 (면적 정보가 있는 거래만 추천 대상)
+        base = self.features['기본점수'].to_numpy()
+        eligible = ~(self.features['면적'].to_numpy() == 0)
+        self.levels = {
+            int(s): np.flatnonzero(eligible & (base == s))
+            for s in np.unique(base[eligible])
+        }
+
+        print(f"가격 인덱스 생성: {len(self.prices)}건, 점수 구간 {len(self.levels)}개")
+
+    def _position(self, budgets, side='right') -> np.ndarray:
+        """예산 이하(side='right') / 미만(side='left') 거래 수"""
+        return np.searchsorted(self.prices, np.asarray(budgets, dtype=float), side=side)
+
+    def count_under(self, budgets: Sequence[float]) -> np.ndarray:
+        """예산별 거래 수"""
+        return self._position(budgets)
+
+    def features_under(self, budget: float) -> pd.DataFrame:
+        """예산 이하 거래의 점수 요소 (원래 행 순서)"""
+        n = int(self._position([budget])[0])
+        return self.features.iloc[:n].sort_values('행번호')
+
+    def best_deals(self, budget: float, top_n: int = 3, min_score: int = 50) -> List[int]:
+        """예산 내 점수 상위 거래 위치 (동점이면 저렴한 순)"""
+        cut = int(self._position([budget * 0.8], side='left')[0])   # 예산 적합 보너스 구간
+        end = int(self._position([budget])[0])
+
+        # 유효 점수 -> (점수 구간, 위치 범위) 목록
+        segments = {}
+        for s, pos in self.levels.items():
+            lo = np.searchsorted(pos, cut)
+            hi = np.searchsorted(pos, end)
+            if lo > 0:
+                segments.setdefault(s + 30, []).append(pos[:lo])
+            if hi > lo:
+                segments.setdefault(s, []).append(pos[lo:hi])
+
+        picks = []
+        for score in sorted(segments, reverse=True):
+            if score < min_score or len(picks) >= top_n:
+                break
+            need = top_n - len(picks)
+            merged = np.sort(np.concatenate([p[:need] for p in segments[score]]))[:need]
+            picks.extend((int(p), score) for p in merged)
+
+        return picks
+
+    def sweep(self, budgets: Sequence[float], top_n: int = 3, min_score: int = 50) -> List[Dict]:
+        """여러 예산을 한 번에 질의 (거래 수, 평균, ㎡당 중앙값, 추천 매물)"""
+        budgets = np.asarray(budgets, dtype=float)
+        ends = self._position(budgets)
+        medians = self._prefix_medians(ends)
+
+        results = []
+        for budget, end, median in zip(budgets, ends, medians):
+            picks = self.best_deals(budget, top_n=top_n, min_score=min_score)
+            rows = [self.features['행번호'].iat[p] for p, _ in picks]
+            deals = self.df.iloc[rows].copy()
+            deals['점수'] = [score for _, score in picks]
+
+            results.append({
+                'budget': budget,
+                'count': int(end),
+                'mean_price': self.cum_price[end] / end if end else 0.0,
+                'median_price_per_sqm': median,
+                'deals': deals
+            })
+
+        return results
+
+    def _prefix_medians(self, ends: np.ndarray) -> np.ndarray:
+        """prefix별 ㎡당 가격 중앙값 (작은 예산부터 정렬 병합)"""
+        medians = np.full(len(ends), np.nan)
+        window = np.empty(0)
+        prev = 0
+
+        for i in np.argsort(ends, kind='stable'):
+            end = int(ends[i])
+            if end > prev:
+                chunk = self.price_per_sqm[prev:end][self.sqm_valid[prev:end]]
+                # 정렬된 두 구간의 병합은 timsort가 선형 시간에 처리
+                window = np.sort(np.concatenate([window, np.sort(chunk)]), kind='stable')
+                prev = end
+
+            n = len(window)
+            if n:
+                medians[i] = (window[(n - 1) // 2] + window[n // 2]) / 2
+
+        return medians
+
+
+if __name__ == "__main__":
+    import glob
+    import time
+    from data_processor import RealEstateDataProcessor
+
+    # 테스트: 스케줄러 예산 범위(4-8억) 스윕
+    processor = RealEstateDataProcessor(glob.glob("*.xlsx")[0])
+    processor.load_data()
+    processor.clean_data()
+
+    index = PriceIndex(processor.df)
+    budgets = np.arange(400000000, 800000001, 10000000)
+
+    start = time.perf_counter()
+    results = index.sweep(budgets)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n예산 {len(budgets)}개 스윕: {elapsed*1000:.1f}ms")
+    for r in results[::10]:
+        top = r['deals']['점수'].tolist()
+        print(f"{r['budget']/100000000:.1f}억: {r['count']}건, "
+              f"㎡당 중앙값 {r['median_price_per_sqm']/10000:.0f}만원, 추천 점수 {top}")
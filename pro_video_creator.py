@@ -1,23 +1,34 @@
 """
 프로 영상 생성 (MoviePy + 무료 툴)
 """
-# MoviePy 2.x imports
-from moviepy import (
-    VideoClip, ImageClip, VideoFileClip, AudioFileClip,
-    CompositeVideoClip, TextClip, concatenate_videoclips
-)
-from moviepy import vfx
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
 import numpy as np
 from pathlib import Path
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
+from functools import partial
+from typing import TYPE_CHECKING
 import os
 
+from audio_probe import DEFAULT_DURATION, video_duration
+from image_profiles import figure_to_image, save_image
+from parallel_render import render_parallel
+from video_composer import VideoComposer
+from timeline import Timeline, Segment, Overlay, AudioTrack
+
+# MoviePy(2.x)와 matplotlib은 해당 경로에서만 로드 (기본 ffmpeg 백엔드는 MoviePy 불필요)
+if TYPE_CHECKING:
+    from moviepy import VideoClip
+
 
 class ProVideoCreator:
     """프로페셔널 영상 제작"""
 
+    # 인트로/아웃트로 길이 (초, 나머지는 데이터 시각화)
+    INTRO_DURATION = 3.0
+    OUTRO_DURATION = 2.0
+
+    # 인트로 배경: 위쪽 색 → 아래쪽 색 방향으로 strength만큼 섞는 세로 그라데이션
+    INTRO_GRADIENT = ((26, 26, 46), (233, 69, 96), 0.3)
+
     def __init__(self, output_dir='output/pro'):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -32,22 +43,18 @@ class ProVideoCreator:
         title: str,
         subtitle: str,
         duration: float = 3.0
-    ) -> VideoClip:
+    ) -> 'VideoClip':
         """애니메이션 인트로 (3초)"""
 
+        title_font, subtitle_font = self._intro_fonts()
+        background = self._intro_background()
+
         def make_frame(t):
             """프레임 생성 함수"""
             # 배경 그라데이션
-            img = Image.new('RGB', (self.width, self.height), '#1a1a2e')
+            img = background.copy()
             draw = ImageDraw.Draw(img)
 
-            # 그라데이션 효과
-            for y in range(self.height):
-                r = int(26 + (233 - 26) * (y / self.height) * 0.3)
-                g = int(26 + (69 - 26) * (y / self.height) * 0.3)
-                b = int(46 + (96 - 46) * (y / self.height) * 0.3)
-                draw.line([(0, y), (self.width, y)], fill=(r, g, b))
-
             # 애니메이션 효과 (fade in + slide up)
             progress = min(t / duration, 1.0)
             alpha = int(255 * progress)
@@ -55,13 +62,6 @@ class ProVideoCreator:
             # 타이틀 위치 (아래에서 위로)
             title_y = int(self.height * 0.4 + (1 - progress) * 200)
 
-            try:
-                title_font = ImageFont.truetype("/System/Library/Fonts/Supplemental/Arial Bold.ttf", 80)
-                subtitle_font = ImageFont.truetype("/System/Library/Fonts/Supplemental/Arial.ttf", 50)
-            except:
-                title_font = ImageFont.load_default()
-                subtitle_font = ImageFont.load_default()
-
             # 제목 그리기
             bbox = draw.textbbox((0, 0), title, font=title_font)
             text_width = bbox[2] - bbox[0]
@@ -85,19 +85,92 @@ class ProVideoCreator:
 
             return np.array(img)
 
+        from moviepy import VideoClip
+
         return VideoClip(make_frame, duration=duration)
 
+    def _intro_fonts(self):
+        try:
+            title_font = ImageFont.truetype("/System/Library/Fonts/Supplemental/Arial Bold.ttf", 80)
+            subtitle_font = ImageFont.truetype("/System/Library/Fonts/Supplemental/Arial.ttf", 50)
+        except:
+            title_font = ImageFont.load_default()
+            subtitle_font = ImageFont.load_default()
+        return title_font, subtitle_font
+
+    def _intro_background(self) -> Image.Image:
+        """인트로 배경 그라데이션"""
+        top, bottom, strength = self.INTRO_GRADIENT
+        img = Image.new('RGB', (self.width, self.height), top)
+        draw = ImageDraw.Draw(img)
+        for y in range(self.height):
+            fill = tuple(int(a + (b - a) * (y / self.height) * strength) for a, b in zip(top, bottom))
+            draw.line([(0, y), (self.width, y)], fill=fill)
+        return img
+
+    def _intro_background_file(self) -> str:
+        """인트로 배경 PNG (크기/그라데이션이 파일 이름에 들어가므로 바뀌면 새로 생성)"""
+        top, bottom, strength = self.INTRO_GRADIENT
+        colors = '-'.join('{:02x}{:02x}{:02x}'.format(*c) for c in (top, bottom))
+        background = str(self.output_dir / f'intro_bg_{self.width}x{self.height}_{colors}_{strength:g}.png')
+        if not os.path.exists(background):
+            save_image(self._intro_background(), background, 'png-fast')
+        return background
+
+    def _text_band(self, text: str, font, fill, shadow: bool, output_file: str) -> str:
+        """가로 전체 폭의 투명 띠에 가운데 정렬 텍스트를 그린 PNG"""
+        probe = ImageDraw.Draw(Image.new('RGBA', (1, 1)))
+        bbox = probe.textbbox((0, 0), text, font=font)
+        text_x = (self.width - (bbox[2] - bbox[0])) // 2
+
+        band = Image.new('RGBA', (self.width, bbox[3] + 10), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(band)
+        if shadow:
+            draw.text((text_x + 3, 3), text, fill=(0, 0, 0, 255), font=font)
+        draw.text((text_x, 0), text, fill=fill, font=font)
+        # ffmpeg가 바로 읽는 중간 파일이므로 압축보다 저장 속도 우선
+        return save_image(band, output_file, 'png-fast').path
+
+    def intro_segment(self, title: str, subtitle: str, duration: float = 3.0, name: str = 'intro') -> Segment:
+        """create_animated_intro와 같은 장면을 타임라인 구간으로 (배경 + 텍스트 오버레이)"""
+        title_font, subtitle_font = self._intro_fonts()
+
+        background = self._intro_background_file()
+
+        # 타이틀은 아래에서 위로 200px 이동, 부제목은 절반 지점부터 표시
+        title_y = f'trunc({self.height * 0.4}+(1-min(t/{duration},1))*200)'
+        overlays = [Overlay(
+            self._text_band(title, title_font, (255, 255, 255, 255), True,
+                            str(self.output_dir / f'{name}_title.png')),
+            y=title_y
+        )]
+        if subtitle:
+            overlays.append(Overlay(
+                self._text_band(subtitle, subtitle_font, (255, 215, 0, 255), False,
+                                str(self.output_dir / f'{name}_subtitle.png')),
+                y=f'{title_y}+120', start=duration / 2 + 1e-3
+            ))
+
+        return Segment(background, duration=duration, overlays=overlays)
+
     def create_data_visualization(
         self,
         opportunity: dict,
         market_data: dict,
-        duration: float = 7.0
+        duration: float = 7.0,
+        encoder: str = 'vfr'
     ) -> str:
-        """데이터 시각화 영상"""
+        """데이터 시각화 영상
+
+        encoder='vfr'은 페이드 프레임과 정지 프레임만 인코딩하고,
+        'moviepy'는 기존처럼 모든 프레임을 렌더링합니다.
+        """
 
         output_file = str(self.output_dir / 'data_viz.mp4')
 
         # Matplotlib으로 차트 생성
+        import matplotlib.pyplot as plt
+
         fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(10.8, 19.2))
         fig.patch.set_facecolor('#1a1a2e')
 
@@ -147,14 +220,22 @@ class ProVideoCreator:
         # 레이아웃 조정
         plt.tight_layout()
 
-        # 이미지로 저장
-        chart_file = str(self.output_dir / 'chart_temp.png')
-        plt.savefig(chart_file, dpi=100, facecolor='#1a1a2e')
-        plt.close()
+        # 이미지로 변환 (임시 PNG 저장/다시 읽기 없이 메모리로 전달)
+        chart = figure_to_image(fig, dpi=100)
+        plt.close(fig)
+
+        if encoder == 'vfr':
+            composer = VideoComposer(str(self.output_dir))
+            return composer.encode_frames(
+                self._fade_frames(chart, duration), output_file,
+                fps=self.fps, width=self.width, height=self.height
+            )
 
         # MoviePy로 영상 변환
         try:
-            clip = ImageClip(chart_file, duration=duration)
+            from moviepy import ImageClip, vfx
+
+            clip = ImageClip(np.asarray(chart), duration=duration)
             # MoviePy 2.x uses vfx module
             clip = clip.with_effects([vfx.FadeIn(0.5), vfx.FadeOut(0.5)])
             clip.write_videofile(output_file, fps=self.fps, codec='libx264', logger=None)
@@ -164,34 +245,130 @@ class ProVideoCreator:
             print(f"Video creation failed: {e}")
             return None
 
+    def _fade_frames(self, image, duration: float, fade: float = 0.5) -> list:
+        """검은 화면에서 페이드 인/아웃하는 (프레임, 표시 시간) 목록 (image: PIL 이미지 또는 파일 경로)"""
+        if not isinstance(image, Image.Image):
+            image = Image.open(image)
+        image = np.asarray(image.convert('RGB'), dtype=np.float32)
+        step = 1.0 / self.fps
+        n = max(1, min(int(round(fade * self.fps)), int(duration * self.fps) // 2))
+
+        fade_in = [((image * (i / n)).astype(np.uint8), step) for i in range(n)]
+        fade_out = [((image * (1 - i / n)).astype(np.uint8), step) for i in range(1, n)]
+        hold = duration - (len(fade_in) + len(fade_out)) * step
+
+        return fade_in + [(image.astype(np.uint8), hold)] + fade_out
+
+    def data_viz_duration(self, audio_file: str, minimum: float = 3.0) -> float:
+        """나레이션이 끝날 때 영상도 끝나도록 인트로/아웃트로를 뺀 데이터 시각화 길이
+
+        렌더링 전에 정해 두므로 잘려 나갈 프레임이나 잘리는 나레이션이 없습니다
+        (나레이션이 없으면 전체 DEFAULT_DURATION초 기준).
+        """
+        total = video_duration(audio_file, default=DEFAULT_DURATION, fps=self.fps)
+        return max(minimum, total - self.INTRO_DURATION - self.OUTRO_DURATION)
+
+    def _compose_final_video(self, intro_text: tuple, data_viz_file: str, outro_text: str) -> 'VideoClip':
+        """인트로 + 데이터 시각화 + 아웃트로 (오디오 제외)"""
+        from moviepy import VideoFileClip, concatenate_videoclips
+
+        # 1. 인트로 (3초)
+        intro = self.create_animated_intro(intro_text[0], intro_text[1], duration=self.INTRO_DURATION)
+
+        # 2. 데이터 시각화 (data_viz_duration초)
+        # 가변 프레임레이트 파일은 평균 fps가 아닌 tbr 기준으로 읽어야 타이밍이 맞음
+        data_clip = VideoFileClip(data_viz_file, fps_source='tbr')
+
+        # 3. 아웃트로 (2초)
+        outro = self.create_animated_intro(outro_text, "Check Now!", duration=self.OUTRO_DURATION)
+
+        # 4. 영상 합치기
+        return concatenate_videoclips([intro, data_clip, outro])
+
+    def build_timeline(
+        self,
+        intro_text: tuple,
+        data_viz_file: str,
+        audio_file: str,
+        outro_text: str
+    ) -> Timeline:
+        """인트로 (3초) + 데이터 시각화 + 아웃트로 (2초) + 내레이션"""
+        audio = [AudioTrack(audio_file)] if audio_file and os.path.exists(audio_file) else []
+        return Timeline(
+            segments=[
+                self.intro_segment(intro_text[0], intro_text[1], duration=self.INTRO_DURATION, name='intro'),
+                Segment(data_viz_file),
+                self.intro_segment(outro_text, "Check Now!", duration=self.OUTRO_DURATION, name='outro'),
+            ],
+            audio=audio,
+            width=self.width,
+            height=self.height,
+            fps=self.fps
+        )
+
+    def _render_final_chunk(
+        self,
+        intro_text: tuple,
+        data_viz_file: str,
+        outro_text: str,
+        start: int,
+        end: int,
+        segment_file: str
+    ) -> str:
+        """병렬 렌더링 청크 (프로세스 풀에서 호출, 프레임 [start, end))"""
+        video = self._compose_final_video(intro_text, data_viz_file, outro_text)
+        video.subclipped(start / self.fps, end / self.fps).write_videofile(
+            segment_file,
+            fps=self.fps,
+            codec='libx264',
+            preset='medium',
+            bitrate='3000k',
+            audio=False,
+            logger=None
+        )
+        return segment_file
+
     def create_final_shorts(
         self,
         intro_text: tuple,
         data_viz_file: str,
         audio_file: str,
         outro_text: str = "INVEST SMART!",
-        output_file: str = None
+        output_file: str = None,
+        workers: int = None,
+        backend: str = 'ffmpeg'
     ) -> str:
-        """최종 쇼츠 조립"""
+        """최종 쇼츠 조립
+
+        backend='ffmpeg'은 타임라인을 ffmpeg 한 번으로 렌더링하고,
+        실패하면 MoviePy로 대체합니다 (workers > 1이면 청크별 병렬 렌더링).
+        """
 
         if output_file is None:
             output_file = str(self.output_dir / 'final_shorts.mp4')
 
-        try:
-            # 1. 인트로 (3초)
-            intro = self.create_animated_intro(intro_text[0], intro_text[1], duration=3.0)
-
-            # 2. 데이터 시각화 (7초)
-            data_clip = VideoFileClip(data_viz_file)
-
-            # 3. 아웃트로 (2초)
-            outro = self.create_animated_intro(outro_text, "Check Now!", duration=2.0)
+        if backend == 'ffmpeg':
+            try:
+                result = self.build_timeline(intro_text, data_viz_file, audio_file, outro_text).render(output_file)
+                if result:
+                    print(f"✓ Final shorts created: {output_file}")
+                    return result
+            except Exception as e:
+                print(f"ffmpeg timeline failed: {e}")
+            print("MoviePy 백엔드로 대체합니다.")
+
+        if workers and workers > 1:
+            return self._create_final_shorts_parallel(
+                intro_text, data_viz_file, audio_file, outro_text, output_file, workers
+            )
 
-            # 4. 영상 합치기
-            final_video = concatenate_videoclips([intro, data_clip, outro])
+        try:
+            final_video = self._compose_final_video(intro_text, data_viz_file, outro_text)
 
             # 5. 오디오 추가
             if audio_file and os.path.exists(audio_file):
+                from moviepy import AudioFileClip
+
                 audio = AudioFileClip(audio_file)
                 final_video = final_video.with_audio(audio)
 
@@ -213,6 +390,34 @@ class ProVideoCreator:
             print(f"Final assembly failed: {e}")
             return None
 
+    def _create_final_shorts_parallel(
+        self,
+        intro_text: tuple,
+        data_viz_file: str,
+        audio_file: str,
+        outro_text: str,
+        output_file: str,
+        workers: int
+    ) -> str:
+        """프레임 범위를 나눠 프로세스별로 렌더링 후 concat + 오디오 mux"""
+        try:
+            video = self._compose_final_video(intro_text, data_viz_file, outro_text)
+            total_frames = int(round(video.duration * self.fps))
+            video.close()
+
+            render_chunk = partial(self._render_final_chunk, intro_text, data_viz_file, outro_text)
+            audio = audio_file if audio_file and os.path.exists(audio_file) else None
+
+            result = render_parallel(render_chunk, total_frames, output_file,
+                                     workers=workers, audio_file=audio, fps=self.fps)
+            if result:
+                print(f"✓ Final shorts created: {output_file}")
+            return result
+
+        except Exception as e:
+            print(f"Final assembly failed: {e}")
+            return None
+
     def add_text_overlay(
         self,
         video_file: str,
@@ -225,6 +430,8 @@ class ProVideoCreator:
             output_file = str(self.output_dir / 'video_with_text.mp4')
 
         try:
+            from moviepy import CompositeVideoClip, TextClip, VideoFileClip
+
             video = VideoFileClip(video_file)
 
             # 텍스트 클립 생성
@@ -1,85 +1,54 @@
 """
 프로 음성 생성 (무료 고품질 대안)
-Piper TTS - ElevenLabs 90% 품질
+Piper TTS - ElevenLabs 90% 품질 (기본은 pyttsx3, tts_backends로 교체 가능)
 """
-import subprocess
 import os
+import time
 from pathlib import Path
-import pyttsx3
+
+import audio_mix
+from pcm_audio import PCMEncoder, encode_pcm
+from tts_backends import get_backend
 
 
 class ProVoiceGenerator:
     """고품질 무료 TTS"""
 
-    def __init__(self, output_dir='output'):
+    # 스타일별 (말하기 속도, 볼륨)
+    STYLES = {
+        'exciting': (180, 1.0),       # 빠르게
+        'calm': (150, 0.8),           # 천천히
+        'professional': (170, 0.9),
+    }
+
+    def __init__(self, output_dir='output', backend='pyttsx3'):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
-        self.engine = None
-
-    def init_pyttsx3(self):
-        """pyttsx3 초기화 (오프라인 TTS)"""
-        if self.engine is None:
-            self.engine = pyttsx3.init()
-
-            # 설정 최적화
-            voices = self.engine.getProperty('voices')
-
-            # 영어 음성 선택 (여성/남성)
-            for voice in voices:
-                if 'english' in voice.name.lower() or 'david' in voice.name.lower():
-                    self.engine.setProperty('voice', voice.id)
-                    print(f"Voice set: {voice.name}")
-                    break
-
-            # 속도 (기본 200, 160-180이 자연스러움)
-            self.engine.setProperty('rate', 170)
-
-            # 볼륨 (0.0-1.0)
-            self.engine.setProperty('volume', 0.9)
+        self.backend = get_backend(backend)
 
     def generate_professional_voice(
         self,
         script: str,
         output_file: str = None,
-        style: str = 'professional'
+        style: str = 'professional',
+        lang: str = 'en'
     ) -> str:
         """프로페셔널 음성 생성"""
 
         if output_file is None:
             output_file = str(self.output_dir / 'narration_pro.mp3')
 
-        self.init_pyttsx3()
-
         # 스타일별 조정
-        if style == 'exciting':
-            self.engine.setProperty('rate', 180)  # 빠르게
-            self.engine.setProperty('volume', 1.0)
-        elif style == 'calm':
-            self.engine.setProperty('rate', 150)  # 천천히
-            self.engine.setProperty('volume', 0.8)
-        else:  # professional
-            self.engine.setProperty('rate', 170)
-            self.engine.setProperty('volume', 0.9)
+        self.backend.set_style(*self.STYLES.get(style, self.STYLES['professional']))
 
         try:
             # Ensure output directory exists
-            output_path = Path(output_file)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-
-            # WAV로 먼저 저장 (pyttsx3는 WAV만 지원)
-            wav_file = str(output_path.parent / 'temp_narration.wav')
-            self.engine.save_to_file(script, wav_file)
-            self.engine.runAndWait()
-
-            # WAV → MP3 변환 (ffmpeg)
-            if os.path.exists(wav_file):
-                self._convert_to_mp3(wav_file, output_file)
-                os.remove(wav_file)  # WAV 삭제
-            else:
-                print(f"Warning: WAV file not created, checking if it exists...")
-                return None
-
-            print(f"✓ Professional voice generated: {output_file}")
+            Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+
+            # WAV를 만드는 백엔드(pyttsx3, piper)는 출력 확장자에 맞춰 ffmpeg로 변환
+            self.backend.synthesize(script, lang, output_file)
+
+            print(f"✓ Professional voice generated ({self.backend.name}): {output_file}")
             return output_file
 
         except Exception as e:
@@ -88,34 +57,6 @@ class ProVoiceGenerator:
             traceback.print_exc()
             return None
 
-    def _convert_to_mp3(self, wav_file: str, mp3_file: str):
-        """WAV를 MP3로 변환"""
-        try:
-            cmd = [
-                'ffmpeg',
-                '-i', wav_file,
-                '-codec:a', 'libmp3lame',
-                '-qscale:a', '2',  # 고품질
-                '-y',
-                mp3_file
-            ]
-            result = subprocess.run(cmd, capture_output=True, check=True, text=True)
-        except subprocess.CalledProcessError as e:
-            print(f"MP3 conversion failed: {e}")
-            print(f"FFmpeg stderr: {e.stderr}")
-            # 실패 시 WAV 그대로 사용
-            import shutil
-            wav_output = mp3_file.replace('.mp3', '.wav')
-            print(f"Using WAV format instead: {wav_output}")
-            shutil.copy(wav_file, wav_output)
-            return wav_output
-        except Exception as e:
-            print(f"Unexpected error in MP3 conversion: {e}")
-            import shutil
-            wav_output = mp3_file.replace('.mp3', '.wav')
-            shutil.copy(wav_file, wav_output)
-            return wav_output
-
     def add_background_music(
         self,
         voice_file: str,
@@ -135,17 +76,10 @@ class ProVoiceGenerator:
             return voice_file
 
         try:
-            # FFmpeg로 오디오 믹싱
-            cmd = [
-                'ffmpeg',
-                '-i', voice_file,
-                '-i', bgm_file,
-                '-filter_complex',
-                f'[0:a]volume={voice_vol}[a1];[1:a]volume={bgm_vol}[a2];[a1][a2]amix=inputs=2:duration=shortest',
-                '-y',
-                output_file
-            ]
-            subprocess.run(cmd, capture_output=True, check=True)
+            # NumPy로 믹싱 (BGM 디코딩은 캐시, 더킹/페이드 포함) 후 한 번 인코딩
+            settings = audio_mix.MixSettings(voice_gain=voice_vol, bgm_gain=bgm_vol)
+            mixed = audio_mix.mix_files(voice_file, bgm_file, settings)
+            encode_pcm([audio_mix.to_pcm(mixed)], output_file)
             print(f"✓ BGM added: {output_file}")
             return output_file
 
@@ -156,54 +90,43 @@ class ProVoiceGenerator:
     def generate_multi_segment_audio(
         self,
         segments: list,
-        output_file: str = None
+        output_file: str = None,
+        lang: str = 'en'
     ) -> str:
-        """여러 세그먼트 음성 합성 (다양한 톤)"""
+        """여러 세그먼트 음성 합성 (다양한 톤)
 
-        temp_files = []
+        세그먼트마다 MP3를 만들어 concat하지 않고, 백엔드가 돌려주는 PCM을
+        ffmpeg 하나의 stdin으로 순서대로 흘려 보내 한 번만 인코딩합니다
+        (세그먼트 파일, concat 목록 없음).
+        """
 
-        for i, segment in enumerate(segments):
-            temp_file = str(self.output_dir / f'segment_{i}.mp3')
-            self.generate_professional_voice(
-                segment['text'],
-                temp_file,
-                style=segment.get('style', 'professional')
-            )
-            temp_files.append(temp_file)
-
-        # 오디오 합치기
         if output_file is None:
             output_file = str(self.output_dir / 'narration_multi.mp3')
 
+        items = [
+            (segment['text'], lang, self.STYLES.get(segment.get('style', 'professional'), self.STYLES['professional']))
+            for segment in segments
+        ]
+
         try:
-            # FFmpeg concat
-            concat_file = str(self.output_dir / 'concat_list.txt')
-            with open(concat_file, 'w') as f:
-                for temp in temp_files:
-                    f.write(f"file '{temp}'\n")
-
-            cmd = [
-                'ffmpeg',
-                '-f', 'concat',
-                '-safe', '0',
-                '-i', concat_file,
-                '-c', 'copy',
-                '-y',
-                output_file
-            ]
-            subprocess.run(cmd, capture_output=True, check=True)
-
-            # 임시 파일 삭제
-            for temp in temp_files:
-                os.remove(temp)
-            os.remove(concat_file)
-
-            print(f"✓ Multi-segment audio created: {output_file}")
+            Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+            start = time.perf_counter()
+
+            with PCMEncoder(output_file) as encoder:
+                for audio in self.backend.iter_pcm(items):
+                    encoder.write(audio)
+
+            print(f"✓ Multi-segment audio created: {output_file} "
+                  f"({len(segments)} segments, {encoder.duration:.1f}s audio in {time.perf_counter() - start:.2f}s)")
             return output_file
 
         except Exception as e:
-            print(f"Audio concat failed: {e}")
-            return temp_files[0] if temp_files else None
+            print(f"Multi-segment audio failed: {e}")
+            return None
+
+    def close(self):
+        """TTS 엔진 작업자 정리"""
+        self.backend.close()
 
 
 if __name__ == "__main__":
@@ -234,4 +157,12 @@ if __name__ == "__main__":
         style='professional'
     )
 
+    # 톤이 다른 세그먼트를 한 파일로 (인코딩 한 번)
+    generator.generate_multi_segment_audio([
+        {'text': "Investment Alert!", 'style': 'exciting'},
+        {'text': "Seoul offers 2% better net ROI annually than New York.", 'style': 'professional'},
+        {'text': "Check the details and make your move.", 'style': 'calm'},
+    ], output_file='output/investment_segments.mp3')
+    generator.close()
+
     print("\n✓ Professional voice generation complete!")
@@ -0,0 +1,163 @@
+"""
+반복매매 가격지수 (Repeat-sales index)
+
+같은 호실이 두 번 거래된 가격 쌍만 쓰므로 매물 구성이 달라져도 지수가 흔들리지 않습니다.
+쌍은 호실 해시 자가 조인으로 찾고, 월별 계수는 희소 최소제곱으로 한 번에 풉니다.
+
+log(p2 / p1) = β[t2] - β[t1] + ε   (기준월 β = 0)
+"""
+import hashlib
+import os
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from scipy import sparse
+from scipy.sparse.linalg import lsqr
+from typing import Optional
+
+
+class RepeatSalesIndex:
+    """동일 호실(단지, 번지, 면적, 층)의 반복 거래로 만든 월별 지수
+
+    데이터 스냅샷(관련 컬럼의 해시)별로 결과를 메모리와 디스크에 캐시합니다.
+    """
+
+    UNIT_COLUMNS = ['시군구', '단지명', '번지', '전용면적(㎡)', '층']
+
+    # 성장률 추정에 필요한 최소 기간(개월)과 거래 쌍 수
+    MIN_SPAN_MONTHS = 6
+    MIN_PAIRS = 30
+
+    _memory_cache = {}
+
+    def __init__(self, cache_dir: str = 'output/cache'):
+        self.cache_dir = Path(cache_dir)
+        self.pairs = None
+        self.trend = None
+
+    def snapshot_key(self, df: pd.DataFrame) -> str:
+        """데이터 스냅샷 해시 (행 순서 무관)"""
+        cols = [c for c in self.UNIT_COLUMNS + ['계약년월', '계약일', '거래금액_숫자'] if c in df.columns]
+        row_hashes = pd.util.hash_pandas_object(df[cols], index=False).to_numpy()
+        digest = hashlib.sha1(np.sort(row_hashes).tobytes())
+        return digest.hexdigest()[:16]
+
+    def match_pairs(self, df: pd.DataFrame) -> pd.DataFrame:
+        """호실 해시 키로 연속 거래 쌍 매칭 (해시 자가 조인)"""
+        unit_cols = [c for c in self.UNIT_COLUMNS if c in df.columns]
+
+        sales = pd.DataFrame({
+            'unit': pd.util.hash_pandas_object(df[unit_cols], index=False).to_numpy(),
+            'month': df['계약년월'].astype(int).to_numpy(),
+            'day': pd.to_numeric(df['계약일'] if '계약일' in df else pd.Series(0, index=df.index),
+                                 errors='coerce').fillna(0).to_numpy(),
+            'log_price': np.log(df['거래금액_숫자'].where(df['거래금액_숫자'] > 0)).to_numpy()
+        }).dropna()
+
+        # 호실별 거래 순번 → (unit, seq)와 (unit, seq + 1) 조인
+        sales = sales.sort_values(['month', 'day'], kind='stable')
+        sales['seq'] = sales.groupby('unit', sort=False).cumcount()
+        nxt = sales.assign(seq=sales['seq'] - 1)
+
+        pairs = sales.merge(nxt, on=['unit', 'seq'], suffixes=('_1', '_2'))
+
+        # 같은 달 재거래는 시간 정보가 없으므로 제외
+        pairs = pairs[pairs['month_2'] > pairs['month_1']]
+        pairs = pairs.assign(y=pairs['log_price_2'] - pairs['log_price_1'])
+
+        print(f"반복매매 쌍: {len(pairs)}건 (호실 {pairs['unit'].nunique()}개)")
+        return pairs[['unit', 'month_1', 'month_2', 'y']].reset_index(drop=True)
+
+    def fit(self, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """반복매매 회귀 (기준월 = 가장 이른 달)"""
+        pairs = self.match_pairs(df)
+        self.pairs = pairs
+
+        if len(pairs) == 0:
+            print("반복매매 지수: 매칭된 거래 쌍이 없습니다.")
+            return None
+
+        months = np.unique(np.concatenate([pairs['month_1'], pairs['month_2']]))
+        col_1 = np.searchsorted(months, pairs['month_1'])
+        col_2 = np.searchsorted(months, pairs['month_2'])
+
+        # +1(두 번째 거래) / -1(첫 거래) 희소 설계행렬, 기준월 열 제외
+        n = len(pairs)
+        rows = np.concatenate([np.arange(n), np.arange(n)])
+        cols = np.concatenate([col_2, col_1])
+        vals = np.concatenate([np.ones(n), -np.ones(n)])
+        X = sparse.csr_matrix((vals, (rows, cols)), shape=(n, len(months)))[:, 1:]
+
+        beta = lsqr(X, pairs['y'].to_numpy(), atol=1e-10, btol=1e-10)[0]
+        effect = np.concatenate([[0.0], beta])
+
+        # 기준월 평균 가격에 지수를 곱해 가격 수준으로 환산
+        base_month = df['계약년월'].astype(int) == months[0]
+        base_price = df.loc[base_month, '거래금액_숫자'].mean()
+
+        self.trend = pd.DataFrame({
+            '년월': months.astype(str),
+            '평균가격': base_price * np.exp(effect),
+            '거래건수': np.bincount(col_2, minlength=len(months)),
+            # 그달이 첫 거래 또는 두 번째 거래인 쌍 수 (성장률 가중치)
+            '쌍수': np.bincount(col_1, minlength=len(months)) + np.bincount(col_2, minlength=len(months)),
+            '지수': 100 * np.exp(effect)
+        })
+        return self.trend
+
+    def load_or_fit(self, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """스냅샷 캐시 조회 후 없으면 적합"""
+        key = self.snapshot_key(df)
+
+        if key in self._memory_cache:
+            self.trend = self._memory_cache[key]
+            return self.trend
+
+        cache_file = self.cache_dir / f'repeat_sales_v2_{key}.pkl'
+        if cache_file.exists():
+            self.trend = pd.read_pickle(cache_file)
+            print(f"반복매매 지수 캐시 사용: {cache_file}")
+        else:
+            self.fit(df)
+            if self.trend is not None:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                self.trend.to_pickle(cache_file)
+
+        self._memory_cache[key] = self.trend
+        return self.trend
+
+    def annual_growth(self, min_months: int = MIN_SPAN_MONTHS, min_pairs: int = MIN_PAIRS) -> Optional[float]:
+        """지수 로그 기울기로 추정한 연간 성장률 (월별 쌍 수 가중)
+
+        기간이 min_months개월보다 짧거나 쌍이 min_pairs건보다 적으면 None.
+        """
+        if self.trend is None or len(self.trend) < 2:
+            return None
+
+        months = pd.to_datetime(self.trend['년월'], format='%Y%m')
+        t = (months.dt.year * 12 + months.dt.month).to_numpy(dtype=float)
+        weights = self.trend['쌍수'].to_numpy(dtype=float)
+        if t[-1] - t[0] < min_months or weights.sum() / 2 < min_pairs:
+            return None
+
+        # 가중 최소제곱: polyfit의 w는 잔차에 곱하므로 sqrt(쌍 수)
+        slope = np.polyfit(t, np.log(self.trend['지수'].to_numpy()), 1, w=np.sqrt(weights))[0]
+        return float(np.exp(12 * slope) - 1)
+
+
+if __name__ == "__main__":
+    import glob
+    import time
+    from data_processor import RealEstateDataProcessor
+
+    processor = RealEstateDataProcessor(glob.glob("*.xlsx")[0])
+    processor.load_data()
+    processor.clean_data()
+
+    index = RepeatSalesIndex()
+    start = time.perf_counter()
+    trend = index.load_or_fit(processor.df)
+    print(f"\n반복매매 지수 ({time.perf_counter() - start:.3f}초):")
+    print(trend)
+    growth = index.annual_growth()
+    print(f"연간 성장률: {growth * 100:.1f}%" if growth is not None else "연간 성장률: 데이터 부족")
@@ -0,0 +1,202 @@
+"""
+단계별 결과 캐시 (make 방식)
+
+단계마다 입력(데이터 해시, 파라미터, 상위 단계 결과물 해시)을 선언하면 결과물을 그 해시로
+저장해 두고, 입력이 그대로인 동안에는 다시 만들지 않고 재사용합니다.
+"""
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+class StageCache:
+    """입력 해시 → 결과물 캐시
+
+    사용법:
+        cache = StageCache(force=args.force)
+        key = cache.key('narration', {'script': script, 'code': cache.file('voice_generator.py')})
+        audio = cache.fetch('narration', key, 'output/narration.mp3')
+        if audio is None:
+            audio = generate(...)
+            cache.store('narration', key, audio, elapsed)
+
+        # 한 번에: cache.run('narration', inputs, output_file, produce)
+        # 파일이 아닌 결과: cache.value('data', inputs, compute)
+
+    저장 구조:
+        objects/<sha256 앞 2자리>/<sha256><확장자>   내용 주소 (같은 결과물은 한 번만 저장)
+        refs/<stage>/<입력 키>.json                  입력 키 → 객체, 생성 시간
+
+    force에 단계 이름(또는 'all')을 주면 해당 단계는 캐시를 무시하고 다시 만듭니다.
+    """
+
+    def __init__(self, cache_dir: str = 'output/cache/stages', force: Iterable[str] = (),
+                 enabled: bool = True):
+        self.cache_dir = Path(cache_dir)
+        self.force = set(force or ())
+        self.enabled = enabled
+        self.events = []
+        self._file_hashes = {}
+
+    # ---- 입력 해시 ----
+
+    def file(self, path) -> Optional[str]:
+        """파일 내용 해시 (경로, 크기, 수정 시각이 같으면 재계산하지 않음)"""
+        if not path or not os.path.exists(path):
+            return None
+        stat = os.stat(path)
+        memo = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        if memo not in self._file_hashes:
+            digest = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+            self._file_hashes[memo] = digest.hexdigest()
+        return self._file_hashes[memo]
+
+    @staticmethod
+    def frame(df) -> Optional[str]:
+        """DataFrame 해시 (값, 인덱스, 컬럼, dtype)"""
+        if df is None:
+            return None
+        import pandas as pd
+
+        digest = hashlib.sha256(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+        digest.update(repr([(str(c), str(t)) for c, t in df.dtypes.items()]).encode())
+        return digest.hexdigest()
+
+    def key(self, stage: str, inputs: Dict[str, Any]) -> str:
+        """단계 이름 + 입력의 해시 (입력은 JSON 직렬화 가능한 값)"""
+        payload = json.dumps({'stage': stage, 'inputs': inputs}, sort_keys=True,
+                             ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()[:24]
+
+    # ---- 조회 / 저장 ----
+
+    def _ref(self, stage: str, key: str) -> Path:
+        return self.cache_dir / 'refs' / stage.replace('/', '_') / f'{key}.json'
+
+    def _object(self, digest: str, suffix: str) -> Path:
+        return self.cache_dir / 'objects' / digest[:2] / f'{digest}{suffix}'
+
+    def _lookup(self, stage: str, key: str) -> Optional[dict]:
+        if not self.enabled or stage in self.force or 'all' in self.force:
+            return None
+        ref_file = self._ref(stage, key)
+        if not ref_file.exists():
+            return None
+        with open(ref_file, encoding='utf-8') as f:
+            ref = json.load(f)
+        if not self._object(ref['object'], ref['suffix']).exists():
+            return None
+        return ref
+
+    def fetch(self, stage: str, key: str, output_file: str) -> Optional[str]:
+        """캐시 적중이면 결과물을 output_file로 복사해 경로 반환, 아니면 None"""
+        ref = self._lookup(stage, key)
+        if ref is None:
+            return None
+
+        os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+        # ffmpeg -y 등이 같은 inode를 덮어쓸 수 있으므로 하드링크 대신 복사
+        shutil.copyfile(self._object(ref['object'], ref['suffix']), output_file)
+        self._record(stage, 'hit', ref.get('elapsed', 0.0))
+        print(f"✓ 캐시 사용 ({stage}): {output_file}")
+        return output_file
+
+    def store(self, stage: str, key: str, artifact: Optional[str], elapsed: float = 0.0) -> Optional[str]:
+        """결과물을 내용 주소로 저장하고 입력 키와 연결"""
+        self._record(stage, 'miss', elapsed)
+        if not self.enabled or not artifact or not os.path.exists(artifact):
+            return artifact
+
+        digest = self.file(artifact)
+        suffix = Path(artifact).suffix
+        obj = self._object(digest, suffix)
+        if not obj.exists():
+            obj.parent.mkdir(parents=True, exist_ok=True)
+            tmp = obj.with_name(obj.name + '.tmp')
+            shutil.copyfile(artifact, tmp)
+            os.replace(tmp, obj)
+
+        self._write_ref(stage, key, digest, suffix, elapsed)
+        return artifact
+
+    def _write_ref(self, stage: str, key: str, digest: str, suffix: str, elapsed: float):
+        ref_file = self._ref(stage, key)
+        ref_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(ref_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'stage': stage,
+                'key': key,
+                'object': digest,
+                'suffix': suffix,
+                'elapsed': round(elapsed, 3),
+                'created': datetime.now().isoformat(timespec='seconds'),
+            }, f, ensure_ascii=False, indent=2)
+
+    def run(self, stage: str, inputs: Dict[str, Any], output_file: str,
+            produce: Callable[[], Optional[str]]) -> Optional[str]:
+        """적중이면 재사용, 아니면 produce() 실행 후 저장"""
+        key = self.key(stage, inputs)
+        cached = self.fetch(stage, key, output_file)
+        if cached is not None:
+            return cached
+
+        start = time.perf_counter()
+        artifact = produce()
+        return self.store(stage, key, artifact, time.perf_counter() - start)
+
+    def value(self, stage: str, inputs: Dict[str, Any], compute: Callable[[], Any]) -> Any:
+        """파일이 아닌 결과 (pickle로 저장, None은 저장하지 않음)"""
+        key = self.key(stage, inputs)
+        ref = self._lookup(stage, key)
+        if ref is not None:
+            with open(self._object(ref['object'], ref['suffix']), 'rb') as f:
+                result = pickle.load(f)
+            self._record(stage, 'hit', ref.get('elapsed', 0.0))
+            print(f"✓ 캐시 사용 ({stage})")
+            return result
+
+        start = time.perf_counter()
+        result = compute()
+        elapsed = time.perf_counter() - start
+        self._record(stage, 'miss', elapsed)
+
+        if self.enabled and result is not None:
+            data = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+            digest = hashlib.sha256(data).hexdigest()
+            obj = self._object(digest, '.pkl')
+            if not obj.exists():
+                obj.parent.mkdir(parents=True, exist_ok=True)
+                tmp = obj.with_name(obj.name + '.tmp')
+                tmp.write_bytes(data)
+                os.replace(tmp, obj)
+            self._write_ref(stage, key, digest, '.pkl', elapsed)
+        return result
+
+    # ---- 요약 ----
+
+    def _record(self, stage: str, status: str, elapsed: float):
+        forced = stage in self.force or 'all' in self.force
+        self.events.append({'stage': stage, 'status': 'forced' if forced and status == 'miss' else status,
+                            'elapsed': elapsed})
+
+    def summary(self):
+        """단계별 적중/재계산 요약 (적중 단계는 원래 걸렸던 시간을 절약)"""
+        if not self.events:
+            return
+        hits = [e for e in self.events if e['status'] == 'hit']
+        saved = sum(e['elapsed'] for e in hits)
+
+        print(f"\n🗄  단계 캐시: 적중 {len(hits)} / 재계산 {len(self.events) - len(hits)} "
+              f"(절약 약 {saved:.1f}초)")
+        for e in self.events:
+            label = {'hit': '적중', 'miss': '재계산', 'forced': '강제 재계산'}[e['status']]
+            print(f"  {e['stage']:<24}{label:<10}{e['elapsed']:>8.2f}초")
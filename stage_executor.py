@@ -0,0 +1,142 @@
+"""
+의존성 기반 단계 실행기
+
+단계는 의존하는 단계가 끝나는 즉시 시작합니다. 네트워크나 ffmpeg 서브프로세스처럼
+기다리는 시간이 긴 단계는 스레드에서, CPU를 쓰는 렌더링 단계는 프로세스 풀에서 실행합니다.
+"""
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from parallel_render import default_workers
+from stage_profiler import run_measured
+
+
+@dataclass
+class Stage:
+    """실행 단계 하나
+
+    func(*의존 단계 결과, *args, **kwargs)로 호출됩니다 (결과는 deps 순서).
+    kind='process'면 func와 인자가 피클 가능해야 합니다
+    (모듈 함수 또는 인스턴스 메서드).
+    """
+    name: str
+    func: Callable
+    args: Tuple = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    deps: Tuple[str, ...] = ()
+    kind: str = 'thread'
+
+
+class StageExecutor:
+    """독립 단계를 동시에 실행하고 모든 단계가 끝나면 결과 반환
+
+    사용법:
+        executor = StageExecutor(profiler=profiler)
+        results = executor.run([
+            Stage('thumbnail', render_thumbnail, (data,), kind='process'),
+            Stage('voice', generate_voice, (script,)),
+            Stage('video', encode_video, (output_file,), deps=('thumbnail',)),
+        ])
+        results['video']
+
+    단계는 각자 스케줄링 스레드에서 의존 단계를 기다린 뒤 실행됩니다. 'thread' 단계는
+    그 스레드에서 직접 실행되고 (동시 max_threads개), 'process' 단계는 프로세스 풀로
+    넘겨집니다. profiler가 있으면 'process' 단계는 워커 안에서 측정(run_measured)해
+    워커의 CPU/메모리와 cProfile 통계를 단계 기록에 넣습니다. 한 단계가 실패하면 그 단계에 의존하는 단계는 같은 예외로 실패하고,
+    run()은 나머지 단계가 끝난 뒤 첫 번째 예외를 다시 발생시킵니다.
+    """
+
+    KINDS = ('thread', 'process')
+
+    def __init__(self, max_threads: Optional[int] = None, max_processes: Optional[int] = None,
+                 profiler=None):
+        self.max_threads = max_threads or 8
+        self.max_processes = max_processes or default_workers()
+        self.profiler = profiler
+        self.elapsed = {}
+
+    def _order(self, stages: Sequence[Stage]) -> list:
+        """의존성 순서 (이름 중복, 없는 의존 단계, 순환이면 ValueError)"""
+        by_name = {}
+        for stage in stages:
+            if stage.name in by_name:
+                raise ValueError(f"중복된 단계 이름: {stage.name}")
+            if stage.kind not in self.KINDS:
+                raise ValueError(f"알 수 없는 실행 방식: {stage.kind} ({stage.name})")
+            by_name[stage.name] = stage
+
+        order, state = [], {}
+
+        def visit(stage):
+            if state.get(stage.name) == 'done':
+                return
+            if state.get(stage.name) == 'visiting':
+                raise ValueError(f"순환 의존성: {stage.name}")
+            state[stage.name] = 'visiting'
+            for dep in stage.deps:
+                if dep not in by_name:
+                    raise ValueError(f"{stage.name}: 없는 의존 단계 {dep}")
+                visit(by_name[dep])
+            state[stage.name] = 'done'
+            order.append(stage)
+
+        for stage in stages:
+            visit(stage)
+        return order
+
+    def _run_stage(self, stage: Stage, deps: Sequence[Future], slots: threading.Semaphore,
+                   processes: Optional[ProcessPoolExecutor]):
+        inputs = [future.result() for future in deps]
+        args = tuple(inputs) + tuple(stage.args)
+
+        start = time.perf_counter()
+        try:
+            if stage.kind == 'thread':
+                with slots:
+                    if self.profiler is None:
+                        return stage.func(*args, **stage.kwargs)
+                    with self.profiler.stage(stage.name):
+                        return stage.func(*args, **stage.kwargs)
+
+            if self.profiler is None:
+                return processes.submit(stage.func, *args, **stage.kwargs).result()
+            # 이 스레드는 기다리기만 하므로 시간/자원과 cProfile은 워커 안에서 측정
+            with self.profiler.stage(stage.name, remote=True) as state:
+                result, usage = processes.submit(
+                    run_measured, stage.func, args, stage.kwargs, self.profiler.profile
+                ).result()
+                if state is not None:
+                    self.profiler.add_usage(state, usage)
+                return result
+        finally:
+            self.elapsed[stage.name] = time.perf_counter() - start
+
+    def run(self, stages: Sequence[Stage]) -> Dict[str, Any]:
+        """모든 단계 실행 → {이름: 결과} (단계별 실행 시간은 self.elapsed)"""
+        order = self._order(stages)
+        if not order:
+            return {}
+
+        slots = threading.Semaphore(self.max_threads)
+        needs_processes = any(stage.kind == 'process' for stage in order)
+        processes = ProcessPoolExecutor(max_workers=self.max_processes) if needs_processes else None
+
+        futures = {}
+        try:
+            with ThreadPoolExecutor(max_workers=len(order), thread_name_prefix='stage') as threads:
+                for stage in order:
+                    futures[stage.name] = threads.submit(
+                        self._run_stage, stage, [futures[d] for d in stage.deps], slots, processes
+                    )
+        finally:
+            if processes is not None:
+                processes.shutdown()
+
+        for stage in order:
+            error = futures[stage.name].exception()
+            if error is not None:
+                raise error
+        return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,290 @@
+"""
+파이프라인 단계별 시간/자원 측정
+
+단계마다 실행 시간, CPU 시간, 자식 프로세스 CPU 시간, 최대 메모리를 재서 JSONL 로그에
+한 줄씩 추가합니다. --profile이면 가장 느린 단계의 cProfile 통계도 저장합니다.
+다른 프로세스에서 실행되는 단계(StageExecutor의 process 단계)는 워커 안에서
+run_measured로 재고 그 결과를 단계 기록에 더합니다.
+"""
+import functools
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional
+
+
+def _rss_mb(maxrss: int) -> float:
+    """ru_maxrss 단위 변환 (Linux KB, macOS bytes)"""
+    return maxrss / (1024 * 1024) if sys.platform == 'darwin' else maxrss / 1024
+
+
+def _reset_peak_rss() -> bool:
+    """Linux: 프로세스 최대 RSS(VmHWM) 초기화 → 단계별 최대치 측정 가능"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb() -> float:
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return _rss_mb(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def _cpu(usage) -> float:
+    return usage.ru_utime + usage.ru_stime
+
+
+class _WorkerProfile:
+    """워커에서 받은 cProfile 통계 (pstats.Stats로 읽을 수 있는 형태)"""
+
+    def __init__(self, stats: dict):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+def run_measured(func, args=(), kwargs=None, profile: bool = False):
+    """워커 프로세스에서 단계 함수를 실행하고 (결과, 자원 사용량) 반환
+
+    사용량은 이 워커의 CPU(RUSAGE_SELF), 워커가 실행해 끝난 자식 프로세스(ffmpeg 등)의
+    CPU, 워커의 최대 RSS이고, profile=True면 cProfile 통계(dict)를 함께 돌려줍니다.
+    풀 워커는 단계가 끝나도 살아 있어 부모의 RUSAGE_CHILDREN에 잡히지 않으므로
+    StageExecutor가 이 값을 StageProfiler.add_usage로 단계 기록에 더합니다.
+    """
+    _reset_peak_rss()
+    wall = time.perf_counter()
+    self_start = resource.getrusage(resource.RUSAGE_SELF)
+    child_start = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    profiler = None
+    if profile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        result = func(*args, **(kwargs or {}))
+    finally:
+        if profiler is not None:
+            profiler.disable()
+
+    child = resource.getrusage(resource.RUSAGE_CHILDREN)
+    stats = None
+    if profiler is not None:
+        profiler.create_stats()
+        stats = profiler.stats
+    return result, {
+        'wall_s': time.perf_counter() - wall,
+        'cpu_s': _cpu(resource.getrusage(resource.RUSAGE_SELF)) - _cpu(self_start),
+        'child_cpu_s': _cpu(child) - _cpu(child_start),
+        'peak_rss_mb': _peak_rss_mb(),
+        'child_peak_rss_mb': _rss_mb(child.ru_maxrss),
+        'stats': stats,
+    }
+
+
+class StageProfiler:
+    """단계별 측정기
+
+    사용법:
+        with StageProfiler('main', profile=args.profile) as profiler:
+            profiler.begin('data')        # 이전 단계를 닫고 새 단계 시작
+            ...
+            with profiler.stage('tts'):   # 블록 단위
+                ...
+        # 종료 시 요약 출력 (+ profile=True면 가장 느린 단계 cProfile)
+
+    peak_rss_mb는 Linux에서 단계 시작 시 초기화한 단계별 최대치이고, 그 외 환경에서는
+    프로세스 시작 이후 최대치입니다. 여러 스레드에서 동시에 stage()를 열 수 있으며
+    (StageExecutor), 이때 겹친 단계의 peak_rss_mb는 함께 실행된 단계를 포함합니다.
+
+    child_cpu_s / child_peak_rss_mb에 들어가는 것:
+    - 단계 중에 끝나고 회수된 자식 프로세스 (ffmpeg, 호출 안에서 만들고 닫는 프로세스 풀:
+      parallel_render, 썸네일 배치) - RUSAGE_CHILDREN
+    - stage(remote=True) 단계에서 add_usage로 받은 워커 측정값 (StageExecutor의
+      process 단계: 워커 자신의 CPU + 워커가 실행한 자식 프로세스)
+    들어가지 않는 것: 단계가 끝난 뒤에도 살아 있는 프로세스 (pyttsx3 엔진 풀처럼 여러
+    단계에 걸쳐 재사용하는 풀)는 종료되어 회수될 때 그 시점에 열린 단계에 잡힙니다.
+    """
+
+    def __init__(self, pipeline: str, log_file: str = 'output/profile/stages.jsonl',
+                 profile: bool = False, enabled: bool = True):
+        self.pipeline = pipeline
+        self.log_file = log_file
+        self.profile = profile
+        self.enabled = enabled
+        self.run_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.records = []
+        self._profiles = {}
+        self._current = None
+        self._open = 0
+        self._profiling = False
+        self._lock = threading.Lock()
+
+    def _start(self, name: str, remote: bool = False) -> dict:
+        with self._lock:
+            self._open += 1
+            outermost = self._open == 1
+            # cProfile은 한 번에 하나만 활성화 → 이미 프로파일 중이면 건너뜀.
+            # remote 단계는 이 프로세스에서 기다리기만 하므로 워커에서 프로파일
+            profile = self.profile and not remote and not self._profiling
+            if profile:
+                self._profiling = True
+        if outermost:
+            _reset_peak_rss()
+        state = {
+            'name': name,
+            'started': datetime.now().isoformat(timespec='seconds'),
+            'wall': time.perf_counter(),
+            'cpu': time.process_time(),
+            'child': resource.getrusage(resource.RUSAGE_CHILDREN),
+            'profile': None,
+            'remote': remote,
+            'usage': None,
+        }
+        if profile:
+            import cProfile
+
+            state['profile'] = cProfile.Profile()
+            state['profile'].enable()
+        return state
+
+    def add_usage(self, state: dict, usage: dict):
+        """remote 단계에 워커 측정값(run_measured 결과) 추가"""
+        state['usage'] = usage
+        if usage.get('stats') is not None:
+            with self._lock:
+                self._profiles[state['name']] = _WorkerProfile(usage['stats'])
+
+    def _stop(self, state: dict, status: str = 'ok') -> dict:
+        if state['profile'] is not None:
+            state['profile'].disable()
+            with self._lock:
+                self._profiles[state['name']] = state['profile']
+                self._profiling = False
+
+        child = resource.getrusage(resource.RUSAGE_CHILDREN)
+        child_cpu = _cpu(child) - _cpu(state['child'])
+        child_peak = _rss_mb(child.ru_maxrss)
+        usage = state['usage']
+        if usage is not None:
+            child_cpu += usage['cpu_s'] + usage['child_cpu_s']
+            child_peak = max(child_peak, usage['peak_rss_mb'], usage['child_peak_rss_mb'])
+
+        record = {
+            'run': self.run_id,
+            'pipeline': self.pipeline,
+            'stage': state['name'],
+            'started': state['started'],
+            'wall_s': round(time.perf_counter() - state['wall'], 4),
+            'cpu_s': round(time.process_time() - state['cpu'], 4),
+            'child_cpu_s': round(child_cpu, 4),
+            'peak_rss_mb': round(_peak_rss_mb(), 1),
+            'child_peak_rss_mb': round(child_peak, 1),
+            'status': status,
+        }
+        if state['remote']:
+            record['remote'] = True
+        with self._lock:
+            self._open -= 1
+            self.records.append(record)
+            self._write(record)
+        return record
+
+    def _write(self, record: dict):
+        os.makedirs(os.path.dirname(self.log_file) or '.', exist_ok=True)
+        with open(self.log_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    @contextmanager
+    def stage(self, name: str, remote: bool = False):
+        """블록을 한 단계로 측정
+
+        remote=True는 실제 작업을 다른 프로세스에서 기다리는 블록입니다. 이 프로세스에서는
+        cProfile을 켜지 않고, 블록이 받은 상태(state)에 add_usage로 워커 측정값을 넣습니다.
+        """
+        if not self.enabled:
+            yield None
+            return
+        state = self._start(name, remote)
+        status = 'ok'
+        try:
+            yield state
+        except BaseException:
+            status = 'error'
+            raise
+        finally:
+            self._stop(state, status)
+
+    def track(self, name: Optional[str] = None):
+        """함수를 한 단계로 측정하는 데코레이터"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name or func.__name__):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def begin(self, name: str):
+        """이전 단계를 닫고 새 단계 시작 (배너 단위로 이어지는 스크립트용)"""
+        self.end()
+        if self.enabled:
+            self._current = self._start(name)
+
+    def end(self, status: str = 'ok'):
+        if self._current is not None:
+            self._stop(self._current, status)
+            self._current = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end(status='ok' if exc_type is None else 'error')
+        self.finish()
+        return False
+
+    def finish(self, top: int = 20):
+        """열린 단계를 닫고 요약 출력, profile=True면 가장 느린 단계의 cProfile 통계 저장"""
+        self.end()
+        if not self.records:
+            return
+
+        print(f"\n⏱  단계별 측정 ({self.pipeline})")
+        print(f"{'stage':<24}{'wall(s)':>10}{'cpu(s)':>10}{'child(s)':>10}{'peak MB':>10}")
+        for r in self.records:
+            print(f"{r['stage']:<24}{r['wall_s']:>10.2f}{r['cpu_s']:>10.2f}"
+                  f"{r['child_cpu_s']:>10.2f}{r['peak_rss_mb']:>10.0f}")
+        print(f"→ {self.log_file}")
+
+        profiled = [r for r in self.records if r['stage'] in self._profiles]
+        if profiled:
+            import io
+            import pstats
+
+            slowest = max(profiled, key=lambda r: r['wall_s'])['stage']
+            stats_file = os.path.join(os.path.dirname(self.log_file) or '.',
+                                      f"{self.pipeline}_{slowest.replace('/', '_')}_{self.run_id}.prof")
+
+            out = io.StringIO()
+            stats = pstats.Stats(self._profiles[slowest], stream=out)
+            stats.dump_stats(stats_file)
+            stats.sort_stats('cumulative').print_stats(top)
+            print(f"\n🔍 가장 느린 단계: {slowest} (cProfile → {stats_file})")
+            print(out.getvalue())
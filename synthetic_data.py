@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+KB(국토교통부) 실거래 형식의 합성 데이터 생성기
+
+단지별 속성(위치, 건축년도, 최고층, 평형 구성, ㎡당 가격)을 먼저 뽑고,
+거래는 단지 인기도(로그정규)에 비례해 배정합니다. 가격은
+㎡당 가격 × 면적 × 월별 추세 × 층 프리미엄 × 잡음입니다.
+
+사용법:
+    python synthetic_data.py --rows 100000 --output output/bench/data/synthetic_100000.xlsx
+    python synthetic_data.py --rows 10000000 --output output/bench/data/synthetic_10000000.parquet
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+# 구별 동 목록과 ㎡당 기준 가격 (만원)
+DISTRICTS = {
+    '강남구': (['역삼동', '대치동', '개포동', '도곡동', '압구정동'], 2400),
+    '서초구': (['서초동', '반포동', '잠원동', '방배동'], 2300),
+    '송파구': (['잠실동', '가락동', '문정동', '신천동'], 1900),
+    '광진구': (['자양동', '구의동', '광장동', '화양동', '중곡동', '군자동', '능동'], 1450),
+    '성동구': (['성수동1가', '옥수동', '금호동2가', '행당동'], 1600),
+    '마포구': (['아현동', '공덕동', '상암동', '합정동'], 1500),
+    '노원구': (['상계동', '중계동', '하계동', '월계동'], 850),
+    '강서구': (['화곡동', '가양동', '등촌동', '마곡동'], 1000),
+}
+
+UNIT_TYPES = np.array([39.6, 49.9, 59.9, 74.9, 84.9, 101.9, 114.9, 134.9, 164.9])
+UNIT_WEIGHTS = np.array([0.04, 0.06, 0.28, 0.1, 0.32, 0.07, 0.07, 0.04, 0.02])
+
+PREAMBLE = [
+    '□ 본 서비스에서 제공하는 정보는 법적인 효력이 없으므로 참고용으로만 활용하시기 바랍니다.',
+    '□ 신고정보가 실시간 변경, 해제되어 제공시점에 따라 공개건수 및 내용이 상이할 수 있습니다.',
+    '□ 본 자료는 계약일 기준입니다.',
+    '□ 통계자료 활용시에는 수치가 왜곡될 수 있으니 참고자료로만 활용하시기 바랍니다.',
+    None,
+    '* 합성 데이터 (synthetic_data.py)',
+    None,
+    '□ 검색조건',
+    None, None, None, None,
+]
+
+
+def month_range(start: str, months: int) -> np.ndarray:
+    """YYYYMM 시작 월부터 months개월"""
+    year, month = int(start[:4]), int(start[4:])
+    idx = np.arange(months) + (month - 1)
+    return (year + idx // 12) * 100 + idx % 12 + 1
+
+
+def generate_transactions(rows: int, complexes: int = None, start: str = '202412',
+                          months: int = 12, seed: int = 0) -> pd.DataFrame:
+    """KB 실거래 컬럼 구성의 합성 거래 데이터"""
+    rng = np.random.default_rng(seed)
+    complexes = complexes or int(np.clip(rows // 12, 20, 20000))
+
+    # 단지 속성
+    locations = [(gu, dong, base) for gu, (dongs, base) in DISTRICTS.items() for dong in dongs]
+    loc = rng.integers(len(locations), size=complexes)
+    build_year = np.clip(rng.normal(2001, 11, complexes).round(), 1970, 2025).astype(int)
+    max_floor = np.clip(rng.gamma(4, 5, complexes).round(), 5, 60).astype(int)
+    base = np.array([locations[i][2] for i in loc], dtype=float)
+    age_discount = 1 - 0.006 * np.clip(2025 - build_year, 0, 40) + 0.2 * (build_year < 1990)
+    price_per_sqm = base * age_discount * rng.lognormal(0, 0.15, complexes)
+    popularity = rng.lognormal(0, 1.1, complexes)
+    bunji_main = rng.integers(1, 900, complexes)
+    bunji_sub = np.where(rng.random(complexes) < 0.7, 0, rng.integers(1, 60, complexes))
+
+    # 거래 → 단지
+    c = rng.choice(complexes, size=rows, p=popularity / popularity.sum())
+    area = (rng.choice(UNIT_TYPES, size=rows, p=UNIT_WEIGHTS) + rng.normal(0, 0.05, rows)).round(4)
+    floor = 1 + (rng.random(rows) * max_floor[c]).astype(int)
+
+    # 봄/가을 성수기 가중치와 월 1% 추세
+    month_list = month_range(start, months)
+    season = 1 + 0.35 * np.cos((month_list % 100 - 5) / 12 * 2 * np.pi) ** 2
+    m = rng.choice(months, size=rows, p=season / season.sum())
+    trend = np.exp(0.01 * m + rng.normal(0, 0.01, months)[m])
+
+    floor_premium = 1 + 0.004 * np.minimum(floor, 30) - 0.06 * (floor <= 2)
+    price = price_per_sqm[c] * area * trend * floor_premium * rng.lognormal(0, 0.06, rows)
+    price = (np.round(price / 100) * 100).astype(np.int64)
+
+    gu = np.array([locations[i][0] for i in loc])
+    dong = np.array([locations[i][1] for i in loc])
+    brands = ['래미안', '자이', '푸르지오', '힐스테이트', '현대', '삼성', '롯데캐슬']
+    names = np.array([f'{dong[i][:-1]}{brands[i % 7]}{i // 7 + 1}' for i in range(complexes)])
+    bunji = np.where(bunji_sub > 0,
+                     pd.Series(bunji_main).astype(str) + '-' + pd.Series(bunji_sub).astype(str),
+                     pd.Series(bunji_main).astype(str))
+
+    return pd.DataFrame({
+        'NO': np.arange(1, rows + 1),
+        '시군구': np.array([f'서울특별시 {g} {d}' for g, d, _ in locations])[loc][c],
+        '번지': bunji[c],
+        '본번': bunji_main[c],
+        '부번': bunji_sub[c],
+        '단지명': names[c],
+        '전용면적(㎡)': area,
+        '계약년월': month_list[m],
+        '계약일': rng.integers(1, 29, rows),
+        '거래금액(만원)': pd.Series(price).map('{:,}'.format).to_numpy(),
+        '동': '-',
+        '층': floor,
+        '매수자': '개인',
+        '매도자': '개인',
+        '건축년도': build_year[c],
+        '도로명': (pd.Series(gu[c]) + '로 ' + pd.Series(bunji_main[c] % 120 + 1).astype(str)).to_numpy(),
+        '해제사유발생일': '-',
+        '거래유형': np.where(rng.random(rows) < 0.9, '중개거래', '직거래'),
+        '중개사소재지': '서울 ' + pd.Series(gu[c]),
+        '등기일자': '-',
+        '주택유형': '아파트',
+    })
+
+
+def write_dataset(df: pd.DataFrame, path: str) -> str:
+    """확장자에 맞게 저장 (.xlsx는 KB 파일처럼 12행 안내문 뒤에 헤더)"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    suffix = os.path.splitext(path)[1].lower()
+
+    if suffix == '.xlsx':
+        if len(df) > 1_048_000:
+            raise ValueError("xlsx는 약 100만 행까지만 저장할 수 있습니다. .parquet 또는 .csv를 사용하세요.")
+        with pd.ExcelWriter(path, engine='openpyxl') as writer:
+            pd.DataFrame({'': PREAMBLE}).to_excel(writer, index=False, header=False)
+            df.to_excel(writer, index=False, startrow=len(PREAMBLE))
+    elif suffix == '.parquet':
+        df.to_parquet(path, index=False)
+    elif suffix == '.csv':
+        df.to_csv(path, index=False)
+    else:
+        raise ValueError(f"지원하지 않는 형식: {suffix}")
+
+    return path
+
+
+def columnar_suffix() -> str:
+    """대용량 데이터 형식 (pyarrow가 있으면 parquet, 없으면 csv)"""
+    try:
+        import pyarrow  # noqa: F401
+        return '.parquet'
+    except ImportError:
+        return '.csv'
+
+
+def ensure_dataset(rows: int, data_dir: str = 'output/bench/data', suffix: str = None, seed: int = 0) -> str:
+    """합성 데이터 파일 경로 (없으면 생성, xlsx는 10만 행 이하만 기본값)"""
+    suffix = suffix or ('.xlsx' if rows <= 100_000 else columnar_suffix())
+    path = os.path.join(data_dir, f'synthetic_{rows}_s{seed}{suffix}')
+    if not os.path.exists(path):
+        write_dataset(generate_transactions(rows, seed=seed), path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='KB 형식 합성 실거래 데이터 생성')
+    parser.add_argument('--rows', type=int, default=100000, help='거래 건수')
+    parser.add_argument('--complexes', type=int, default=None, help='단지 수 (기본: 행 수 / 12)')
+    parser.add_argument('--start', default='202412', help='시작 월 (YYYYMM)')
+    parser.add_argument('--months', type=int, default=12, help='기간 (개월)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None, help='.xlsx, .parquet, .csv')
+    args = parser.parse_args()
+
+    output = args.output or os.path.join(
+        'output/bench/data',
+        f"synthetic_{args.rows}_s{args.seed}{'.xlsx' if args.rows <= 100_000 else columnar_suffix()}"
+    )
+    df = generate_transactions(args.rows, args.complexes, args.start, args.months, args.seed)
+    write_dataset(df, output)
+    print(f"✓ {len(df):,}건 ({df['단지명'].nunique():,}개 단지) → {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+썸네일 제목 줄바꿈 / 글자 크기 자동 조정
+
+단어 폭은 폰트별로 한 번만 재서 캐시하고, 줄바꿈은 누적 폭(prefix sum)에서
+이진 탐색으로 각 줄의 끝을 찾습니다. 글자 크기는 상자에 들어가는 가장 큰 크기를
+이진 탐색으로 고릅니다. 일본어/중국어처럼 띄어쓰기가 없는 글자는 한 글자씩 끊습니다.
+"""
+import re
+from bisect import bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, List, Tuple
+
+# 한 글자씩 끊을 수 있는 문자 (히라가나, 가타카나, CJK 한자, 전각 문자)
+CJK = '\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uff00-\uffef'
+# 줄 맨 앞에 오면 안 되는 문자 (앞 글자에 붙임)
+NO_BREAK_BEFORE = '、。，．・ー！？!?,.)）」』】'
+
+TOKEN = re.compile(rf'[{CJK}][{re.escape(NO_BREAK_BEFORE)}]*|[^\s{CJK}]+')
+
+
+@lru_cache(maxsize=8192)
+def text_width(font, text: str) -> float:
+    """글자열 폭 (폰트, 글자열별 캐시)
+
+    폰트는 thumbnail_generator.load_font가 캐시한 같은 객체를 쓰므로 객체 자체를 키로 씁니다.
+    """
+    return font.getlength(text)
+
+
+def tokenize(text: str) -> List[Tuple[str, str]]:
+    """(토큰, 앞 구분자) 목록 — 띄어쓰기 뒤의 토큰은 ' ', 붙어 있는 토큰은 ''"""
+    tokens = []
+    end = 0
+    for m in TOKEN.finditer(text):
+        glue = ' ' if tokens and m.start() > end else ''
+        tokens.append((m.group(), glue))
+        end = m.end()
+    return tokens
+
+
+@dataclass
+class TextLayout:
+    """줄바꿈 결과"""
+    lines: List[str]
+    widths: List[float]
+    font: object
+    size: int
+    line_height: int
+
+    @property
+    def height(self) -> int:
+        return self.line_height * len(self.lines)
+
+    @property
+    def width(self) -> float:
+        return max(self.widths, default=0.0)
+
+
+def break_lines(tokens: List[Tuple[str, str]], font, max_width: float) -> Tuple[List[str], List[float]]:
+    """탐욕적 줄바꿈 (누적 폭 + 이진 탐색, 줄마다 O(log n))
+
+    A[k] = 토큰 0..k-1의 폭과 앞 구분자 폭의 합이면, 토큰 i..j-1로 이루어진 줄의 폭은
+    A[j] - A[i] - glue[i] 입니다 (줄 첫 토큰 앞 구분자는 그리지 않음).
+    한 토큰이 max_width보다 넓으면 그 토큰만 한 줄에 둡니다.
+    """
+    if not tokens:
+        return [], []
+
+    glue = [text_width(font, g) if g else 0.0 for _, g in tokens]
+    acc = [0.0]
+    for (token, _), g in zip(tokens, glue):
+        acc.append(acc[-1] + g + text_width(font, token))
+
+    lines, widths = [], []
+    i, n = 0, len(tokens)
+    while i < n:
+        limit = max_width + acc[i] + glue[i]
+        j = max(i + 1, bisect_right(acc, limit, lo=i + 1) - 1)
+        lines.append(tokens[i][0] + ''.join(g + t for t, g in tokens[i + 1:j]))
+        widths.append(acc[j] - acc[i] - glue[i])
+        i = j
+    return lines, widths
+
+
+def split_chars(tokens: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """토큰을 글자 단위로 쪼갬 (가장 작은 크기에서도 넘치는 긴 단어용)"""
+    chars = []
+    for token, glue in tokens:
+        chars.append((token[0], glue))
+        chars.extend((c, '') for c in token[1:])
+    return chars
+
+
+def layout_text(text: str, font, max_width: float, line_height: int, size: int = 0) -> TextLayout:
+    """고정 크기 폰트로 줄바꿈"""
+    lines, widths = break_lines(tokenize(text), font, max_width)
+    return TextLayout(lines, widths, font, size, line_height)
+
+
+def fit_text(
+    text: str,
+    font_for: Callable[[int], object],
+    max_width: float,
+    max_height: float,
+    max_size: int,
+    min_size: int = 24,
+    line_spacing: float = 1.2
+) -> TextLayout:
+    """상자(max_width × max_height)에 들어가는 가장 큰 글자 크기로 줄바꿈
+
+    크기가 작을수록 줄 수와 높이가 줄어드는 단조성을 이용해 이진 탐색합니다
+    (폰트 로드와 줄바꿈은 O(log(max_size - min_size))번).
+    min_size에서도 안 들어가면 넘치는 단어를 글자 단위로 끊습니다.
+    """
+    tokens = tokenize(text)
+
+    def attempt(size: int, parts) -> TextLayout:
+        font = font_for(size)
+        lines, widths = break_lines(parts, font, max_width)
+        return TextLayout(lines, widths, font, size, round(size * line_spacing))
+
+    def fits(layout: TextLayout) -> bool:
+        return layout.height <= max_height and layout.width <= max_width
+
+    best = None
+    lo, hi = min_size, max_size
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        layout = attempt(mid, tokens)
+        if fits(layout):
+            best, lo = layout, mid + 1
+        else:
+            hi = mid - 1
+
+    if best is None:
+        best = attempt(min_size, split_chars(tokens))
+    return best
+
+
+def clear_cache():
+    text_width.cache_clear()
@@ -1,16 +1,160 @@
 """
 바이럴 썸네일 자동 생성 (Pillow 사용)
+
+폰트와 스타일별 배경은 프로세스 안에서 한 번만 만들어 재사용하므로,
+썸네일마다 하는 일은 배경 복사와 텍스트 그리기뿐입니다.
+제목 줄바꿈과 글자 크기 조정은 text_layout (단어 폭 캐시)을 사용합니다.
+저장 형식은 image_profiles 프로필 (png 기본, jpeg/webp는 용량이 훨씬 작음)로 정합니다.
 """
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+import numpy as np
 import os
-from typing import Tuple, List
+import time
+from typing import Optional, Sequence, Tuple, List
+
+import text_layout
+from image_profiles import DEFAULT_PROFILE, save_image
+from parallel_render import default_workers
+from text_layout import fit_text
+
+TITLE_FONT = "/System/Library/Fonts/Supplemental/Arial Bold.ttf"
+BODY_FONT = "/System/Library/Fonts/Supplemental/Arial.ttf"
+EMOJI_FONT = "/System/Library/Fonts/Apple Color Emoji.ttc"
+
+# 스타일별 (배경색, 글자색, 이모지)
+STYLES = {
+    "shocking": ((220, 20, 60), (255, 255, 255), "🔥"),   # 빨강
+    "warning": ((255, 140, 0), (0, 0, 0), "⚠️"),          # 주황
+    "secret": ((50, 50, 50), (255, 215, 0), "💰"),        # 검정
+}
+DEFAULT_STYLE = ((30, 30, 30), (255, 255, 255), "📊")
+
+
+@lru_cache(maxsize=128)
+def load_font(path: str, size: int) -> Optional[ImageFont.FreeTypeFont]:
+    """TrueType 폰트 (경로, 크기별 캐시, 없으면 None)"""
+    try:
+        return ImageFont.truetype(path, size)
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=1)
+def default_font() -> ImageFont.ImageFont:
+    return ImageFont.load_default()
+
+
+def load_fonts(*specs: Tuple[str, int]) -> tuple:
+    """(경로, 크기) 목록 → 폰트 튜플 (하나라도 없으면 전부 기본 폰트)"""
+    fonts = tuple(load_font(path, size) for path, size in specs)
+    if any(font is None for font in fonts):
+        return tuple(default_font() for _ in specs)
+    return fonts
+
+
+@lru_cache(maxsize=16)
+def gradient_background(color: Tuple[int, int, int], width: int, height: int,
+                        strength: float = 0.3) -> Image.Image:
+    """위에서 아래로 어두워지는 세로 그라데이션 (행별 색을 NumPy로 한 번에 계산)
+
+    반환값은 캐시된 이미지이므로 수정하기 전에 copy()할 것.
+    """
+    darkness = (255 * (np.arange(height) / height) * strength).astype(np.int64)
+    rows = np.clip(np.array(color, dtype=np.int64)[None, :] - darkness[:, None], 0, 255)
+    pixels = np.broadcast_to(rows.astype(np.uint8)[:, None, :], (height, width, 3))
+    return Image.fromarray(np.ascontiguousarray(pixels), 'RGB')
+
+
+@lru_cache(maxsize=16)
+def solid_background(color: Tuple[int, int, int], width: int, height: int) -> Image.Image:
+    """단색 배경 (캐시, 수정하기 전에 copy())"""
+    return Image.new('RGB', (width, height), color)
+
+
+COMPARISON_BACKGROUND = (20, 20, 50)
+VIRAL_FONTS = ((TITLE_FONT, 100), (BODY_FONT, 60), (EMOJI_FONT, 150))
+COMPARISON_FONTS = ((TITLE_FONT, 120), (TITLE_FONT, 80), (BODY_FONT, 60))
+
+# 제목 상자 (위쪽 y, 높이) — 아래에 부제목 자리를 남김
+TITLE_TOP = 600
+TITLE_BOX_HEIGHT = 900
+TITLE_MIN_SIZE = 48
+
+
+def clear_caches():
+    """폰트/배경 캐시 비우기"""
+    load_font.cache_clear()
+    default_font.cache_clear()
+    gradient_background.cache_clear()
+    solid_background.cache_clear()
+    text_layout.clear_cache()
+
+
+def warm_caches(width: int = 1080, height: int = 1920):
+    """모든 스타일의 폰트와 배경을 미리 로드"""
+    load_fonts(*VIRAL_FONTS)
+    load_fonts(*COMPARISON_FONTS)
+    for bg_color, _, _ in list(STYLES.values()) + [DEFAULT_STYLE]:
+        gradient_background(bg_color, width, height)
+    solid_background(COMPARISON_BACKGROUND, width, height)
+
+
+@dataclass
+class ThumbnailSpec:
+    """배치 렌더링할 썸네일 하나
+
+    kind='viral'은 title/subtitle/style, kind='comparison'은
+    kr_price/global_price/city/diff_pct를 사용합니다.
+    """
+    output_file: str
+    kind: str = 'viral'
+    title: str = ''
+    subtitle: str = ''
+    style: str = 'shocking'
+    kr_price: str = ''
+    global_price: str = ''
+    city: str = ''
+    diff_pct: float = 0.0
+
+
+@dataclass
+class ThumbnailResult:
+    """렌더링 결과 (실패하면 output_file=None, error에 사유)"""
+    output_file: Optional[str]
+    render_s: float
+    save_s: float
+    error: str = ''
+    bytes: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.output_file is not None
+
+
+# 프로세스 풀 작업자별 생성기 (초기화 시 캐시 예열)
+_worker_generator = None
+
+
+def _init_worker(output_dir: str, width: int, height: int, profile: str):
+    global _worker_generator
+    _worker_generator = ThumbnailGenerator(output_dir, profile)
+    _worker_generator.width, _worker_generator.height = width, height
+    warm_caches(width, height)
+
+
+def _render_spec(spec: ThumbnailSpec) -> ThumbnailResult:
+    return _worker_generator.render_spec(spec)
 
 
 class ThumbnailGenerator:
     """유튜브 쇼츠용 썸네일 생성"""
 
-    def __init__(self, output_dir='output'):
+    def __init__(self, output_dir='output', profile: str = DEFAULT_PROFILE):
         self.output_dir = output_dir
+        self.profile = profile
         os.makedirs(output_dir, exist_ok=True)
 
         # 쇼츠 썸네일 사이즈 (세로형)
@@ -29,44 +173,23 @@ class ThumbnailGenerator:
         if output_file is None:
             output_file = f'{self.output_dir}/thumbnail_{style}.png'
 
-        # 배경 생성
-        if style == "shocking":
-            bg_color = (220, 20, 60)  # 빨강
-            text_color = (255, 255, 255)
-            emoji = "🔥"
-        elif style == "warning":
-            bg_color = (255, 140, 0)  # 주황
-            text_color = (0, 0, 0)
-            emoji = "⚠️"
-        elif style == "secret":
-            bg_color = (50, 50, 50)  # 검정
-            text_color = (255, 215, 0)
-            emoji = "💰"
-        else:
-            bg_color = (30, 30, 30)
-            text_color = (255, 255, 255)
-            emoji = "📊"
+        img = self.render_viral_thumbnail(title, subtitle, style)
 
-        # 이미지 생성
-        img = Image.new('RGB', (self.width, self.height), bg_color)
-        draw = ImageDraw.Draw(img)
+        # 저장 (프로필에 따라 확장자가 바뀔 수 있음)
+        encoded = save_image(img, output_file, self.profile)
+        print(f"썸네일 생성 완료: {encoded.path} ({encoded.bytes / 1024:.0f} KB)")
+        return encoded.path
 
-        # 그라데이션 효과 (간단한 어둡기 효과)
-        for y in range(self.height):
-            darkness = int(255 * (y / self.height) * 0.3)
-            color = tuple(max(0, c - darkness) for c in bg_color)
-            draw.line([(0, y), (self.width, y)], fill=color)
+    def render_viral_thumbnail(self, title: str, subtitle: str = "", style: str = "shocking") -> Image.Image:
+        """바이럴 썸네일 이미지 (저장 없음)"""
+        bg_color, text_color, emoji = STYLES.get(style, DEFAULT_STYLE)
 
-        # 폰트 설정 (시스템 기본 폰트 사용)
-        try:
-            # macOS 기본 폰트
-            title_font = ImageFont.truetype("/System/Library/Fonts/Supplemental/Arial Bold.ttf", 100)
-            subtitle_font = ImageFont.truetype("/System/Library/Fonts/Supplemental/Arial.ttf", 60)
-            emoji_font = ImageFont.truetype("/System/Library/Fonts/Apple Color Emoji.ttc", 150)
-        except:
-            title_font = ImageFont.load_default()
-            subtitle_font = ImageFont.load_default()
-            emoji_font = ImageFont.load_default()
+        # 그라데이션 배경 (스타일별 캐시)
+        img = gradient_background(bg_color, self.width, self.height).copy()
+        draw = ImageDraw.Draw(img)
+
+        # 폰트 설정 (macOS 기본 폰트, 없으면 기본 폰트)
+        title_font, subtitle_font, emoji_font = load_fonts(*VIRAL_FONTS)
 
         # 이모지 추가 (상단)
         emoji_bbox = draw.textbbox((0, 0), emoji, font=emoji_font)
@@ -74,35 +197,26 @@ class ThumbnailGenerator:
         emoji_x = (self.width - emoji_width) // 2
         draw.text((emoji_x, 200), emoji, fill=text_color, font=emoji_font)
 
-        # 제목 텍스트 (중앙, 여러 줄)
-        title_words = title.split()
-        lines = []
-        current_line = ""
-
-        for word in title_words:
-            test_line = current_line + word + " "
-            bbox = draw.textbbox((0, 0), test_line, font=title_font)
-            if bbox[2] - bbox[0] < self.width - 100:
-                current_line = test_line
-            else:
-                if current_line:
-                    lines.append(current_line.strip())
-                current_line = word + " "
-        if current_line:
-            lines.append(current_line.strip())
+        # 제목 텍스트 (중앙, 여러 줄, 상자에 맞게 글자 크기 자동 축소)
+        layout = fit_text(
+            title,
+            self._title_font_for(title_font),
+            max_width=self.width - 100,
+            max_height=TITLE_BOX_HEIGHT,
+            max_size=VIRAL_FONTS[0][1],
+            min_size=TITLE_MIN_SIZE
+        )
 
         # 텍스트 그리기 (그림자 효과)
-        y_offset = 600
-        for line in lines:
-            bbox = draw.textbbox((0, 0), line, font=title_font)
-            text_width = bbox[2] - bbox[0]
-            text_x = (self.width - text_width) // 2
+        y_offset = TITLE_TOP
+        for line, line_width in zip(layout.lines, layout.widths):
+            text_x = int(self.width - line_width) // 2
 
             # 그림자
-            draw.text((text_x + 5, y_offset + 5), line, fill=(0, 0, 0), font=title_font)
+            draw.text((text_x + 5, y_offset + 5), line, fill=(0, 0, 0), font=layout.font)
             # 실제 텍스트
-            draw.text((text_x, y_offset), line, fill=text_color, font=title_font)
-            y_offset += 120
+            draw.text((text_x, y_offset), line, fill=text_color, font=layout.font)
+            y_offset += layout.line_height
 
         # 부제목
         if subtitle:
@@ -121,33 +235,85 @@ class ThumbnailGenerator:
 
             draw.text((subtitle_x, subtitle_y), subtitle, fill=(255, 255, 0), font=subtitle_font)
 
-        # 저장
-        img.save(output_file, quality=95)
-        print(f"썸네일 생성 완료: {output_file}")
-        return output_file
+        return img
 
-    def create_ab_test_thumbnails(self, title: str, base_name: str = "thumbnail") -> List[str]:
-        """A/B 테스트용 여러 스타일 썸네일 생성"""
-        thumbnails = []
+    @staticmethod
+    def _title_font_for(title_font):
+        """글자 크기 → 제목 폰트 (기본 폰트로 대체된 경우 크기 고정)"""
+        if title_font is default_font():
+            return lambda size: title_font
+        return lambda size: load_font(TITLE_FONT, size) or title_font
 
+    def create_ab_test_thumbnails(self, title: str, base_name: str = "thumbnail") -> List[str]:
+        """A/B 테스트용 여러 스타일 썸네일 생성 (배치 렌더링)"""
         styles = [
             ("shocking", "🔥 SHOCKING!", "shocking"),
             ("warning", "⚠️ WARNING!", "warning"),
             ("secret", "💰 SECRET!", "secret"),
         ]
 
-        for i, (style_name, prefix, style) in enumerate(styles, 1):
-            output_file = f'{self.output_dir}/{base_name}_{style_name}.png'
-            full_title = f"{prefix} {title}"
-            self.create_viral_thumbnail(
-                full_title,
+        specs = [
+            ThumbnailSpec(
+                output_file=f'{self.output_dir}/{base_name}_{style_name}.png',
+                title=f"{prefix} {title}",
                 subtitle="Check NOW!",
-                style=style,
-                output_file=output_file
+                style=style
             )
-            thumbnails.append(output_file)
+            for style_name, prefix, style in styles
+        ]
+        return [result.output_file for result in self.render_batch(specs)]
 
-        return thumbnails
+    def render_spec(self, spec: ThumbnailSpec) -> ThumbnailResult:
+        """썸네일 하나 렌더링 + 저장 (시간 측정)"""
+        start = time.perf_counter()
+        try:
+            if spec.kind == 'comparison':
+                img = self.render_comparison_thumbnail(spec.kr_price, spec.global_price,
+                                                       spec.city, spec.diff_pct)
+            elif spec.kind == 'viral':
+                img = self.render_viral_thumbnail(spec.title, spec.subtitle, spec.style)
+            else:
+                raise ValueError(f"알 수 없는 썸네일 종류: {spec.kind}")
+            rendered = time.perf_counter()
+
+            os.makedirs(os.path.dirname(spec.output_file) or '.', exist_ok=True)
+            encoded = save_image(img, spec.output_file, self.profile)
+            return ThumbnailResult(encoded.path, rendered - start, encoded.seconds, bytes=encoded.bytes)
+        except Exception as e:
+            return ThumbnailResult(None, time.perf_counter() - start, 0.0, str(e))
+
+    def render_batch(self, specs: Sequence[ThumbnailSpec], workers: Optional[int] = None) -> List[ThumbnailResult]:
+        """썸네일 여러 장을 프로세스 풀에서 렌더링 (결과는 입력 순서)
+
+        작업자마다 시작할 때 폰트와 모든 스타일 배경을 한 번 로드합니다.
+        workers가 1이거나 코어가 하나면 현재 프로세스에서 렌더링합니다.
+        """
+        if not specs:
+            return []
+
+        workers = min(workers or default_workers(), len(specs))
+        start = time.perf_counter()
+
+        if workers <= 1:
+            warm_caches(self.width, self.height)
+            results = [self.render_spec(spec) for spec in specs]
+        else:
+            chunksize = max(1, len(specs) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(self.output_dir, self.width, self.height, self.profile)) as pool:
+                results = list(pool.map(_render_spec, specs, chunksize=chunksize))
+
+        elapsed = time.perf_counter() - start
+        failed = [r for r in results if not r.ok]
+        done = len(results) - len(failed)
+        print(f"썸네일 {done}/{len(results)}장 생성 완료 "
+              f"({elapsed:.2f}초, {len(results) / elapsed:.1f}장/초, 작업자 {workers})")
+        if done:
+            print(f"  저장 ({self.profile}): 평균 {sum(r.bytes for r in results) / done / 1024:.0f} KB/장, "
+                  f"{sum(r.save_s for r in results) * 1000 / done:.1f} ms/장")
+        for r in failed:
+            print(f"✗ 썸네일 실패: {r.error}")
+        return results
 
     def create_comparison_thumbnail(
         self,
@@ -162,18 +328,26 @@ class ThumbnailGenerator:
         if output_file is None:
             output_file = f'{self.output_dir}/comparison_thumbnail.png'
 
+        img = self.render_comparison_thumbnail(kr_price, global_price, city, diff_pct)
+
+        encoded = save_image(img, output_file, self.profile)
+        print(f"비교 썸네일 생성 완료: {encoded.path} ({encoded.bytes / 1024:.0f} KB)")
+        return encoded.path
+
+    def render_comparison_thumbnail(
+        self,
+        kr_price: str,
+        global_price: str,
+        city: str,
+        diff_pct: float
+    ) -> Image.Image:
+        """가격 비교 썸네일 이미지 (저장 없음)"""
+
         # 배경
-        img = Image.new('RGB', (self.width, self.height), (20, 20, 50))
+        img = solid_background(COMPARISON_BACKGROUND, self.width, self.height).copy()
         draw = ImageDraw.Draw(img)
 
-        try:
-            large_font = ImageFont.truetype("/System/Library/Fonts/Supplemental/Arial Bold.ttf", 120)
-            medium_font = ImageFont.truetype("/System/Library/Fonts/Supplemental/Arial Bold.ttf", 80)
-            small_font = ImageFont.truetype("/System/Library/Fonts/Supplemental/Arial.ttf", 60)
-        except:
-            large_font = ImageFont.load_default()
-            medium_font = ImageFont.load_default()
-            small_font = ImageFont.load_default()
+        large_font, medium_font, small_font = load_fonts(*COMPARISON_FONTS)
 
         # 제목
         title = "VS"
@@ -224,9 +398,7 @@ class ThumbnailGenerator:
         )
         draw.text(((self.width - diff_width) // 2, 1470), diff_text, fill=(0, 0, 0), font=medium_font)
 
-        img.save(output_file, quality=95)
-        print(f"비교 썸네일 생성 완료: {output_file}")
-        return output_file
+        return img
 
 
 if __name__ == "__main__":
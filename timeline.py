@@ -0,0 +1,207 @@
+"""
+선언적 영상 타임라인 → 단일 ffmpeg 명령
+
+구간, 페이드, 오버레이, 오디오 트랙을 선언해 두면 filter_complex 하나로 컴파일해
+ffmpeg를 한 번만 실행합니다. 형식이 같은 미리 렌더링된 구간만 이어 붙일 때는
+concat demuxer로 다시 인코딩하지 않고 스트림을 복사합니다.
+"""
+import os
+import re
+import subprocess
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+IMAGE_SUFFIXES = ('.png', '.jpg', '.jpeg', '.webp', '.bmp')
+
+
+@dataclass
+class Overlay:
+    """세그먼트 위에 얹는 RGBA 이미지 (x, y는 ffmpeg 식, t = 세그먼트 내 시간)"""
+    image: str
+    x: str = '0'
+    y: str = '0'
+    start: float = 0.0
+    end: Optional[float] = None
+
+
+@dataclass
+class Segment:
+    """타임라인 구간 (영상 파일 또는 정지 이미지)"""
+    source: str
+    duration: Optional[float] = None
+    fade_in: float = 0.0
+    fade_out: float = 0.0
+    overlays: List[Overlay] = field(default_factory=list)
+
+    @property
+    def is_image(self) -> bool:
+        return self.source.lower().endswith(IMAGE_SUFFIXES)
+
+    @property
+    def is_plain(self) -> bool:
+        """효과 없는 영상 파일 (스트림 복사 후보)"""
+        return not (self.is_image or self.fade_in or self.fade_out or self.overlays)
+
+
+@dataclass
+class AudioTrack:
+    """타임라인 시작 기준 start초에 배치되는 오디오"""
+    source: str
+    start: float = 0.0
+    volume: float = 1.0
+
+
+def probe_video(path: str) -> dict:
+    """ffmpeg -i 출력에서 영상 스트림 정보 추출 (코덱, 픽셀 포맷, 해상도, 길이)"""
+    result = subprocess.run(['ffmpeg', '-hide_banner', '-i', path], capture_output=True, text=True)
+    info = {}
+
+    match = re.search(r'Duration: (\d+):(\d+):([\d.]+)', result.stderr)
+    if match:
+        h, m, s = match.groups()
+        info['duration'] = int(h) * 3600 + int(m) * 60 + float(s)
+
+    match = re.search(r'Video: (\w+)[^,]*, (\w+)[^,]*(?:\([^)]*\))?[^,]*, (\d+)x(\d+)', result.stderr)
+    if match:
+        info['codec'], info['pix_fmt'] = match.group(1), match.group(2)
+        info['size'] = (int(match.group(3)), int(match.group(4)))
+
+    return info
+
+
+@dataclass
+class Timeline:
+    """구간을 순서대로 이어 붙이고 오디오를 깔아 주는 타임라인"""
+    segments: List[Segment] = field(default_factory=list)
+    audio: List[AudioTrack] = field(default_factory=list)
+    width: int = 1080
+    height: int = 1920
+    fps: int = 30
+    video_args: List[str] = field(default_factory=lambda: [
+        '-c:v', 'libx264', '-preset', 'medium', '-b:v', '3000k', '-pix_fmt', 'yuv420p'
+    ])
+
+    def segment_durations(self) -> List[float]:
+        durations = []
+        for segment in self.segments:
+            duration = segment.duration
+            if duration is None:
+                duration = probe_video(segment.source).get('duration')
+            if duration is None:
+                raise ValueError(f"구간 길이를 알 수 없습니다: {segment.source}")
+            durations.append(duration)
+        return durations
+
+    def can_stream_copy(self) -> bool:
+        """모든 구간이 효과 없는 동일 규격(코덱, 픽셀 포맷, 해상도) 영상인지"""
+        if not self.segments or not all(s.is_plain and s.duration is None for s in self.segments):
+            return False
+        specs = {
+            (info.get('codec'), info.get('pix_fmt'), info.get('size'))
+            for info in (probe_video(s.source) for s in self.segments)
+        }
+        return len(specs) == 1 and (None not in next(iter(specs)))
+
+    def _audio_graph(self, first_input: int, total: float) -> Tuple[List[str], List[str]]:
+        """오디오 입력 인자와 필터 체인 ([aout]으로 끝남)"""
+        args, chains, labels = [], [], []
+        for k, track in enumerate(self.audio):
+            args += ['-i', track.source]
+            delay = int(round(track.start * 1000))
+            chains.append(f'[{first_input + k}:a]adelay={delay}|{delay},volume={track.volume}[a{k}]')
+            labels.append(f'[a{k}]')
+
+        if len(labels) == 1:
+            chains.append(f'{labels[0]}atrim=duration={total:.3f}[aout]')
+        else:
+            chains.append(f"{''.join(labels)}amix=inputs={len(labels)}:duration=longest,"
+                          f"atrim=duration={total:.3f}[aout]")
+        return args, chains
+
+    def compile(self, output_file: str) -> List[str]:
+        """전체 타임라인을 filter_complex 하나로 컴파일한 ffmpeg 명령"""
+        durations = self.segment_durations()
+        total = sum(durations)
+        W, H = self.width, self.height
+
+        args, chains, n_inputs = [], [], 0
+        for i, (segment, duration) in enumerate(zip(self.segments, durations)):
+            if segment.is_image:
+                args += ['-loop', '1', '-framerate', str(self.fps), '-t', f'{duration:.3f}']
+            args += ['-i', segment.source]
+            base = n_inputs
+            n_inputs += 1
+
+            chain = (f'[{base}:v]fps={self.fps},trim=duration={duration:.3f},setpts=PTS-STARTPTS,'
+                     f'scale={W}:{H}:force_original_aspect_ratio=decrease,'
+                     f'pad={W}:{H}:(ow-iw)/2:(oh-ih)/2:black,setsar=1,format=yuv420p')
+            label = f'[s{i}]'
+            chains.append(chain + label)
+
+            for j, overlay in enumerate(segment.overlays):
+                args += ['-loop', '1', '-framerate', str(self.fps), '-t', f'{duration:.3f}', '-i', overlay.image]
+                end = duration if overlay.end is None else overlay.end
+                out = f'[s{i}o{j}]'
+                chains.append(f"{label}[{n_inputs}:v]overlay=x='{overlay.x}':y='{overlay.y}':"
+                              f"enable='between(t,{overlay.start},{end})':eof_action=pass{out}")
+                label = out
+                n_inputs += 1
+
+            fades = []
+            if segment.fade_in:
+                fades.append(f'fade=t=in:st=0:d={segment.fade_in}')
+            if segment.fade_out:
+                fades.append(f'fade=t=out:st={duration - segment.fade_out:.3f}:d={segment.fade_out}')
+            if fades:
+                chains.append(f"{label}{','.join(fades)}[s{i}f]")
+                label = f'[s{i}f]'
+
+            chains[-1] = chains[-1][:-len(label)] + f'[v{i}]'
+
+        chains.append(f"{''.join(f'[v{i}]' for i in range(len(self.segments)))}"
+                      f"concat=n={len(self.segments)}:v=1:a=0[vout]")
+
+        maps = ['-map', '[vout]']
+        if self.audio:
+            audio_args, audio_chains = self._audio_graph(n_inputs, total)
+            args += audio_args
+            chains += audio_chains
+            maps += ['-map', '[aout]', '-c:a', 'aac']
+
+        return (['ffmpeg', '-y', '-loglevel', 'error'] + args +
+                ['-filter_complex', ';'.join(chains)] + maps + self.video_args +
+                ['-r', str(self.fps), '-t', f'{total:.3f}', output_file])
+
+    def compile_stream_copy(self, output_file: str) -> List[str]:
+        """concat demuxer로 영상은 복사하고 오디오만 인코딩하는 ffmpeg 명령"""
+        list_file = output_file + '.concat.txt'
+        with open(list_file, 'w') as f:
+            for segment in self.segments:
+                f.write(f"file '{os.path.abspath(segment.source)}'\n")
+
+        args = ['-f', 'concat', '-safe', '0', '-i', list_file]
+        maps = ['-map', '0:v']
+        if self.audio:
+            audio_args, audio_chains = self._audio_graph(1, sum(self.segment_durations()))
+            args += audio_args + ['-filter_complex', ';'.join(audio_chains)]
+            maps += ['-map', '[aout]', '-c:a', 'aac']
+
+        return ['ffmpeg', '-y', '-loglevel', 'error'] + args + maps + ['-c:v', 'copy', output_file]
+
+    def render(self, output_file: str) -> Optional[str]:
+        """ffmpeg 한 번으로 렌더링 (가능하면 스트림 복사)"""
+        copy = self.can_stream_copy()
+        cmd = self.compile_stream_copy(output_file) if copy else self.compile(output_file)
+
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True)
+        finally:
+            if copy:
+                os.remove(output_file + '.concat.txt')
+
+        if result.returncode != 0:
+            print(f"✗ 타임라인 렌더링 실패: {result.stderr}")
+            return None
+
+        print(f"✓ 타임라인 렌더링 완료: {output_file} ({'스트림 복사' if copy else '단일 filter_complex'})")
+        return output_file
@@ -0,0 +1,508 @@
+"""
+TTS 백엔드 (gTTS / pyttsx3 / Piper / stub)
+
+모든 백엔드는 같은 인터페이스를 가집니다:
+    backend.synthesize(script, lang, output_file) -> output_file   (실패하면 예외)
+    backend.synthesize_batch([(script, lang, output_file), ...]) -> [output_file | None, ...]
+
+세그먼트를 이어 붙일 때는 파일 대신 메모리 PCM으로 받습니다 (pcm_audio.PCMEncoder로 한 번에 인코딩):
+    backend.synthesize_pcm(script, lang, style=None) -> PCMAudio
+    backend.iter_pcm([(script, lang, style), ...]) -> PCMAudio, ... (입력 순서)
+
+백엔드 객체는 backend(script, lang, output_file)로도 호출할 수 있어 NarrationRunner에
+그대로 넘길 수 있습니다. 실행마다 --tts 이름으로 고릅니다 (get_backend).
+
+- gtts:    Google TTS (네트워크, MP3)
+- pyttsx3: OS 음성 엔진 (오프라인, 엔진 하나라 동시 실행 1, 세그먼트는 엔진 작업자 풀)
+- piper:   로컬 신경망 TTS (오프라인, `piper` 실행 파일 + 언어별 .onnx 음성 모델)
+- stub:    글자 수에 비례한 길이의 결정적 비프음 (오프라인, 테스트/벤치마크용)
+
+PCM(WAV)을 만드는 백엔드는 출력 확장자가 .wav가 아니면 ffmpeg로 한 번 변환합니다.
+"""
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Protocol, Sequence, Tuple
+
+from pcm_audio import ENCODE_OPTIONS, PCMAudio, decode_audio, encode_pcm, read_wav, write_wav
+
+# 프로세스 풀(multiprocessing)은 pyttsx3 세그먼트 합성에서만 로드
+# (--tts 선택지 때문에 CLI가 이 모듈을 먼저 import하므로 --help를 가볍게 유지)
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+Request = Tuple[str, str, str]   # (script, lang, output_file)
+Style = Tuple[int, float]        # (rate, volume)
+PCMRequest = Tuple[str, str, Optional[Style]]   # (script, lang, style)
+
+# 백엔드 공통 말하기 속도 (분당 단어 수) / 볼륨 (0.0-1.0)
+DEFAULT_RATE = 170
+DEFAULT_VOLUME = 0.9
+
+# 엔진이 파일로만 출력할 때 잠깐 쓰는 WAV 위치 (가능하면 메모리 파일시스템)
+SCRATCH_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+
+
+class TTSBackend(Protocol):
+    """TTS 백엔드 인터페이스"""
+    name: str
+    max_concurrent: int
+
+    def synthesize(self, script: str, lang: str, output_file: str) -> str: ...
+
+    def synthesize_batch(self, requests: Sequence[Request]) -> List[Optional[str]]: ...
+
+    def synthesize_pcm(self, script: str, lang: str, style: Optional[Style] = None) -> PCMAudio: ...
+
+    def iter_pcm(self, items: Iterable[PCMRequest]) -> Iterator[PCMAudio]: ...
+
+
+class BaseTTSBackend:
+    """공통 구현: 호출 = synthesize, 배치는 NarrationRunner로 동시 실행"""
+
+    name = 'base'
+    # 동시에 실행할 수 있는 요청 수 (엔진이 스레드 안전하지 않으면 1)
+    max_concurrent = 4
+
+    def __init__(self, rate: int = DEFAULT_RATE, volume: float = DEFAULT_VOLUME):
+        self.rate = rate
+        self.volume = volume
+
+    def __call__(self, script: str, lang: str, output_file: str) -> str:
+        return self.synthesize(script, lang, output_file)
+
+    def synthesize(self, script: str, lang: str, output_file: str) -> str:
+        raise NotImplementedError
+
+    def synthesize_batch(self, requests: Sequence[Request]) -> List[Optional[str]]:
+        from narration_runner import NarrationRunner
+
+        results = NarrationRunner(self, max_concurrent=self.max_concurrent).run_batch(requests)
+        return [result.output_file for result in results]
+
+    def synthesize_pcm(self, script: str, lang: str, style: Optional[Style] = None) -> PCMAudio:
+        """메모리 PCM으로 합성 (기본 구현: 임시 WAV로 합성해 읽은 뒤 지움)"""
+        with self._styled(style):
+            wav_file = _temp_wav()
+            try:
+                self.synthesize(script, lang, wav_file)
+                return decode_audio(wav_file)
+            finally:
+                _remove(wav_file)
+
+    def iter_pcm(self, items: Iterable[PCMRequest]) -> Iterator[PCMAudio]:
+        """(script, lang, style) 순서대로 PCM (인코더에 바로 흘려 보낼 수 있음)"""
+        for script, lang, style in items:
+            yield self.synthesize_pcm(script, lang, style)
+
+    def close(self):
+        """작업자/엔진 정리 (필요한 백엔드만)"""
+
+    def set_style(self, rate: int, volume: float):
+        """말하기 속도/볼륨 (지원하지 않는 백엔드는 무시)"""
+        self.rate = rate
+        self.volume = volume
+
+    @contextlib.contextmanager
+    def _styled(self, style: Optional[Style]):
+        """style이 있으면 잠시 바꿨다가 되돌림"""
+        if style is None:
+            yield
+            return
+        saved = (self.rate, self.volume)
+        self.set_style(*style)
+        try:
+            yield
+        finally:
+            self.set_style(*saved)
+
+    def __repr__(self):
+        return f'{type(self).__name__}(rate={self.rate}, volume={self.volume})'
+
+
+def target_suffix(path: str) -> str:
+    """출력 형식 확장자 (NarrationRunner 임시 파일 'x.mp3.0.part'도 '.mp3')"""
+    name = Path(path)
+    while name.suffix == '.part' or name.suffix[1:].isdigit():
+        name = name.with_suffix('')
+    return name.suffix.lower()
+
+
+def _remove(path: str):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def _finish_wav(wav_file: str, output_file: str) -> str:
+    """WAV를 출력 파일로 (출력이 .wav면 이동, 아니면 ffmpeg로 한 번 변환)"""
+    suffix = target_suffix(output_file)
+    if suffix == '.wav':
+        os.replace(wav_file, output_file)
+        return output_file
+
+    cmd = ['ffmpeg', '-y', '-loglevel', 'error', '-i', wav_file,
+           *ENCODE_OPTIONS.get(suffix, ENCODE_OPTIONS['.mp3']), output_file]
+    try:
+        proc = subprocess.run(cmd, capture_output=True, text=True)
+    finally:
+        _remove(wav_file)
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg 변환 실패: {proc.stderr.strip()}")
+    return output_file
+
+
+def _write_pcm(audio: PCMAudio, output_file: str) -> str:
+    """메모리 PCM을 출력 파일로 (.wav는 그대로, 아니면 ffmpeg stdin으로 인코딩)"""
+    suffix = target_suffix(output_file)
+    if suffix == '.wav':
+        return write_wav(audio, output_file)
+    return encode_pcm([audio], output_file, suffix)
+
+
+def _temp_wav(output_file: Optional[str] = None) -> str:
+    """출력 파일 옆 (없으면 SCRATCH_DIR)의 빈 임시 WAV 경로"""
+    directory = os.path.dirname(os.path.abspath(output_file)) if output_file else SCRATCH_DIR
+    fd, path = tempfile.mkstemp(suffix='.wav', dir=directory)
+    os.close(fd)
+    return path
+
+
+class GTTSBackend(BaseTTSBackend):
+    """Google TTS (네트워크, MP3를 바로 받음)"""
+
+    name = 'gtts'
+    max_concurrent = 4
+    LANGS = {'ko': 'ko', 'en': 'en', 'es': 'es', 'ja': 'ja'}
+    # gTTS MP3 샘플레이트
+    SAMPLE_RATE = 24000
+
+    def synthesize(self, script: str, lang: str, output_file: str) -> str:
+        from gtts import gTTS
+
+        gTTS(text=script, lang=self.LANGS.get(lang, lang), slow=False).save(output_file)
+        return output_file
+
+    def synthesize_pcm(self, script: str, lang: str, style: Optional[Style] = None) -> PCMAudio:
+        # MP3를 메모리로 받아 바로 디코딩 (gTTS는 속도/볼륨 설정이 없어 style 무시)
+        from gtts import gTTS
+
+        buffer = io.BytesIO()
+        gTTS(text=script, lang=self.LANGS.get(lang, lang), slow=False).write_to_fp(buffer)
+        return decode_audio(buffer.getvalue(), self.SAMPLE_RATE)
+
+
+class Pyttsx3Backend(BaseTTSBackend):
+    """OS 음성 엔진 (SAPI5 / NSSpeechSynthesizer / espeak)
+
+    엔진은 스레드 안전하지 않으므로 동시 실행 1, 배치는 save_to_file을 모두 예약한 뒤
+    runAndWait 한 번으로 처리합니다.
+
+    세그먼트(iter_pcm)는 엔진을 미리 띄워 둔 작업자 프로세스 workers개에 나눠 합성하고
+    입력 순서대로 PCM을 돌려줍니다. 풀은 close()할 때까지 유지되어 다음 호출도 엔진
+    초기화 없이 시작합니다. pyttsx3는 파일로만 출력하므로 작업자는 SCRATCH_DIR의 WAV에
+    쓰고 바로 읽은 뒤 지웁니다.
+    """
+
+    name = 'pyttsx3'
+    max_concurrent = 1
+    # 언어별 음성 이름 힌트 (이름이나 언어 코드에 포함되면 선택)
+    VOICE_HINTS = {
+        'en': ('english', 'david', 'en_', 'en-'),
+        'ko': ('korean', 'yuna', 'heami', 'ko_', 'ko-'),
+        'es': ('spanish', 'monica', 'helena', 'es_', 'es-'),
+        'ja': ('japanese', 'kyoko', 'haruka', 'ja_', 'ja-'),
+    }
+
+    def __init__(self, rate: int = DEFAULT_RATE, volume: float = DEFAULT_VOLUME,
+                 workers: Optional[int] = None):
+        super().__init__(rate, volume)
+        from parallel_render import default_workers
+
+        self.workers = workers or min(2, default_workers())
+        self.engine = None
+        self._voices = {}
+        self._lock = threading.Lock()
+        self._pool: Optional['ProcessPoolExecutor'] = None
+
+    def _init_engine(self):
+        if self.engine is None:
+            import pyttsx3
+
+            self.engine = pyttsx3.init()
+        return self.engine
+
+    def _voice_for(self, lang: str) -> Optional[str]:
+        """언어에 맞는 음성 id (없으면 None → 기본 음성)"""
+        if lang not in self._voices:
+            hints = self.VOICE_HINTS.get(lang, (lang,))
+            self._voices[lang] = None
+            for voice in self.engine.getProperty('voices'):
+                text = ' '.join([voice.name, voice.id] + [str(l) for l in getattr(voice, 'languages', [])]).lower()
+                if any(hint in text for hint in hints):
+                    self._voices[lang] = voice.id
+                    print(f"Voice set ({lang}): {voice.name}")
+                    break
+        return self._voices[lang]
+
+    def _configure(self, lang: str, style: Optional[Style] = None):
+        rate, volume = style or (self.rate, self.volume)
+        voice = self._voice_for(lang)
+        if voice:
+            self.engine.setProperty('voice', voice)
+        self.engine.setProperty('rate', rate)
+        self.engine.setProperty('volume', volume)
+
+    def synthesize(self, script: str, lang: str, output_file: str) -> str:
+        result = self.synthesize_batch([(script, lang, output_file)])[0]
+        if result is None:
+            raise RuntimeError("pyttsx3가 WAV 파일을 만들지 않았습니다")
+        return result
+
+    def synthesize_batch(self, requests: Sequence[Request]) -> List[Optional[str]]:
+        # 같은 언어 요청끼리 한 번의 runAndWait로 (음성 설정은 언어마다 한 번)
+        by_lang: Dict[str, list] = {}
+        for i, (_, lang, _) in enumerate(requests):
+            by_lang.setdefault(lang, []).append(i)
+
+        wav_files = [_temp_wav(output_file) for _, _, output_file in requests]
+        try:
+            with self._lock:
+                self._init_engine()
+                for lang, indices in by_lang.items():
+                    self._configure(lang)
+                    for i in indices:
+                        self.engine.save_to_file(requests[i][0], wav_files[i])
+                    self.engine.runAndWait()
+        except Exception:
+            for wav_file in wav_files:
+                _remove(wav_file)
+            raise
+
+        outputs = []
+        for wav_file, (_, _, output_file) in zip(wav_files, requests):
+            if os.path.exists(wav_file) and os.path.getsize(wav_file) > 44:
+                outputs.append(_finish_wav(wav_file, output_file))
+            else:
+                _remove(wav_file)
+                outputs.append(None)
+        return outputs
+
+    def synthesize_pcm(self, script: str, lang: str, style: Optional[Style] = None) -> PCMAudio:
+        wav_file = _temp_wav()
+        try:
+            with self._lock:
+                self._init_engine()
+                self._configure(lang, style)
+                self.engine.save_to_file(script, wav_file)
+                self.engine.runAndWait()
+            return read_wav(wav_file)
+        finally:
+            _remove(wav_file)
+
+    def iter_pcm(self, items: Iterable[PCMRequest]) -> Iterator[PCMAudio]:
+        items = list(items)
+        if self.workers <= 1 or len(items) <= 1:
+            yield from super().iter_pcm(items)
+            return
+
+        if self._pool is None:
+            from concurrent.futures import ProcessPoolExecutor
+
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_pyttsx3_worker)
+        # 모두 예약해 두고 순서대로 받음 (앞 세그먼트를 인코딩하는 동안 뒤 세그먼트 합성)
+        futures = [self._pool.submit(_speak_pcm, script, lang, style or (self.rate, self.volume))
+                   for script, lang, style in items]
+        try:
+            for future in futures:
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        self.engine = None
+
+
+class PiperBackend(BaseTTSBackend):
+    """Piper 로컬 신경망 TTS (https://github.com/rhasspy/piper)
+
+    언어별 음성 모델(.onnx)은 PIPER_VOICE_<LANG> 환경 변수 (예: PIPER_VOICE_EN) 또는
+    PIPER_VOICES 디렉터리의 기본 파일 이름으로 찾습니다. 배치는 언어(모델)마다
+    piper 프로세스 하나에 --json-input으로 모든 문장을 넘겨 모델을 한 번만 로드합니다.
+    """
+
+    name = 'piper'
+    max_concurrent = 2
+    DEFAULT_VOICES = {
+        'en': 'en_US-lessac-medium.onnx',
+        'es': 'es_ES-davefx-medium.onnx',
+        'ko': 'ko_KR-kss-medium.onnx',
+        'ja': 'ja_JP-test-medium.onnx',
+    }
+
+    def __init__(self, rate: int = DEFAULT_RATE, volume: float = DEFAULT_VOLUME,
+                 executable: str = None, voices_dir: str = None):
+        super().__init__(rate, volume)
+        self.executable = executable or shutil.which('piper') or 'piper'
+        self.voices_dir = voices_dir or os.environ.get('PIPER_VOICES', 'models/piper')
+
+    def model_for(self, lang: str) -> str:
+        model = os.environ.get(f'PIPER_VOICE_{lang.upper()}') or os.path.join(
+            self.voices_dir, self.DEFAULT_VOICES.get(lang, self.DEFAULT_VOICES['en']))
+        if not os.path.exists(model):
+            raise FileNotFoundError(f"Piper 음성 모델 없음 ({lang}): {model}")
+        return model
+
+    @staticmethod
+    def sample_rate_for(model: str) -> int:
+        """모델 설정(.onnx.json)의 샘플레이트 (없으면 22050)"""
+        try:
+            with open(model + '.json', encoding='utf-8') as f:
+                return int(json.load(f)['audio']['sample_rate'])
+        except (OSError, KeyError, ValueError):
+            return 22050
+
+    def _base_cmd(self, model: str, rate: int) -> List[str]:
+        # 말하기 속도: length_scale이 클수록 느림 (기본 속도 = DEFAULT_RATE)
+        return [self.executable, '--model', model, '--length_scale', f'{DEFAULT_RATE / rate:.3f}']
+
+    def _run(self, model: str, items: List[Tuple[str, str]]):
+        """한 모델로 (문장, WAV 파일) 여러 개 합성"""
+        cmd = self._base_cmd(model, self.rate) + ['--json-input']
+        lines = ''.join(json.dumps({'text': text, 'output_file': wav}, ensure_ascii=False) + '\n'
+                        for text, wav in items)
+        proc = subprocess.run(cmd, input=lines, capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise RuntimeError(f"piper 실패 (exit {proc.returncode}): {proc.stderr.strip()[-500:]}")
+
+    def synthesize(self, script: str, lang: str, output_file: str) -> str:
+        wav_file = _temp_wav(output_file)
+        self._run(self.model_for(lang), [(script, wav_file)])
+        return _finish_wav(wav_file, output_file)
+
+    def synthesize_pcm(self, script: str, lang: str, style: Optional[Style] = None) -> PCMAudio:
+        # --output_raw: WAV 파일 없이 stdout으로 16-bit mono PCM
+        model = self.model_for(lang)
+        cmd = self._base_cmd(model, style[0] if style else self.rate) + ['--output_raw']
+        proc = subprocess.run(cmd, input=script.encode('utf-8'), capture_output=True)
+        if proc.returncode != 0:
+            stderr = proc.stderr.decode(errors='replace').strip()[-500:]
+            raise RuntimeError(f"piper 실패 (exit {proc.returncode}): {stderr}")
+        return PCMAudio(proc.stdout, self.sample_rate_for(model))
+
+    def synthesize_batch(self, requests: Sequence[Request]) -> List[Optional[str]]:
+        outputs: List[Optional[str]] = [None] * len(requests)
+        by_lang: Dict[str, list] = {}
+        for i, (_, lang, _) in enumerate(requests):
+            by_lang.setdefault(lang, []).append(i)
+
+        for lang, indices in by_lang.items():
+            wav_files = {i: _temp_wav(requests[i][2]) for i in indices}
+            try:
+                self._run(self.model_for(lang), [(requests[i][0], wav_files[i]) for i in indices])
+            except Exception as e:
+                print(f"✗ Piper ({lang}) 실패: {e}")
+                for wav in wav_files.values():
+                    _remove(wav)
+                continue
+            for i in indices:
+                outputs[i] = _finish_wav(wav_files[i], requests[i][2])
+        return outputs
+
+
+class StubToneBackend(BaseTTSBackend):
+    """결정적 비프음 (네트워크/엔진 없이 파이프라인 전체를 돌릴 때)
+
+    단어마다 짧은 사인파 한 번 (주파수는 단어 해시로 결정, 길이는 말하기 속도 기준),
+    단어 사이는 무음입니다. 같은 입력이면 항상 같은 WAV가 나옵니다.
+    latency/failures로 네트워크 지연과 일시적 실패를 흉내 낼 수 있습니다.
+    """
+
+    name = 'stub'
+    max_concurrent = 8
+
+    def __init__(self, rate: int = DEFAULT_RATE, volume: float = DEFAULT_VOLUME,
+                 latency: float = 0.0, failures: int = 0, sample_rate: int = 22050):
+        super().__init__(rate, volume)
+        self.latency = latency
+        self.failures = failures
+        self.sample_rate = sample_rate
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def render(self, script: str, rate: Optional[int] = None, volume: Optional[float] = None) -> bytes:
+        """16-bit mono PCM"""
+        import numpy as np
+
+        rate, volume = rate or self.rate, self.volume if volume is None else volume
+        word_s = 60.0 / rate
+        tone = int(self.sample_rate * word_s * 0.7)
+        gap = int(self.sample_rate * word_s * 0.3)
+        t = np.arange(tone) / self.sample_rate
+        # 앞뒤 5ms 페이드 (클릭 방지)
+        ramp = np.minimum(1.0, np.minimum(t, t[::-1]) / 0.005)
+
+        chunks = []
+        for word in script.split() or ['']:
+            freq = 300 + zlib.crc32(word.encode('utf-8')) % 600
+            chunks.append(np.sin(2 * np.pi * freq * t) * ramp * volume)
+            chunks.append(np.zeros(gap))
+        pcm = np.concatenate(chunks)
+        return (pcm * 32767 * 0.5).astype('<i2').tobytes()
+
+    def synthesize_pcm(self, script: str, lang: str, style: Optional[Style] = None) -> PCMAudio:
+        with self._lock:
+            self.calls += 1
+            fail = self.calls <= self.failures
+        if self.latency:
+            time.sleep(self.latency)
+        if fail:
+            raise ConnectionError(f"stub TTS 실패 ({self.calls}번째 호출)")
+        return PCMAudio(self.render(script, *(style or ())), self.sample_rate)
+
+    def synthesize(self, script: str, lang: str, output_file: str) -> str:
+        return _write_pcm(self.synthesize_pcm(script, lang), output_file)
+
+
+_worker_backend: Optional[Pyttsx3Backend] = None
+
+
+def _init_pyttsx3_worker():
+    """작업자 시작 시 엔진과 음성 목록을 한 번 로드"""
+    global _worker_backend
+    _worker_backend = Pyttsx3Backend(workers=1)
+    _worker_backend._init_engine().getProperty('voices')
+
+
+def _speak_pcm(script: str, lang: str, style: Style) -> PCMAudio:
+    return _worker_backend.synthesize_pcm(script, lang, style)
+
+
+BACKENDS = {
+    'gtts': GTTSBackend,
+    'pyttsx3': Pyttsx3Backend,
+    'piper': PiperBackend,
+    'stub': StubToneBackend,
+}
+
+
+def get_backend(backend=None, **options) -> BaseTTSBackend:
+    """이름(또는 백엔드 객체) → 백엔드 (None이면 gtts)"""
+    if backend is None:
+        backend = 'gtts'
+    if not isinstance(backend, str):
+        return backend
+    if backend not in BACKENDS:
+        raise ValueError(f"알 수 없는 TTS 백엔드: {backend} (사용 가능: {', '.join(BACKENDS)})")
+    return BACKENDS[backend](**options)
@@ -5,11 +5,22 @@ import subprocess
 import os
 from pathlib import Path
 
+import audio_mix
+from audio_probe import TAIL_PADDING
+from ffmpeg_runner import FFmpegRunner, FFmpegJob
+
 
 class VideoComposer:
-    def __init__(self, output_dir='output'):
+    def __init__(self, output_dir='output', runner=None):
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
+        self.runner = runner or FFmpegRunner()
+        self.last_result = None
+
+    def _run(self, job):
+        """ffmpeg 작업 실행 (구조화된 결과는 last_result에 보관)"""
+        self.last_result = self.runner.run_sync(job)
+        return self.last_result
 
     def check_ffmpeg(self):
         """FFmpeg 설치 확인"""
@@ -44,22 +55,9 @@ class VideoComposer:
             print(f"비디오: {video_file}")
             print(f"오디오: {audio_file}")
 
-            # FFmpeg 명령어
-            cmd = [
-                'ffmpeg',
-                '-i', video_file,
-                '-i', audio_file,
-                '-c:v', 'copy',
-                '-c:a', 'aac',
-                '-strict', 'experimental',
-                '-shortest',  # 짧은 쪽에 맞춤
-                '-y',  # 덮어쓰기
-                output_file
-            ]
-
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = self._run(self._combine_cmd(video_file, audio_file, output_file))
 
-            if result.returncode == 0:
+            if result.ok:
                 print(f"✓ 영상 합성 완료: {output_file}")
                 return output_file
             else:
@@ -71,8 +69,34 @@ class VideoComposer:
             print(f"영상 합성 중 오류: {e}")
             return None
 
+    def _combine_cmd(self, video_file, audio_file, output_file):
+        return [
+            'ffmpeg',
+            '-i', video_file,
+            '-i', audio_file,
+            '-c:v', 'copy',
+            # 영상은 나레이션 + 여유 길이이므로 그만큼 무음을 덧붙임
+            # (끝없는 apad는 -c:v copy와 -shortest 조합에서 끝나지 않음)
+            '-af', f'apad=pad_dur={TAIL_PADDING}',
+            '-c:a', 'aac',
+            '-strict', 'experimental',
+            '-shortest',  # 짧은 쪽(영상)에 맞춤
+            '-y',  # 덮어쓰기
+            output_file
+        ]
+
+    def _mix_job(self, video_file, voice, bgm_file, output_file, settings):
+        """NumPy로 섞은 오디오를 stdin으로 넘겨 비디오와 mux하는 작업 (오디오 인코딩 한 번)
+
+        영상은 나레이션보다 TAIL_PADDING초 길게 만들어지므로 BGM도 그만큼 더 깔고 페이드 아웃합니다.
+        """
+        length = len(voice) + int(TAIL_PADDING * audio_mix.MIX_RATE)
+        mixed = audio_mix.mix(voice, audio_mix.load_bgm(bgm_file), audio_mix.MIX_RATE, settings, length)
+        return FFmpegJob(audio_mix.mux_cmd(video_file, output_file),
+                         name=os.path.basename(output_file), input=audio_mix.to_bytes(mixed))
+
     def add_background_music(self, video_file, bgm_file, output_file='output/final_with_bgm.mp4',
-                           video_volume=1.0, bgm_volume=0.3):
+                           video_volume=1.0, bgm_volume=0.3, settings=None):
         """
         비디오에 배경음악 추가
 
@@ -82,6 +106,7 @@ class VideoComposer:
             output_file: 출력 파일 경로
             video_volume: 원본 오디오 볼륨
             bgm_volume: 배경음악 볼륨
+            settings: 더킹/페이드 설정 (audio_mix.MixSettings, 없으면 기본값 + 위 볼륨)
         """
         if not self.check_ffmpeg():
             return None
@@ -89,22 +114,12 @@ class VideoComposer:
         try:
             print(f"\n배경음악 추가 중...")
 
-            # FFmpeg 명령어 (오디오 믹싱)
-            cmd = [
-                'ffmpeg',
-                '-i', video_file,
-                '-i', bgm_file,
-                '-filter_complex',
-                f'[0:a]volume={video_volume}[a1];[1:a]volume={bgm_volume}[a2];[a1][a2]amix=inputs=2:duration=shortest',
-                '-c:v', 'copy',
-                '-c:a', 'aac',
-                '-y',
-                output_file
-            ]
-
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            # 원본 오디오를 디코딩해 메모리에서 믹싱 (amix 필터 없음)
+            settings = settings or audio_mix.MixSettings(voice_gain=video_volume, bgm_gain=bgm_volume)
+            voice = audio_mix.decode_float(video_file)
+            result = self._run(self._mix_job(video_file, voice, bgm_file, output_file, settings))
 
-            if result.returncode == 0:
+            if result.ok:
                 print(f"✓ 배경음악 추가 완료: {output_file}")
                 return output_file
             else:
@@ -117,7 +132,7 @@ class VideoComposer:
             return None
 
     def create_shorts_video(self, video_file, audio_file, output_file='output/shorts_final.mp4',
-                          bgm_file=None):
+                          bgm_file=None, mix_settings=None):
         """
         쇼츠용 최종 영상 생성
 
@@ -126,32 +141,158 @@ class VideoComposer:
             audio_file: 내레이션 파일
             output_file: 출력 파일
             bgm_file: 배경음악 파일 (선택)
+            mix_settings: 배경음악 믹싱 설정 (audio_mix.MixSettings, 선택)
         """
-        # 1단계: 비디오 + 내레이션 합성
-        temp_file = os.path.join(self.output_dir, 'temp_with_narration.mp4')
-        result = self.combine_video_audio(video_file, audio_file, temp_file)
+        # 배경음악 없으면 비디오 + 내레이션 합성만
+        if not (bgm_file and os.path.exists(bgm_file)):
+            result = self.combine_video_audio(video_file, audio_file, output_file)
+            if result:
+                print(f"✓ 최종 영상 생성 완료: {output_file}")
+            return result
 
-        if not result:
+        # 배경음악: 내레이션과 BGM을 메모리에서 섞어 ffmpeg 한 번으로 mux
+        # (중간 파일, amix 필터, 오디오 재인코딩 없음)
+        if not self.check_ffmpeg():
             return None
 
-        # 2단계: 배경음악 추가 (있으면)
-        if bgm_file and os.path.exists(bgm_file):
-            final_result = self.add_background_music(temp_file, bgm_file, output_file)
-            # 임시 파일 삭제
-            try:
-                os.remove(temp_file)
-            except:
-                pass
-            return final_result
-        else:
-            # 배경음악 없으면 temp 파일을 최종 파일로 이동
-            try:
-                os.rename(temp_file, output_file)
+        try:
+            print(f"\n영상 합성 중 (배경음악 믹싱)...")
+            print(f"비디오: {video_file}")
+            print(f"오디오: {audio_file} + {bgm_file}")
+
+            voice = audio_mix.decode_float(audio_file)
+            job = self._mix_job(video_file, voice, bgm_file, output_file,
+                                mix_settings or audio_mix.DEFAULT_MIX)
+            result = self._run(job)
+
+            if result.ok:
                 print(f"✓ 최종 영상 생성 완료: {output_file}")
                 return output_file
-            except Exception as e:
-                print(f"파일 이동 실패: {e}")
-                return temp_file
+            else:
+                print(f"✗ 영상 합성 실패:")
+                print(result.stderr)
+                return None
+
+        except Exception as e:
+            print(f"영상 합성 중 오류: {e}")
+            return None
+
+    def create_shorts_videos(self, items):
+        """(비디오, 내레이션, 출력 파일) 목록을 한 번에 합성 (ffmpeg 작업 동시 실행)
+
+        Returns:
+            입력 순서대로 출력 파일 경로 (실패는 None)
+        """
+        if not self.check_ffmpeg():
+            return [None] * len(items)
+
+        jobs = [
+            FFmpegJob(self._combine_cmd(video, audio, output), name=os.path.basename(output))
+            for video, audio, output in items
+        ]
+        return self._collect(self.runner.run_batch(jobs), '영상 합성')
+
+    def _collect(self, results, label):
+        """배치 결과를 출력 경로 목록으로 (실패 시 stderr 출력)"""
+        outputs = []
+        for result in results:
+            if result.ok:
+                print(f"✓ {label} 완료: {result.output} ({result.elapsed:.1f}초)")
+                outputs.append(result.output)
+            else:
+                print(f"✗ {label} 실패: {result.output}")
+                print(result.stderr)
+                outputs.append(None)
+        return outputs
+
+    def _frames_job(self, frames, output_file, fps=30, width=1080, height=1920):
+        """가변 프레임레이트 인코딩 작업 (고유 프레임을 stdin으로 전달)"""
+        import numpy as np
+        from PIL import Image
+
+        # 영상 길이는 마지막 프레임 시각이므로 끝 시각에 마지막 이미지를 한 번 더 넣음
+        step = 1.0 / fps
+        frames = list(frames) + [(frames[-1][0], step)]
+
+        arrays = []
+        size = None
+        for image, _ in frames:
+            if isinstance(image, np.ndarray):
+                image = Image.fromarray(image)
+            elif not isinstance(image, Image.Image):
+                image = Image.open(image)
+            image = image.convert('RGB')
+            size = size or image.size
+            if image.size != size:
+                image = image.resize(size)
+            arrays.append(np.asarray(image))
+
+        # N번째 프레임 시각 = N/fps + (앞선 정지 구간들의 추가 시간)
+        terms = [f'{step}*N'] + [
+            f'gte(N\\,{i + 1})*{duration - step:.6f}'
+            for i, (_, duration) in enumerate(frames)
+            if abs(duration - step) > 1e-9
+        ]
+        setpts = f"setpts=({'+'.join(terms)})/TB"
+
+        cmd = [
+            'ffmpeg', '-y', '-loglevel', 'error',
+            '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+            '-s', f'{size[0]}x{size[1]}', '-framerate', str(fps),
+            '-i', '-',
+            '-vf', f'{setpts},scale={width}:{height}:force_original_aspect_ratio=decrease,'
+                   f'pad={width}:{height}:(ow-iw)/2:(oh-ih)/2:black',
+            '-vsync', 'vfr',
+            '-c:v', 'libx264', '-tune', 'stillimage', '-pix_fmt', 'yuv420p',
+            output_file
+        ]
+        return FFmpegJob(cmd, name=os.path.basename(output_file),
+                         input=b''.join(a.tobytes() for a in arrays))
+
+    def encode_frames(self, frames, output_file, fps=30, width=1080, height=1920):
+        """
+        서로 다른 이미지만 한 번씩 인코딩 (가변 프레임레이트)
+
+        고유 프레임만 rawvideo로 파이프에 넣고 setpts로 실제 표시 시각을
+        지정하므로, 정지 구간은 길이와 상관없이 프레임 1장입니다.
+
+        Args:
+            frames: (이미지, 표시 시간(초)) 목록. 이미지는 경로, PIL Image, ndarray
+            output_file: 출력 파일
+            fps: 타임스탬프 단위 (1/fps 초)
+            width: 영상 너비
+            height: 영상 높이
+        """
+        if not frames:
+            return None
+
+        try:
+            job = self._frames_job(frames, output_file, fps, width, height)
+            result = self._run(job)
+
+            if result.ok:
+                print(f"✓ 가변 프레임 인코딩 완료: {output_file} ({len(frames) + 1} 프레임)")
+                return output_file
+            else:
+                print(f"✗ 가변 프레임 인코딩 실패:")
+                print(result.stderr)
+                return None
+
+        except Exception as e:
+            print(f"가변 프레임 인코딩 중 오류: {e}")
+            return None
+
+    def encode_still(self, image, output_file, duration=15, width=1080, height=1920):
+        """정지 이미지를 프레임 1장짜리 영상으로 인코딩"""
+        return self.encode_frames([(image, duration)], output_file, width=width, height=height)
+
+    def encode_stills(self, items, width=1080, height=1920):
+        """(이미지, 출력 파일, 길이) 목록을 한 번에 인코딩 (ffmpeg 작업 동시 실행)"""
+        jobs = [
+            self._frames_job([(image, duration)], output_file, width=width, height=height)
+            for image, output_file, duration in items
+        ]
+        return self._collect(self.runner.run_batch(jobs), '정지 영상 인코딩')
 
     def convert_to_shorts_format(self, input_file, output_file='output/shorts_formatted.mp4',
                                 width=1080, height=1920):
@@ -179,9 +320,9 @@ class VideoComposer:
                 output_file
             ]
 
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = self._run(cmd)
 
-            if result.returncode == 0:
+            if result.ok:
                 print(f"✓ 포맷 변환 완료: {output_file}")
                 return output_file
             else:
@@ -40,12 +40,8 @@ class RealEstateVisualizer:
 
         plt.rcParams['axes.unicode_minus'] = False
 
-    def create_price_trend_animation(self, trend_data, output_file='output/price_trend.mp4', duration=15):
-        """가격 추이 애니메이션 생성 (15초)"""
-        import os
-        os.makedirs(self.output_dir, exist_ok=True)
-
-        fig, ax = plt.subplots(figsize=(self.fig_width, self.fig_height))
+    def _setup_trend_axes(self, fig, ax, trend_data):
+        """가격 추이 차트 공통 설정 (배경, 축, 제목)"""
         fig.patch.set_facecolor('#1a1a2e')
         ax.set_facecolor('#16213e')
 
@@ -53,10 +49,6 @@ class RealEstateVisualizer:
         months = trend_data['년월'].values
         prices = trend_data['평균가격'].values / 100000000  # 억 단위
 
-        # 애니메이션 설정
-        total_frames = duration * 30  # 30fps로 15초
-        frames_per_point = total_frames // len(months)
-
         line, = ax.plot([], [], 'o-', color='#e94560', linewidth=3, markersize=10, markerfacecolor='#ff6b9d')
         title_text = ax.text(0.5, 0.95, 'Seoul Real Estate Price Trend',
                             transform=ax.transAxes,
@@ -82,6 +74,49 @@ class RealEstateVisualizer:
         # 그리드
         ax.grid(True, alpha=0.3, color='white', linestyle='--')
 
+        return months, prices, line, title_text
+
+    def _price_label(self, ax, x, price):
+        """현재 가격 말풍선"""
+        return ax.text(x, price + 0.5,
+                       f'${price:.1f}B',
+                       ha='center', va='bottom',
+                       fontsize=12, fontweight='bold',
+                       color='#ff6b9d',
+                       bbox=dict(boxstyle='round,pad=0.5', facecolor='#1a1a2e', alpha=0.8))
+
+    def create_price_trend_animation(self, trend_data, output_file='output/price_trend.mp4', duration=15,
+                                     renderer='pipe', fps=30, workers=None):
+        """가격 추이 애니메이션 생성 (기본 15초, 보통 나레이션 길이에 맞춘 duration)
+
+        renderer='pipe': Agg 캔버스를 재사용해 상태가 바뀔 때만 그리고
+        RGBA 버퍼를 ffmpeg stdin으로 바로 전달 (변하지 않은 프레임은 버퍼 반복)
+        renderer='funcanimation': 기존 matplotlib FuncAnimation + ffmpeg writer
+        workers > 1: 프레임 범위를 청크로 나눠 프로세스별로 렌더링 후 스트림 복사 결합
+        """
+        import os
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        if workers and workers > 1:
+            from functools import partial
+            from parallel_render import render_parallel
+
+            render_chunk = partial(self._render_trend_chunk, trend_data, duration, fps)
+            result = render_parallel(render_chunk, int(round(duration * fps)), output_file, workers=workers, fps=fps)
+            if result:
+                print(f"가격 추이 애니메이션 저장: {output_file}")
+            return result
+
+        if renderer == 'pipe':
+            return self._render_trend_pipe(trend_data, output_file, duration, fps)
+
+        fig, ax = plt.subplots(figsize=(self.fig_width, self.fig_height))
+        months, prices, line, title_text = self._setup_trend_axes(fig, ax, trend_data)
+
+        # 애니메이션 설정
+        total_frames = int(round(duration * fps))  # 30fps로 duration초
+        frames_per_point = max(total_frames // len(months), 1)
+
         def init():
             line.set_data([], [])
             return line, title_text
@@ -100,28 +135,93 @@ class RealEstateVisualizer:
                 if frame % 10 == 0:  # 가격 텍스트 업데이트
                     for txt in ax.texts[1:]:
                         txt.remove()
-                    ax.text(current_point, current_price + 0.5,
-                           f'${current_price:.1f}B',
-                           ha='center', va='bottom',
-                           fontsize=12, fontweight='bold',
-                           color='#ff6b9d',
-                           bbox=dict(boxstyle='round,pad=0.5', facecolor='#1a1a2e', alpha=0.8))
+                    self._price_label(ax, current_point, current_price)
 
             return line, title_text
 
         anim = animation.FuncAnimation(fig, animate, init_func=init,
-                                      frames=total_frames, interval=1000/30,
+                                      frames=total_frames, interval=1000/fps,
                                       blit=True, repeat=False)
 
         # 저장
         Writer = animation.writers['ffmpeg']
-        writer = Writer(fps=30, metadata=dict(artist='Real-Estate-Shorts'), bitrate=3000)
+        writer = Writer(fps=fps, metadata=dict(artist='Real-Estate-Shorts'), bitrate=3000)
         anim.save(output_file, writer=writer)
         plt.close()
 
         print(f"가격 추이 애니메이션 저장: {output_file}")
         return output_file
 
+    def _render_trend_chunk(self, trend_data, duration, fps, start, end, segment_file):
+        """병렬 렌더링 청크 (프로세스 풀에서 호출)"""
+        return self._render_trend_pipe(trend_data, segment_file, duration, fps, frame_range=(start, end))
+
+    def _render_trend_pipe(self, trend_data, output_file, duration, fps, frame_range=None):
+        """Agg 캔버스 → ffmpeg stdin 직접 파이프 렌더링 (frame_range: [start, end) 일부만)"""
+        import itertools
+        import subprocess
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        # pyplot 상태와 무관한 Agg 전용 Figure (매 프레임 재사용)
+        fig = Figure(figsize=(self.fig_width, self.fig_height))
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        months, prices, line, _ = self._setup_trend_axes(fig, ax, trend_data)
+
+        total_frames = int(round(duration * fps))
+        frames_per_point = max(total_frames // len(months), 1)
+
+        canvas.draw()
+        width, height = canvas.get_width_height()
+
+        cmd = [
+            'ffmpeg', '-y', '-loglevel', 'error',
+            '-f', 'rawvideo', '-pix_fmt', 'rgba',
+            '-s', f'{width}x{height}', '-r', str(fps),
+            '-i', '-',
+            # yuv420p는 짝수 크기 필요
+            '-vf', 'crop=trunc(iw/2)*2:trunc(ih/2)*2',
+            '-c:v', 'libx264', '-pix_fmt', 'yuv420p', '-b:v', '3000k',
+            '-metadata', 'artist=Real-Estate-Shorts',
+            output_file
+        ]
+        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+
+        # 프레임별 상태(표시할 포인트 수)가 같은 구간은 한 번만 렌더링
+        start, end = frame_range or (0, total_frames)
+        states = (min(f // frames_per_point, len(months) - 1) for f in range(start, end))
+        label = None
+        rendered = 0
+
+        try:
+            for current_point, run in itertools.groupby(states):
+                if current_point > 0:
+                    line.set_data(np.arange(current_point + 1), prices[:current_point + 1])
+                    if label is not None:
+                        label.remove()
+                    label = self._price_label(ax, current_point, prices[current_point])
+
+                canvas.draw()
+                rendered += 1
+                frame = canvas.buffer_rgba()   # 복사 없는 memoryview
+                for _ in run:
+                    proc.stdin.write(frame)
+
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass
+
+        stderr = proc.stderr.read().decode(errors='replace')
+        proc.wait()
+
+        if proc.returncode != 0:
+            print(f"✗ 애니메이션 인코딩 실패: {stderr}")
+            return None
+
+        print(f"가격 추이 애니메이션 저장: {output_file} (렌더링 {rendered}/{end - start} 프레임)")
+        return output_file
+
     def create_hot_deals_chart(self, hot_deals, output_file='output/hot_deals.png'):
         """핫딜 차트 생성"""
         import os
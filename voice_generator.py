@@ -1,14 +1,16 @@
 """
-음성 내레이션 생성 (gTTS)
+음성 내레이션 생성 (기본 gTTS, tts_backends로 교체 가능)
 """
-from gtts import gTTS
 import os
 
+from tts_backends import get_backend
+
 
 class VoiceGenerator:
-    def __init__(self, output_dir='output'):
+    def __init__(self, output_dir='output', backend='gtts'):
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
+        self.backend = get_backend(backend)
 
     def generate_narration(self, script, output_file='output/narration.mp3', lang='ko'):
         """
@@ -23,9 +25,8 @@ class VoiceGenerator:
             print(f"음성 생성 중...")
             print(f"스크립트: {script}")
 
-            # gTTS로 음성 생성
-            tts = gTTS(text=script, lang=lang, slow=False)
-            tts.save(output_file)
+            # 백엔드 모듈(gTTS 등)은 합성할 때만 로드
+            self.backend.synthesize(script, lang, output_file)
 
             print(f"음성 파일 저장 완료: {output_file}")
             return output_file